@@ -0,0 +1,53 @@
+"""add indexes for list filters (foreign keys and text_pattern_ops prefixes)
+
+Revision ID: 0002_filter_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '0002_filter_indexes'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# 列表过滤新增的外键列索引 (Field(index=True))
+FOREIGN_KEY_INDEXES = {
+    "ix_sys_menus_parent_id": ("sys_menus", "parent_id"),
+    "ix_sys_dict_data_dict_id": ("sys_dict_data", "dict_id"),
+}
+
+# 与 app/system/models.py 中的 pattern_index() 保持一致
+# (sys_users 的前缀过滤由 0004_enable_pg_trgm 的 pg_trgm GIN 索引支撑)
+PATTERN_INDEXES = {
+    "ix_sys_roles_code_pattern": ("sys_roles", "code"),
+    "ix_sys_menus_permission_pattern": ("sys_menus", "permission"),
+    "ix_sys_dicts_code_pattern": ("sys_dicts", "code"),
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY 不阻塞写入 (不能在事务内执行)
+    with op.get_context().autocommit_block():
+        for name, (table, column) in FOREIGN_KEY_INDEXES.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column})"
+            )
+        for name, (table, column) in PATTERN_INDEXES.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} ({column} text_pattern_ops)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in (*PATTERN_INDEXES, *FOREIGN_KEY_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,76 @@
+"""soft-delete sys_users with partial unique indexes
+
+Revision ID: 0003_soft_delete_users
+Revises: 0002_filter_indexes
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '0003_soft_delete_users'
+down_revision = '0002_filter_indexes'
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# 与 app/db/mixins.py 中 live_index() 生成的部分唯一索引保持一致
+LIVE_UNIQUE_INDEXES = {
+    "uq_sys_users_username_live": "username",
+    "uq_sys_users_email_live": "email",
+}
+
+# 0001_baseline 中 Field(unique=True, index=True) 建立的全表唯一索引；
+# 若表是手工以 UNIQUE 约束创建的，则为 <table>_<column>_key 约束
+OLD_UNIQUE_INDEXES = {
+    "ix_sys_users_username": "username",
+    "ix_sys_users_email": "email",
+}
+OLD_UNIQUE_CONSTRAINTS = ("sys_users_username_key", "sys_users_email_key")
+
+
+def upgrade() -> None:
+    # 常量默认值的 NOT NULL 列 (PG 11+) 只改元数据，不重写表
+    op.add_column(
+        "sys_users",
+        sa.Column(
+            "is_deleted",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+            comment="是否删除 0:否 1:是",
+        ),
+    )
+
+    # CONCURRENTLY 不阻塞写入 (不能在事务内执行)；
+    # 先建好部分唯一索引再删除旧的唯一索引 / 约束，期间唯一性始终有保证
+    with op.get_context().autocommit_block():
+        for name, column in LIVE_UNIQUE_INDEXES.items():
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON sys_users ({column}) WHERE is_deleted = false"
+            )
+        for name in OLD_UNIQUE_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    for constraint in OLD_UNIQUE_CONSTRAINTS:
+        op.execute(f"ALTER TABLE sys_users DROP CONSTRAINT IF EXISTS {constraint}")
+
+
+def downgrade() -> None:
+    # 恢复旧的全表唯一索引前，已删除用户不能与在用用户重名，否则这里会失败
+    with op.get_context().autocommit_block():
+        for name, column in OLD_UNIQUE_INDEXES.items():
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON sys_users ({column})"
+            )
+        for name in LIVE_UNIQUE_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    # 删除 is_deleted 会一并删除依赖它的部分索引
+    op.drop_column("sys_users", "is_deleted")
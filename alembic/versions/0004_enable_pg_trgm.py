@@ -0,0 +1,47 @@
+"""enable pg_trgm and add user search indexes
+
+Revision ID: 0004_enable_pg_trgm
+Revises: 0003_soft_delete_users
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '0004_enable_pg_trgm'
+down_revision = '0003_soft_delete_users'
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# 与 app/system/models.py 中 SysUser 的 trgm_index() 保持一致
+TRGM_INDEXES = {
+    "ix_sys_users_username_trgm_live": "username",
+    "ix_sys_users_email_trgm_live": "email",
+    "ix_sys_users_remark_trgm_live": "remark",
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # sys_users.is_deleted 由 0003_soft_delete_users 加入；
+    # CONCURRENTLY 不阻塞写入 (不能在事务内执行)
+    with op.get_context().autocommit_block():
+        for name, column in TRGM_INDEXES.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON sys_users USING gin ({column} gin_trgm_ops) "
+                "WHERE is_deleted = false"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in TRGM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    # pg_trgm 可能被其他对象使用，保留扩展
@@ -0,0 +1,36 @@
+"""name the role and dict code unique constraints
+
+Revision ID: 0005_unique_constraint_names
+Revises: 0004_enable_pg_trgm
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '0005_unique_constraint_names'
+down_revision = '0004_enable_pg_trgm'
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# PostgreSQL 默认约束名 -> 模型中显式声明的名称 (CRUD 层 unique_messages 按名称匹配)
+RENAMES = {
+    "sys_roles": ("sys_roles_code_key", "uq_sys_roles_code"),
+    "sys_dicts": ("sys_dicts_code_key", "uq_sys_dicts_code"),
+}
+
+
+def upgrade() -> None:
+    # 仅修改系统目录，不重建索引
+    for table, (old, new) in RENAMES.items():
+        op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {old} TO {new}")
+
+
+def downgrade() -> None:
+    for table, (old, new) in RENAMES.items():
+        op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {new} TO {old}")
@@ -0,0 +1,70 @@
+"""add resource version counters and triggers
+
+Revision ID: 0006_resource_versions
+Revises: 0005_unique_constraint_names
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '0006_resource_versions'
+down_revision = '0005_unique_constraint_names'
+branch_labels = None
+depends_on = None
+
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# 与 app/system/models.py 中的 track_versions() 保持一致
+VERSIONED_TABLES = {
+    "sys_menus": "menu",
+    "sys_roles": "role_menu",
+    "sys_role_menus": "role_menu",
+    "sys_user_roles": "role_menu",
+    "sys_dicts": "dict",
+    "sys_dict_data": "dict",
+}
+
+# 与 app/db/versioning.py 中的 BUMP_FUNCTION_DDL 保持一致
+BUMP_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION bump_resource_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO sys_resource_versions (resource, version) VALUES (TG_ARGV[0], 1)
+    ON CONFLICT (resource)
+    DO UPDATE SET version = sys_resource_versions.version + 1;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sys_resource_versions",
+        sa.Column("resource", sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("resource"),
+        comment="资源版本号 (用于 ETag)",
+        if_not_exists=True,
+    )
+    op.execute(BUMP_FUNCTION_DDL)
+
+    # 业务表由 0001_baseline 创建；CREATE OR REPLACE 兼容建表时已由
+    # app/db/versioning.py 的 after_create 监听建好的触发器
+    for table, resource in VERSIONED_TABLES.items():
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER trg_{table}_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_resource_version('{resource}')"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_resource_version()")
+    op.drop_table("sys_resource_versions", if_exists=True)
@@ -1,28 +1,44 @@
 from datetime import UTC, datetime
+from typing import Annotated
 from zoneinfo import ZoneInfo
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PlainSerializer
 
-# 定义北京时区
-SHANGHAI_TZ = ZoneInfo("Asia/Shanghai")
+from app.core.config import settings
+
+# 显示时区
+# 始终使用 ZoneInfo：历史夏令时 (如 Asia/Shanghai 1986-1991) 与规则变更需按 tzdata 转换，
+# ZoneInfo 实例按名称缓存，转换规则在 C 实现中二分查找，与固定偏移耗时相当
+# (见 scripts/bench_datetime.py)
+DISPLAY_TZ = ZoneInfo(settings.DISPLAY_TIMEZONE)
 
 
 def format_datetime(dt: datetime) -> str:
-    """全局时间格式化函数"""
-    if dt is None:
-        return None
-    # 补全 UTC 时区
+    """
+    全局时间格式化函数: 转为显示时区的 'YYYY-MM-DD HH:MM:SS'
+
+    naive datetime 按 UTC 处理；isoformat 截取前 19 位代替 strftime
+    """
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=UTC)
-    # 转为北京时间并格式化
-    return dt.astimezone(SHANGHAI_TZ).strftime("%Y-%m-%d %H:%M:%S")
+    return dt.astimezone(DISPLAY_TZ).isoformat(" ", "seconds")[:19]
+
+
+# 输出 JSON 时按显示时区格式化的 datetime 类型 (Python 模式下仍是 datetime)
+# 用法: created_at: DisplayDatetime / last_login_at: DisplayDatetime | None = None
+DisplayDatetime = Annotated[
+    datetime, PlainSerializer(format_datetime, return_type=str, when_used="json")
+]
 
 
 class BaseSchema(BaseModel):
+    """
+    项目所有 Schema 的基类
+
+    需要按显示时区输出的时间字段请声明为 DisplayDatetime
+    """
+
     model_config = ConfigDict(
         from_attributes=True,
         populate_by_name=True,
-        # ✅ 核心配置：类似 FastJSON 的全局类型转换
-        # 只要 Schema 里有 datetime 类型的字段，都会走这个逻辑
-        json_encoders={datetime: format_datetime},
     )
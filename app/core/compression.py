@@ -0,0 +1,186 @@
+"""
+响应压缩编码
+
+- 按 Accept-Encoding 协商编码 (zstd / br / gzip)，gzip 始终可用，
+  brotli、zstandard 为可选依赖，未安装时自动跳过对应编码
+- CompressedPayload: 预先序列化的缓存内容，各编码的压缩结果只计算一次，
+  之后的请求直接返回压缩好的字节 (如 OpenAPI 文档)
+"""
+
+import gzip
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # br 编码为可选功能
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd 编码为可选功能
+    zstandard = None
+
+# 可压缩的媒体类型 (前缀)，图片、Parquet 等已压缩的格式不再处理
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/msgpack",
+    "application/vnd.msgpack",
+    "image/svg+xml",
+)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _BrotliStream:
+    """将 brotli.Compressor 适配为 compress / flush 接口"""
+
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+@dataclass(frozen=True)
+class Codec:
+    """单个 Content-Encoding 的一次性压缩与流式压缩实现"""
+
+    name: str
+    compress: Callable[[bytes, int], bytes]
+    stream: Callable[[int], StreamCompressor]
+
+
+def _gzip_stream(level: int) -> StreamCompressor:
+    # wbits=31: 输出 gzip 头尾，与 gzip.compress 的结果格式一致
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def _available_codecs() -> dict[str, Codec]:
+    codecs: dict[str, Codec] = {}
+    if zstandard is not None:
+        codecs["zstd"] = Codec(
+            name="zstd",
+            compress=lambda data, level: zstandard.ZstdCompressor(level=level).compress(
+                data
+            ),
+            stream=lambda level: zstandard.ZstdCompressor(level=level).compressobj(),
+        )
+    if brotli is not None:
+        codecs["br"] = Codec(
+            name="br",
+            compress=lambda data, level: brotli.compress(data, quality=level),
+            stream=_BrotliStream,
+        )
+    codecs["gzip"] = Codec(
+        name="gzip",
+        compress=lambda data, level: gzip.compress(data, level, mtime=0),
+        stream=_gzip_stream,
+    )
+    return codecs
+
+
+# 按服务端偏好排序：客户端权重 (q) 相同时优先选择靠前的编码
+CODECS = _available_codecs()
+
+
+# 未在 COMPRESSION_LEVELS 中配置时的默认级别 (兼顾压缩率与 CPU 开销)
+_DEFAULT_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+
+def compression_level(encoding: str) -> int:
+    return settings.COMPRESSION_LEVELS.get(encoding, _DEFAULT_LEVELS[encoding])
+
+
+def is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and (
+        content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+    )
+
+
+def negotiate_encoding(accept_encoding: str) -> Codec | None:
+    """
+    按 Accept-Encoding 选择编码
+
+    权重最高者优先，同权重时按 CODECS 顺序；q=0 表示拒绝该编码，
+    "*" 匹配所有未显式列出的编码
+    """
+    weights: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    wildcard = weights.get("*", 0.0)
+    best: Codec | None = None
+    best_q = 0.0
+    for name, codec in CODECS.items():
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = codec, q
+    return best
+
+
+@dataclass
+class CompressedPayload:
+    """
+    已序列化的缓存内容及其各编码的压缩结果
+
+    压缩结果在首次被请求时按配置的级别计算并保存，之后直接复用；
+    小于 COMPRESSION_MIN_SIZE 的内容不压缩
+    """
+
+    body: bytes
+    media_type: str = "application/json"
+    _encoded: dict[str, bytes] = field(default_factory=dict, init=False, repr=False)
+
+    def encoded(self, codec: Codec) -> bytes:
+        data = self._encoded.get(codec.name)
+        if data is None:
+            data = codec.compress(self.body, compression_level(codec.name))
+            self._encoded[codec.name] = data
+        return data
+
+    def response(self, request: Request, **kwargs: Any) -> Response:
+        """按请求的 Accept-Encoding 返回对应编码的响应"""
+        if len(self.body) < settings.COMPRESSION_MIN_SIZE:
+            return Response(self.body, media_type=self.media_type, **kwargs)
+
+        codec = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        if codec is None:
+            response = Response(self.body, media_type=self.media_type, **kwargs)
+        else:
+            response = Response(
+                self.encoded(codec), media_type=self.media_type, **kwargs
+            )
+            response.headers["Content-Encoding"] = codec.name
+        response.headers.append("Vary", "Accept-Encoding")
+        return response
@@ -20,10 +20,50 @@ class Settings(BaseSettings):
 
     DEBUG: bool = False
 
+    # 接口输出时间的显示时区 (IANA 名称)，格式固定为 YYYY-MM-DD HH:MM:SS
+    DISPLAY_TIMEZONE: str = "Asia/Shanghai"
+
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_PRE_PING: bool = True
 
+    # 连接池自适应容量：按签出等待时间在 [DB_POOL_SIZE, DB_POOL_MAX_SIZE] 内调整
+    DB_POOL_AUTOSIZE: bool = False
+    DB_POOL_MAX_SIZE: int = 60
+    DB_POOL_TARGET_WAIT_MS: int = 20
+    DB_POOL_AUTOSIZE_INTERVAL: int = 10
+
+    # 只读副本 DSN 列表 (JSON 数组)，为空时所有请求都走主库
+    DATABASE_REPLICA_URLS: list[str] = []
+    # 客户端发生写操作后，该时间窗口内的读请求仍走主库 (读己之写)
+    DB_REPLICA_STICKY_SECONDS: int = 5
+
+    # 请求级 SQL 统计 (仅 DEBUG 模式)：默认语句预算、按路由模板覆盖的预算、N+1 判定阈值
+    SQL_QUERY_BUDGET: int = 30
+    SQL_ROUTE_BUDGETS: dict[str, int] = {}
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # 请求默认时限 (毫秒)，剩余时间作为事务的 statement_timeout，0 表示不限时
+    # 单个路由可通过 Depends(Deadline(ms)) 覆盖
+    REQUEST_DEADLINE_MS: int = 30_000
+
+    # 慢查询阈值 (毫秒) 及对慢查询执行 EXPLAIN (ANALYZE, BUFFERS) 的抽样比例 (0~1)
+    SLOW_QUERY_MS: int = 200
+    SLOW_QUERY_EXPLAIN_RATE: float = 0.0
+
+    # 批量创建用户时哈希密码的进程数，0 表示使用 CPU 核数
+    PASSWORD_HASH_WORKERS: int = 0
+
+    # TrustedRoute 是否对信任的返回值重新校验并比对输出 (测试环境开启)
+    TRUSTED_RESPONSE_CHECK: bool = False
+
+    # 响应压缩：小于该字节数的响应不压缩；各编码的压缩级别 (gzip 1-9 / br 0-11 / zstd 1-22)
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_LEVELS: dict[str, int] = {"gzip": 6, "br": 4, "zstd": 3}
+
+    # 流式导出时服务端游标每次读取的行数
+    EXPORT_CHUNK_SIZE: int = 1000
+
     # JWT
     SECRET_KEY: str
     ALGORITHM: str
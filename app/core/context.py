@@ -0,0 +1,37 @@
+"""
+请求上下文
+
+RequestContextMiddleware 将当前请求的 ASGI scope 放入 ContextVar，
+供慢查询日志等拿不到 Request 对象的代码定位来源路由。
+"""
+
+from contextvars import ContextVar
+from typing import Any
+
+request_scope: ContextVar[dict[str, Any] | None] = ContextVar(
+    "request_scope", default=None
+)
+
+
+def route_template(scope: dict[str, Any]) -> str:
+    """
+    还原请求的路由模板，如 /api/v1/sys/users/1 -> /api/v1/sys/users/{user_id}
+
+    嵌套 APIRouter 时 scope["route"].path 不含前缀，这里按 path_params 反向替换
+    """
+    path = scope.get("path", "")
+    params = scope.get("path_params")
+    if not params:
+        return path
+    names = {str(value): name for name, value in params.items()}
+    return "/".join(
+        f"{{{names[part]}}}" if part in names else part for part in path.split("/")
+    )
+
+
+def current_route() -> str:
+    """当前请求的 "METHOD 路由模板"，非请求上下文返回 "-" """
+    scope = request_scope.get()
+    if scope is None:
+        return "-"
+    return f"{scope.get('method')} {route_template(scope)}"
@@ -1,10 +1,14 @@
 # app/core/docs.py
+from collections.abc import Callable
 from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.openapi.utils import get_openapi
+from pydantic_core import to_json
 from scalar_fastapi import Layout, Theme, get_scalar_api_reference
 
+from app.core.compression import CompressedPayload
+
 try:
     # 1. 正常人的逻辑：直接导入
     from scalar_fastapi import OpenAPISource  # type: ignore
@@ -41,18 +45,37 @@ def register_docs(app: FastAPI) -> None:
     核心函数：在 App 上注册文档路由
     """
 
+    # 路由在启动后不再变化，文档只生成一次，序列化和压缩结果随之缓存
+    payloads: dict[str, CompressedPayload] = {}
+
+    def cached(key: str, build: Callable[[], dict[str, Any]]) -> CompressedPayload:
+        payload = payloads.get(key)
+        if payload is None:
+            payload = payloads[key] = CompressedPayload(to_json(build()))
+        return payload
+
     # 1. 定义 JSON 数据源 (隐蔽路由)
+    @app.get("/openapi.json", include_in_schema=False)
+    async def openapi_all(request: Request) -> Response:
+        return cached("all", app.openapi).response(request)
+
     @app.get("/openapi/sys.json", include_in_schema=False)
-    async def openapi_sys():  # type: ignore
-        return custom_openapi(
-            app, tag_prefix="Sys", title="后台管理系统 API", version="1.0"
-        )
+    async def openapi_sys(request: Request) -> Response:
+        return cached(
+            "sys",
+            lambda: custom_openapi(
+                app, tag_prefix="Sys", title="后台管理系统 API", version="1.0"
+            ),
+        ).response(request)
 
     @app.get("/openapi/app.json", include_in_schema=False)
-    async def openapi_app():  # type: ignore
-        return custom_openapi(
-            app, tag_prefix="App", title="📱客户端应用 API", version="1.0"
-        )
+    async def openapi_app(request: Request) -> Response:
+        return cached(
+            "app",
+            lambda: custom_openapi(
+                app, tag_prefix="App", title="📱客户端应用 API", version="1.0"
+            ),
+        ).response(request)
 
     # 2. 定义 Scalar 文档入口 (覆盖 /docs)
     @app.get("/docs", include_in_schema=False)
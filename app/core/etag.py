@@ -0,0 +1,50 @@
+"""
+ETag 与条件 GET 工具
+
+ETag 统一为弱校验 (W/"...")：内容按显示语义相同即可复用，
+经压缩中间件编码后也无需改写
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """由版本号等标识拼接后取摘要生成 ETag"""
+    raw = "\x1f".join(str(part) for part in parts).encode()
+    return content_etag(raw)
+
+
+def content_etag(body: bytes) -> str:
+    """按响应内容摘要生成 ETag"""
+    return f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 弱比较 (忽略 W/ 前缀)，支持多个值及 *"""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def check_not_modified(
+    request: Request, response: Response, etag: str, cache_control: str
+) -> None:
+    """
+    设置 ETag / Cache-Control / Vary 响应头，客户端缓存仍有效时抛出 304
+
+    在处理函数执行前调用即可跳过查询与序列化。
+    ETag 按协商的媒体类型区分，200 与 304 都需要 Vary: Accept，
+    否则共享缓存可能把 JSON 的缓存项交给请求 MessagePack 的客户端
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
@@ -10,12 +10,11 @@
 
 from typing import Any
 
-from fastapi import Request
+from fastapi import Request, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.core.resp import Result
+from app.core.resp import Result, negotiated_response
 
 # ========================================
 # 自定义异常类
@@ -65,6 +64,13 @@ class ValidationException(BusinessException):
         super().__init__(code=400, msg=msg, data=data)
 
 
+class TimeoutException(BusinessException):
+    """请求超时异常 (504)"""
+
+    def __init__(self, msg: str = "请求处理超时", data: Any = None) -> None:
+        super().__init__(code=504, msg=msg, data=data)
+
+
 class ServerException(BusinessException):
     """服务器内部异常 (500)"""
 
@@ -79,37 +85,40 @@ class ServerException(BusinessException):
 
 async def http_exception_handler(
     request: Request, exc: StarletteHTTPException
-) -> JSONResponse:
+) -> Response:
     """
     拦截 HTTP 异常 (如 404, 401) 并转为统一 JSON 格式
 
-    注意：这里保持 HTTP 状态码与业务 code 一致
+    注意：这里保持 HTTP 状态码与业务 code 一致；
+    204 / 304 不允许带响应体，只返回状态码与响应头 (如条件 GET 的 ETag)
     """
-    return JSONResponse(
+    if exc.status_code in (204, 304):
+        return Response(status_code=exc.status_code, headers=exc.headers)
+    return negotiated_response(
+        request,
+        Result.error(code=exc.status_code, msg=exc.detail),
         status_code=exc.status_code,
-        content=Result.error(code=exc.status_code, msg=exc.detail).model_dump(),
     )
 
 
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
-) -> JSONResponse:
+) -> Response:
     """
     拦截参数校验错误 (422)
 
     将 Pydantic 验证错误转换为统一的 Result 格式
     """
-    return JSONResponse(
+    return negotiated_response(
+        request,
+        Result.error(code=422, msg="参数校验错误", data=exc.errors()),
         status_code=422,
-        content=Result.error(
-            code=422, msg="参数校验错误", data=exc.errors()
-        ).model_dump(),
     )
 
 
 async def business_exception_handler(
     request: Request, exc: BusinessException
-) -> JSONResponse:
+) -> Response:
     """
     统一处理业务异常
 
@@ -119,7 +128,8 @@ async def business_exception_handler(
     如果需要使用 HTTP 状态码区分错误，可以改为：
     status_code=exc.code if exc.code >= 400 else 200
     """
-    return JSONResponse(
+    return negotiated_response(
+        request,
+        Result.error(code=exc.code, msg=exc.msg, data=exc.data),
         status_code=200,  # 业务异常统一返回 200
-        content=Result.error(code=exc.code, msg=exc.msg, data=exc.data).model_dump(),
     )
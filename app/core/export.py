@@ -0,0 +1,170 @@
+"""
+流式导出模块
+
+将按块读取的行字典编码为 NDJSON / CSV / Parquet，并以 StreamingResponse 返回。
+每块编码后立即交给 ASGI 服务器发送，客户端读得慢时生成器会在 send 处等待
+(天然背压)，服务端内存只与块大小有关，与表的总行数无关。
+"""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from enum import StrEnum
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Column
+
+from app.core.exceptions import ValidationException
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 导出为可选功能
+    pa = None
+    pq = None
+
+Rows = AsyncIterator[list[dict[str, Any]]]
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def _encode_ndjson(
+    chunks: Rows, _columns: Sequence[Column]
+) -> AsyncIterator[bytes]:
+    async for rows in chunks:
+        lines = [
+            json.dumps(row, default=_json_default, ensure_ascii=False) for row in rows
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def _encode_csv(chunks: Rows, columns: Sequence[Column]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=[c.key for c in columns])
+    # 带 BOM，Excel 打开中文不乱码
+    buffer.write("\ufeff")
+    writer.writeheader()
+    async for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _arrow_type(column: Column) -> Any:
+    """按 SQL 列类型确定 Arrow 类型，避免首块全为 NULL 时类型推断失败"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return pa.string()
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type is float:
+        return pa.float64()
+    if python_type is datetime:
+        tz = "UTC" if getattr(column.type, "timezone", False) else None
+        return pa.timestamp("us", tz=tz)
+    if python_type is date:
+        return pa.date32()
+    return pa.string()
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    只追加的内存输出流：ParquetWriter 写完一个 row group 后即可取走已写入的字节
+
+    tell() 返回累计写入量 (而不是缓冲区位置)，保证 Parquet 元数据中的偏移量正确。
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        data = bytes(b)
+        self._parts.append(data)
+        self._written += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._written
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def _encode_parquet(
+    chunks: Rows, columns: Sequence[Column]
+) -> AsyncIterator[bytes]:
+    sink = _ChunkSink()
+    schema = pa.schema([(c.key, _arrow_type(c)) for c in columns])
+    writer = pq.ParquetWriter(sink, schema)
+    # 每块写为一个 row group
+    async for rows in chunks:
+        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+_ENCODERS = {
+    ExportFormat.NDJSON: _encode_ndjson,
+    ExportFormat.CSV: _encode_csv,
+    ExportFormat.PARQUET: _encode_parquet,
+}
+
+
+def export_response(
+    chunks: Rows, columns: Sequence[Column], fmt: ExportFormat, filename: str
+) -> StreamingResponse:
+    """
+    将按块产出的行数据包装为流式下载响应
+
+    Args:
+        chunks: 异步产出行字典列表的迭代器 (如 CRUDBase.stream)
+        columns: 导出的列 (决定 CSV 表头与 Parquet 列类型)
+        fmt: 导出格式
+        filename: 下载文件名 (不含扩展名)
+    """
+    if fmt == ExportFormat.PARQUET and pa is None:
+        raise ValidationException("Parquet 导出需要安装 pyarrow")
+
+    return StreamingResponse(
+        _ENCODERS[fmt](chunks, columns),
+        media_type=_MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'
+        },
+    )
@@ -24,11 +24,16 @@ def setup_logging() -> None:
         "{name}:{function}:{line} - {message}"
     )
 
+    # EXPLAIN 执行计划篇幅较大，只写入慢查询日志
+    def not_explain(record: dict) -> bool:
+        return "explain" not in record["extra"]
+
     logger.add(
         sys.stdout,
         format=console_format,
         level="DEBUG" if settings.DEBUG else "INFO",
         colorize=True,
+        filter=not_explain,
     )
 
     logger.add(
@@ -39,6 +44,7 @@ def setup_logging() -> None:
         retention="30 days",
         compression="gz",
         enqueue=True,
+        filter=not_explain,
     )
 
     logger.add(
@@ -51,4 +57,15 @@ def setup_logging() -> None:
         enqueue=True,
     )
 
+    logger.add(
+        LOG_DIR / "slow_query_{time:YYYY-MM-DD}.log",
+        format=file_format,
+        level="INFO",
+        rotation="1 day",
+        retention="30 days",
+        compression="gz",
+        enqueue=True,
+        filter=lambda record: "slow_query" in record["extra"],
+    )
+
     logger.info("Loguru logging configured | log_dir={}", LOG_DIR)
@@ -1,9 +1,25 @@
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any, Generic, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+from pydantic_core import to_json, to_jsonable_python
+
+try:
+    import msgpack
+except ImportError:  # MessagePack 响应为可选功能
+    msgpack = None
 
 T = TypeVar("T")
 
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# 客户端可能使用的 MessagePack 媒体类型
+MSGPACK_MEDIA_TYPES = frozenset(
+    {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+)
+
 
 # 1. 定义纯粹的分页数据结构
 # 它不包含 code 和 msg，只包含分页核心数据
@@ -48,3 +64,111 @@ class Result(BaseModel, Generic[T]):
             items=items, total=total, page=page, size=size, pages=pages
         )
         return Result[PageInfo[T]](code=0, msg="success", data=page_info)
+
+
+# 4. JSON 响应类
+class FastJSONResponse(JSONResponse):
+    """
+    基于 pydantic-core 的 JSON 响应
+
+    content 可以直接是 Result 等 Pydantic 模型，由 Rust 端一次序列化为 bytes，
+    不经过 model_dump() 中间字典和标准库 json.dumps。
+    无法识别的类型 (如校验错误 ctx 中的异常对象) 按 str() 输出，不会中断响应。
+
+    注意：声明了 response_model 的路由在默认响应类下已由 FastAPI 直接调用
+    pydantic-core 输出 bytes，不要把本类设为 default_response_class，
+    否则会退回 "先转字典再编码" 的慢路径。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content, serialize_unknown=True)
+
+
+class MsgPackResponse(Response):
+    """
+    MessagePack 响应 (Accept: application/msgpack)
+
+    content 先按 JSON 模式转为基础类型 (时间字段等与 JSON 响应的格式一致)，
+    再由 msgpack 编码，客户端解码后得到与 JSON 响应相同的结构
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(to_jsonable_python(content, serialize_unknown=True))
+
+
+def accepts_msgpack(accept: str | None) -> bool:
+    """
+    Accept 头是否优先选择 MessagePack
+
+    msgpack 的权重 (q) 不低于 JSON (含 application/* 与 */*) 时返回 True；
+    未安装 msgpack 时始终返回 False
+    """
+    if msgpack is None or not accept:
+        return False
+    msgpack_q = json_q = 0.0
+    for item in accept.lower().split(","):
+        media_type, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        media_type = media_type.strip()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in ("application/json", "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+def negotiated_response(
+    request: Request, content: Any, status_code: int = 200
+) -> Response:
+    """按请求的 Accept 头返回 MessagePack 或 JSON 响应"""
+    if accepts_msgpack(request.headers.get("accept")):
+        return MsgPackResponse(content, status_code=status_code)
+    return FastJSONResponse(content, status_code=status_code)
+
+
+# 5. 稀疏字段 (fields=) 响应
+@lru_cache(maxsize=256)
+def _sparse_adapter(schema: type[BaseModel], fields: tuple[str, ...]) -> TypeAdapter:
+    """
+    基于响应 Schema 派生只包含指定字段的子模型 (按字段组合缓存)
+
+    子模型沿用原 Schema 的字段定义和 model_config，保证字段的序列化格式一致
+    """
+    sparse_model = create_model(  # type: ignore[call-overload]
+        f"{schema.__name__}Sparse",
+        __config__=schema.model_config,
+        **{
+            f: (schema.model_fields[f].annotation, schema.model_fields[f])
+            for f in fields
+        },
+    )
+    return TypeAdapter(list[sparse_model])
+
+
+def sparse_response(
+    schema: type[BaseModel], fields: Sequence[str], result: Result[PageInfo[Any]]
+) -> Response:
+    """
+    将只包含部分列的分页结果 (行字典) 序列化为响应
+
+    部分字段无法通过接口声明的 response_model 校验，因此直接返回 Response，
+    由 FastAPI 跳过 response_model 的二次校验与序列化。
+    """
+    page_info = result.data
+    if page_info is not None:
+        adapter = _sparse_adapter(schema, tuple(fields))
+        # 以未参数化的 PageInfo 重新装配，items 按子模型自身的规则序列化
+        page_info = PageInfo(
+            **page_info.model_dump(exclude={"items"}),
+            items=adapter.validate_python(page_info.items),
+        )
+    sparse_result = Result(code=result.code, msg=result.msg, data=page_info)
+    return FastJSONResponse(sparse_result)
@@ -0,0 +1,118 @@
+"""
+路由类扩展
+
+TrustedRoute: 信任处理函数返回的强类型对象，跳过 response_model 的二次校验
+"""
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter, ValidationError
+
+from app.core.config import settings
+
+# 注入到处理函数签名中的子响应参数名，用于取回依赖项设置的 Cookie / 响应头
+_SUB_RESPONSE_PARAM = "_trusted_sub_response"
+
+
+class TrustedRoute(APIRoute):
+    """
+    信任返回值的路由类，用法: APIRouter(route_class=TrustedRoute)
+
+    处理函数返回的对象类型恰好是路由的 response_model 时 (如
+    Result[list[MenuResponse]].success(menus))，说明构造时已经过校验，
+    直接按模型自身的序列化规则输出 JSON，不再经过 FastAPI 的
+    "按 response_model 校验 -> 序列化" 流程。
+    其它返回值 (未参数化的 Result、字典、Response 等) 仍走默认流程，
+    因此不会把 ORM 对象等未经筛选的数据直接输出。
+
+    - response_model 仍用于生成 OpenAPI 文档
+    - response_model_include / exclude / exclude_none 等选项照常生效
+    - 依赖项设置在子响应上的 Cookie、响应头与状态码会合并到最终响应
+    - TRUSTED_RESPONSE_CHECK=true 时按 response_model 重新校验并比对输出，
+      不一致时抛出 AssertionError，用于测试环境发现构造不当的返回值
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, self._wrap_endpoint(endpoint), **kwargs)
+
+    def _wrap_endpoint(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                sub_response = kwargs.pop(_SUB_RESPONSE_PARAM)
+                return self._trusted_response(
+                    await endpoint(*args, **kwargs), sub_response
+                )
+
+        else:
+
+            @functools.wraps(endpoint)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                sub_response = kwargs.pop(_SUB_RESPONSE_PARAM)
+                return self._trusted_response(endpoint(*args, **kwargs), sub_response)
+
+        # 追加一个 Response 类型的参数，FastAPI 会注入与依赖项共享的子响应
+        signature = inspect.signature(endpoint)
+        sub_response_param = inspect.Parameter(
+            _SUB_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response
+        )
+        wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+            parameters=[*signature.parameters.values(), sub_response_param]
+        )
+        return wrapper
+
+    def _dump_options(self) -> dict[str, Any]:
+        return {
+            "include": self.response_model_include,
+            "exclude": self.response_model_exclude,
+            "by_alias": self.response_model_by_alias,
+            "exclude_unset": self.response_model_exclude_unset,
+            "exclude_defaults": self.response_model_exclude_defaults,
+            "exclude_none": self.response_model_exclude_none,
+        }
+
+    def _trusted_response(self, value: Any, sub_response: Response) -> Any:
+        if self.response_model is None or type(value) is not self.response_model:
+            return value
+
+        content = value.__pydantic_serializer__.to_json(value, **self._dump_options())
+        if settings.TRUSTED_RESPONSE_CHECK:
+            self._check(value, content)
+
+        response = Response(
+            content=content,
+            media_type="application/json",
+            status_code=sub_response.status_code or self.status_code or 200,
+        )
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    @functools.cached_property
+    def _check_adapter(self) -> TypeAdapter:
+        return TypeAdapter(self.response_model)
+
+    def _check(self, value: Any, content: bytes) -> None:
+        """
+        转为字典后按 response_model 重新校验、序列化，与信任路径的输出比对
+
+        模型实例默认不会被重新校验，先 model_dump 才能发现构造后被改坏的字段
+        """
+        adapter = self._check_adapter
+        try:
+            validated = adapter.validate_python(value.model_dump(), by_name=True)
+        except ValidationError as exc:
+            raise ResponseValidationError(
+                errors=exc.errors(include_url=False), body=value
+            ) from exc
+        expected = adapter.dump_json(validated, **self._dump_options())
+        if expected != content:
+            raise AssertionError(
+                f"TrustedRoute 输出与 response_model 校验结果不一致: {self.path}"
+            )
@@ -1,3 +1,9 @@
+import asyncio
+import multiprocessing
+import os
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime, timedelta
 
 from jose import JWTError, jwt
@@ -7,11 +13,62 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 批量哈希使用的进程池 (bcrypt 为 CPU 密集型，线程池受 GIL 限制)，首次使用时创建
+_hash_executor: ProcessPoolExecutor | None = None
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _hash_batch(passwords: Sequence[str]) -> list[str]:
+    """在子进程中哈希一组密码"""
+    return [pwd_context.hash(p) for p in passwords]
+
+
+def _hash_workers() -> int:
+    return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        # spawn 避免 fork 复制事件循环与数据库连接
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=_hash_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_executor
+
+
+async def hash_passwords(passwords: Sequence[str]) -> list[str]:
+    """
+    批量哈希密码，按进程池大小分块并行执行，不阻塞事件循环
+
+    返回结果与输入顺序一致
+    """
+    if not passwords:
+        return []
+    executor = _get_hash_executor()
+    size = -(-len(passwords) // _hash_workers())
+    loop = asyncio.get_running_loop()
+    chunks = await asyncio.gather(
+        *(
+            loop.run_in_executor(executor, _hash_batch, passwords[i : i + size])
+            for i in range(0, len(passwords), size)
+        )
+    )
+    return [hashed for chunk in chunks for hashed in chunk]
+
+
+def shutdown_hash_executor() -> None:
+    """关闭批量哈希进程池 (应用关闭时调用)"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(cancel_futures=True)
+        _hash_executor = None
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -40,7 +97,8 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
         expire = datetime.now(UTC) + timedelta(
             days=settings.REFRESH_TOKEN_EXPIRE_DAYS
         )
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # jti 保证同一秒内签发的刷新令牌也互不相同 (令牌按唯一键入库)
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
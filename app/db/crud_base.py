@@ -1,28 +1,171 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Iterator, Mapping, Sequence
 from typing import Any, Generic, TypeVar
 
+import sqlalchemy as sa
 from pydantic import BaseModel
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql.base import ExecutableOption
-from sqlmodel import SQLModel, col, func, select
+from sqlmodel import SQLModel, col, delete, func, insert, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.config import settings
+from app.core.exceptions import NotFoundException, ValidationException
+from app.db.filters import FilterSet
+
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def _constraint_name(exc: sa_exc.IntegrityError) -> str | None:
+    """取出违反的约束 / 唯一索引名 (asyncpg 原始异常挂在适配层异常的 __cause__ 上)"""
+    cause = exc.orig.__cause__ if exc.orig is not None else None
+    return getattr(cause, "constraint_name", None)
+
+
+def _chunked(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """按固定大小切分序列，用于控制单条批量 SQL 的参数规模"""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # 批量操作的默认分块大小
+    # asyncpg 单条语句最多 32767 个绑定参数，宽表需要适当调小
+    bulk_chunk_size: int = 500
+    # upsert 的冲突判定列，需对应表上的唯一约束/唯一索引，如 ("code",)
+    upsert_conflict_columns: tuple[str, ...] = ()
+    # upsert 命中已有行时默认不覆盖的列 (如凭据)，调用方可用 update_columns 显式指定
+    upsert_exclude_columns: tuple[str, ...] = ()
+    # 列表接口允许的过滤 / 排序字段，见 app/db/filters.py
+    filter_set: FilterSet | None = None
+    # 唯一约束 / 唯一索引名 -> 冲突时的提示，create / update_by_id 据此转换 IntegrityError
+    unique_messages: dict[str, str] = {}
+
     def __init__(self, model: type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
         """
         self.model = model
+        # 模型混入了 SoftDeleteMixin 时自动启用软删除
+        self.soft_delete = "is_deleted" in model.__table__.columns  # type: ignore[attr-defined]
+
+    def live_criteria(self) -> list[sa.ColumnElement[bool]]:
+        """
+        "未删除" 过滤条件 (非软删除表为空列表)
+
+        写成 is_deleted = false 与部分索引的谓词保持一致，PostgreSQL 才能命中部分索引
+        """
+        if not self.soft_delete:
+            return []
+        return [self.model.__table__.c.is_deleted == sa.false()]  # type: ignore[attr-defined]
+
+    def _soft_delete_statement(self) -> Any:
+        """软删除语句：只标记 is_deleted，不加载、不级联删除子对象"""
+        values: dict[str, Any] = {"is_deleted": True}
+        if hasattr(self.model, "updated_at"):
+            values["updated_at"] = func.now()
+        return (
+            update(self.model)
+            .where(*self.live_criteria())
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _raise_unique_violation(self, exc: sa_exc.IntegrityError) -> None:
+        """已登记的唯一冲突转换为 ValidationException 抛出，其它完整性错误由调用方继续抛出"""
+        msg = self.unique_messages.get(_constraint_name(exc) or "")
+        if msg:
+            raise ValidationException(msg) from exc
+
+    @property
+    def _pk_column(self) -> sa.Column:
+        """模型的主键列 (目前所有业务表均为单列主键)"""
+        return sa.inspect(self.model, raiseerr=True).primary_key[0]
+
+    def column_fields(self, schema: type[BaseModel]) -> list[str]:
+        """响应 Schema 中属于本表列的字段 (用于导出等只读列的场景)"""
+        columns = self.model.__table__.columns  # type: ignore[attr-defined]
+        return [f for f in schema.model_fields if f in columns]
+
+    def get_columns(self, fields: Sequence[str]) -> list[sa.Column]:
+        """将字段名转换为表的列对象，不存在的列直接拒绝"""
+        columns = self.model.__table__.columns  # type: ignore[attr-defined]
+        invalid = [f for f in fields if f not in columns]
+        if invalid:
+            raise ValidationException(f"不支持的字段: {', '.join(invalid)}")
+        return [columns[f] for f in fields]
+
+    async def _to_insert_rows(self, objs_in: Sequence[CreateSchemaType]) -> list[dict]:
+        """将创建 Schema 转为批量 INSERT 的行字典"""
+        pk_name = self._pk_column.key
+        rows = []
+        for create_data in await self._prepare_create_rows(objs_in):
+            # 先经过模型校验以补齐默认值，保证每行字段集合一致 (多行 VALUES 要求)
+            db_data = self.model.model_validate(create_data).model_dump()
+            if db_data.get(pk_name) is None:
+                db_data.pop(pk_name, None)
+            rows.append(db_data)
+        return rows
+
+    async def _prepare_create_rows(
+        self, objs_in: Sequence[CreateSchemaType]
+    ) -> list[dict[str, Any]]:
+        """
+        将一批创建 Schema 转为入库字段字典
+
+        默认逐条调用 _prepare_create_data；需要 CPU 密集处理 (如密码哈希) 的子类
+        可重写为批量、不阻塞事件循环的实现。create、bulk_create 与 bulk_upsert 共用
+        """
+        return [self._prepare_create_data(obj_in) for obj_in in objs_in]
+
+    def _prepare_create_data(self, obj_in: CreateSchemaType) -> dict[str, Any]:
+        """
+        将创建 Schema 转为入库字段字典
+
+        子类可重写此方法处理字段差异，create 与 bulk_create 共用
+        """
+        return obj_in.model_dump()
+
+    def _prepare_update_data(
+        self, obj_in: UpdateSchemaType | dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        将更新 Schema 转为待更新字段字典
+
+        子类可重写此方法处理字段差异，update 与 bulk_update 共用
+        """
+        if isinstance(obj_in, dict):
+            return obj_in
+        # exclude_unset=True 是关键，防止将未传字段更新为 None
+        return obj_in.model_dump(exclude_unset=True)
 
     async def get(self, session: AsyncSession, id: Any) -> ModelType | None:
         """
-        通过主键获取单个对象
+        通过主键获取单个对象 (软删除表不返回已删除的对象)
+        """
+        db_obj = await session.get(self.model, id)
+        if db_obj is not None and self.soft_delete and db_obj.is_deleted:  # type: ignore[attr-defined]
+            return None
+        return db_obj
+
+    async def get_existing_ids(
+        self, session: AsyncSession, ids: Sequence[Any]
+    ) -> set[Any]:
+        """
+        返回 ids 中实际存在 (软删除表为未删除) 的主键
+
+        单条 WHERE id = ANY(:ids) 查询，用于批量校验外键引用
         """
-        return await session.get(self.model, id)
+        if not ids:
+            return set()
+        pk = self._pk_column
+        ids_param = sa.bindparam("ids", list(set(ids)), type_=ARRAY(pk.type))
+        statement = select(pk).where(pk == sa.any_(ids_param), *self.live_criteria())
+        result = await session.exec(statement)
+        return set(result.all())
 
     async def get_page(
         self,
@@ -36,13 +179,31 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         order_by: Sequence[Any] | None = None,
         # 允许传入 eager loading 选项，如 selectinload
         options: Sequence[ExecutableOption] | None = None,
+        # 只查询指定列 (稀疏字段)，此时返回行字典而非 ORM 对象
+        fields: Sequence[str] | None = None,
+        # 随 fields 一起查询的计算列 (如聚合子查询)，需带 label
+        extra_columns: Sequence[sa.ColumnElement[Any]] | None = None,
         # 简单的相等过滤依然可以通过 kwargs 传入
         **kwargs: Any,
-    ) -> tuple[list[ModelType], int]:
+    ) -> tuple[list[Any], int]:
         """
         分页查询，支持复杂过滤、排序和选项
+
+        传入 fields 时只 SELECT 对应的列并以 dict 返回，跳过 ORM 对象的
+        构建与 identity map 登记，options 会被忽略。
+        extra_columns 在计数之后才加入查询，不会拖慢 count。
+        fields 为空列表 (只请求计算列) 时以主键作为投影的基础列。
         """
-        statement = select(self.model)
+        projected = fields is not None
+        # 列投影 (Core select) 与实体查询 (SQLModel select) 的类型不同，统一按 Any 处理
+        statement: Any
+        if projected:
+            statement = sa.select(
+                *(self.get_columns(fields) if fields else [self._pk_column])
+            )
+        else:
+            statement = select(self.model)
+        statement = statement.where(*self.live_criteria())
 
         # 1. 处理 kwargs (简单相等查询)
         for key, value in kwargs.items():
@@ -62,8 +223,11 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         total_result = await session.exec(count_statement)
         total = total_result.one()
 
+        if projected and extra_columns:
+            statement = statement.add_columns(*extra_columns)
+
         # 4. 应用 ORM 选项 (如 joinedload)
-        if options:
+        if options and not projected:
             for option in options:
                 statement = statement.options(option)
 
@@ -82,20 +246,65 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         statement = statement.offset(offset).limit(page_size)
 
         result = await session.exec(statement)
+        if projected:
+            return [dict(row) for row in result.mappings()], total
         return list(result.all()), total
 
+    async def stream(
+        self,
+        session: AsyncSession,
+        *,
+        fields: Sequence[str],
+        chunk_size: int | None = None,
+        filters: Sequence[Any] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        通过服务端游标按块读取整表 (用于导出)
+
+        与 get_page 翻页不同，这里只执行一次查询，没有 OFFSET 重复扫描；
+        游标每次只取 chunk_size 行，内存占用与表大小无关。
+        """
+        chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        statement = sa.select(*self.get_columns(fields)).where(*self.live_criteria())
+
+        for key, value in kwargs.items():
+            if value is not None and hasattr(self.model, key):
+                statement = statement.where(getattr(self.model, key) == value)
+        if filters:
+            for criterion in filters:
+                statement = statement.where(criterion)
+
+        # 按主键排序，保证导出顺序稳定
+        statement = statement.order_by(self._pk_column).execution_options(
+            yield_per=chunk_size
+        )
+
+        result = await session.stream(statement)
+        async for partition in result.mappings().partitions(chunk_size):
+            yield [dict(row) for row in partition]
+
     async def create(
         self, session: AsyncSession, *, obj_in: CreateSchemaType
     ) -> ModelType:
         """
         创建新对象
-        """
-        obj_in_data = obj_in.model_dump()
-        db_obj = self.model.model_validate(obj_in_data)
 
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        单条 INSERT ... RETURNING 完成写入与回读；唯一性由数据库约束保证，
+        冲突按 unique_messages 转换为 ValidationException
+        """
+        (row,) = await self._to_insert_rows([obj_in])
+        statement = insert(self.model).values(**row).returning(self.model)
+        try:
+            result = await session.exec(statement)
+            db_obj = result.scalars().one()
+            await self._after_create(session, db_obj, obj_in)
+            await session.commit()
+        except Exception as exc:
+            await session.rollback()
+            if isinstance(exc, sa_exc.IntegrityError):
+                self._raise_unique_violation(exc)
+            raise
         return db_obj
 
     async def update(
@@ -108,11 +317,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         更新对象
         """
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            # exclude_unset=True 是关键，防止将未传字段更新为 None
-            update_data = obj_in.model_dump(exclude_unset=True)
+        update_data = self._prepare_update_data(obj_in)
 
         # 最佳实践：使用 sqlmodel_update 方法 (SQLModel 0.0.14+)
         # 这比手动 setattr 更健壮，且能处理 SQLModel 的内部逻辑
@@ -126,10 +331,315 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def delete(self, session: AsyncSession, *, id: Any) -> bool:
         """
         删除对象
+
+        软删除表执行单条 UPDATE ... SET is_deleted = true，不会加载对象及其关系
         """
+        if self.soft_delete:
+            statement = self._soft_delete_statement().where(self._pk_column == id)
+            result = await session.exec(statement)
+            await session.commit()
+            return result.rowcount > 0
+
         db_obj = await session.get(self.model, id)
         if not db_obj:
             return False
         await session.delete(db_obj)
         await session.commit()
         return True
+
+    async def _delete_relations(
+        self, session: AsyncSession, ids: sa.BindParameter
+    ) -> None:
+        """
+        物理删除前清理关联数据 (ids 为主键数组参数)
+
+        语句级 DELETE 不经过 ORM 的关系级联，多对多关联表、自引用外键等
+        需要由子类在此处理；数据库端已声明 ON DELETE CASCADE 的无需处理
+        """
+
+    async def _after_create(
+        self, session: AsyncSession, db_obj: ModelType, obj_in: CreateSchemaType
+    ) -> None:
+        """
+        create 写入主表后、提交前调用，与主表写入处于同一事务
+
+        子类可在此写入关联数据 (如多对多关联表)，抛出异常时整体回滚
+        """
+
+    async def _after_update(
+        self,
+        session: AsyncSession,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | dict[str, Any],
+    ) -> None:
+        """update_by_id 更新主表后、提交前调用，语义同 _after_create"""
+
+    async def update_by_id(
+        self,
+        session: AsyncSession,
+        *,
+        id: Any,
+        obj_in: UpdateSchemaType | dict[str, Any],
+        msg: str = "资源不存在",
+    ) -> ModelType:
+        """
+        按主键更新对象，单条 UPDATE ... RETURNING 完成存在性校验与回读
+
+        :raises NotFoundException: 记录不存在 (或已软删除) 时抛出
+        :raises ValidationException: 违反 unique_messages 中登记的唯一约束时抛出
+        """
+        update_data = self._prepare_update_data(obj_in)
+        try:
+            if update_data:
+                statement = (
+                    update(self.model)
+                    .where(self._pk_column == id, *self.live_criteria())
+                    .values(**update_data)
+                    .returning(self.model)
+                    .execution_options(populate_existing=True)
+                )
+                result = await session.exec(statement)
+                db_obj = result.scalars().one_or_none()
+            else:
+                # 没有主表字段需要更新 (如只修改关联数据)
+                db_obj = await self.get(session, id)
+            if db_obj is None:
+                raise NotFoundException(msg)
+            await self._after_update(session, db_obj, obj_in)
+            await session.commit()
+        except Exception as exc:
+            await session.rollback()
+            if isinstance(exc, sa_exc.IntegrityError):
+                self._raise_unique_violation(exc)
+            raise
+        return db_obj
+
+    async def delete_by_id(
+        self, session: AsyncSession, *, id: Any, msg: str = "资源不存在"
+    ) -> None:
+        """
+        按主键删除对象，单条 DELETE ... RETURNING id 完成存在性校验
+
+        软删除表改为 UPDATE ... RETURNING id
+        :raises NotFoundException: 记录不存在 (或已软删除) 时抛出
+        """
+        pk = self._pk_column
+        if self.soft_delete:
+            statement = self._soft_delete_statement()
+        else:
+            ids_param = sa.bindparam("ids", [id], type_=ARRAY(pk.type))
+            await self._delete_relations(session, ids_param)
+            statement = delete(self.model).execution_options(synchronize_session=False)
+        result = await session.exec(statement.where(pk == id).returning(pk))
+        if result.first() is None:
+            await session.rollback()
+            raise NotFoundException(msg)
+        await session.commit()
+
+    async def bulk_create(
+        self,
+        session: AsyncSession,
+        *,
+        objs_in: Sequence[CreateSchemaType],
+        chunk_size: int | None = None,
+    ) -> list[ModelType]:
+        """
+        批量创建对象
+
+        使用多行 INSERT ... RETURNING 按块写入，整批在同一事务中提交，
+        避免逐条 create 带来的 N 次 commit + refresh 往返。
+        """
+        if not objs_in:
+            return []
+
+        rows = await self._to_insert_rows(objs_in)
+        db_objs: list[ModelType] = []
+        try:
+            statement = insert(self.model).returning(self.model)
+            for chunk in _chunked(rows, chunk_size or self.bulk_chunk_size):
+                result = await session.exec(statement, params=list(chunk))
+                db_objs.extend(result.scalars().all())
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return db_objs
+
+    async def bulk_update(
+        self,
+        session: AsyncSession,
+        *,
+        objs_in: Mapping[Any, UpdateSchemaType | dict[str, Any]],
+        chunk_size: int | None = None,
+    ) -> int:
+        """
+        按主键批量更新对象
+
+        objs_in 为 {主键: 更新数据}，使用 ORM 的 "bulk UPDATE by primary key"
+        以 executemany 方式执行，整批在同一事务中提交。
+        executemany 拿不到可靠的 rowcount (asyncpg 不支持)，因此先用一条
+        id = ANY(:ids) 查询过滤掉不存在 (软删除表为已删除) 的主键。
+
+        :return: 实际更新的行数
+        """
+        pk_name = self._pk_column.key
+        updates = {}
+        for id, obj_in in objs_in.items():
+            update_data = self._prepare_update_data(obj_in)
+            if update_data:
+                updates[id] = update_data
+        if not updates:
+            return 0
+
+        try:
+            existing = await self.get_existing_ids(session, list(updates))
+            rows = [
+                {**update_data, pk_name: id}
+                for id, update_data in updates.items()
+                if id in existing
+            ]
+            for chunk in _chunked(rows, chunk_size or self.bulk_chunk_size):
+                await session.exec(update(self.model), params=list(chunk))
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return len(rows)
+
+    async def bulk_delete(
+        self,
+        session: AsyncSession,
+        *,
+        ids: Sequence[Any],
+        chunk_size: int | None = None,
+    ) -> int:
+        """
+        按主键批量删除对象
+
+        使用 DELETE ... WHERE id = ANY(:ids)，每块只绑定一个数组参数，
+        语句形态固定，便于数据库复用执行计划。软删除表改为 UPDATE 标记。
+
+        :return: 删除的行数
+        """
+        if not ids:
+            return 0
+
+        pk = self._pk_column
+        deleted = 0
+        try:
+            unique_ids = list(dict.fromkeys(ids))
+            for chunk in _chunked(unique_ids, chunk_size or self.bulk_chunk_size):
+                ids_param = sa.bindparam("ids", list(chunk), type_=ARRAY(pk.type))
+                if self.soft_delete:
+                    statement = self._soft_delete_statement()
+                else:
+                    await self._delete_relations(session, ids_param)
+                    statement = delete(self.model).execution_options(
+                        synchronize_session=False
+                    )
+                statement = statement.where(pk == sa.any_(ids_param))
+                result = await session.exec(statement)
+                deleted += result.rowcount
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return deleted
+
+    async def upsert(
+        self,
+        session: AsyncSession,
+        *,
+        obj_in: CreateSchemaType,
+        conflict_columns: Sequence[str] | None = None,
+        update_columns: Sequence[str] | None = None,
+    ) -> ModelType:
+        """
+        创建或更新单个对象 (以唯一列判定是否已存在)
+        """
+        db_objs = await self.bulk_upsert(
+            session,
+            objs_in=[obj_in],
+            conflict_columns=conflict_columns,
+            update_columns=update_columns,
+        )
+        return db_objs[0]
+
+    async def bulk_upsert(
+        self,
+        session: AsyncSession,
+        *,
+        objs_in: Sequence[CreateSchemaType],
+        conflict_columns: Sequence[str] | None = None,
+        update_columns: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> list[ModelType]:
+        """
+        批量创建或更新对象
+
+        基于 PostgreSQL INSERT ... ON CONFLICT (...) DO UPDATE ... RETURNING，
+        取代 "按编码查询 -> 再 create/update" 的逐行同步方式。
+        冲突列默认取 upsert_conflict_columns，同一批中冲突键重复时以最后一条为准。
+        冲突时更新 update_columns 中的字段，未指定时为除主键、冲突列、创建时间、
+        软删除标记与 upsert_exclude_columns 外的所有字段；updated_at 总是刷新。
+        """
+        conflict_columns = tuple(conflict_columns or self.upsert_conflict_columns)
+        if not conflict_columns:
+            raise ValueError(f"{type(self).__name__} 未配置 upsert_conflict_columns")
+        if not objs_in:
+            return []
+
+        # 同一条语句内同一冲突键只能出现一次，否则 PostgreSQL 会报
+        # "ON CONFLICT DO UPDATE command cannot affect row a second time"
+        rows_by_key = {
+            tuple(row[c] for c in conflict_columns): row
+            for row in await self._to_insert_rows(objs_in)
+        }
+        rows = list(rows_by_key.values())
+
+        skip_columns = {
+            self._pk_column.key,
+            "created_at",
+            "updated_at",
+            "is_deleted",
+            *conflict_columns,
+        }
+        updatable = [key for key in rows[0] if key not in skip_columns]
+        if update_columns is None:
+            update_columns = [
+                key for key in updatable if key not in self.upsert_exclude_columns
+            ]
+        elif invalid := set(update_columns) - set(updatable):
+            raise ValueError(f"upsert 不能更新的字段: {sorted(invalid)}")
+
+        insert_stmt = pg_insert(self.model)
+        set_: dict[str, Any] = {
+            key: insert_stmt.excluded[key] for key in update_columns
+        }
+        # ON CONFLICT 不会触发 onupdate，需要显式刷新 updated_at
+        if "updated_at" in rows[0]:
+            set_["updated_at"] = func.now()
+        if not set_:
+            raise ValueError("upsert 没有可更新的字段")
+        statement = insert_stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            # 软删除表的唯一索引是部分索引，冲突推断需带上相同的谓词
+            index_where=sa.and_(*self.live_criteria()) if self.soft_delete else None,
+            set_=set_,
+        ).returning(self.model)
+
+        db_objs: list[ModelType] = []
+        try:
+            for chunk in _chunked(rows, chunk_size or self.bulk_chunk_size):
+                result = await session.exec(
+                    statement,
+                    params=list(chunk),
+                    # 已在会话中的对象需用返回值覆盖，否则拿到的是旧数据
+                    execution_options={"populate_existing": True},
+                )
+                db_objs.extend(result.scalars().all())
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return db_objs
@@ -0,0 +1,244 @@
+"""
+声明式过滤 / 排序
+
+每个 CRUD 通过 FilterSet 声明允许过滤的字段 (及操作符) 和允许排序的字段，
+列表接口通过 ListQuery 依赖 (app/dependencies/filters.py) 把查询参数转换为
+get_page 的 filters / order_by：
+
+    ?username__prefix=adm&id__in=1,2,3&status=1&sort=-created_at,id
+
+- 过滤只允许声明过的字段，且声明时即校验该列有索引，避免全表扫描；
+  prefix 生成 LIKE 'v%'，排序规则不是 "C" 时普通 B-tree 索引无法使用，
+  需要 text_pattern_ops 索引 (pattern_index) 或 pg_trgm GIN 索引 (trgm_index)
+- 同一 "形态" (字段 + 操作符组合) 的过滤条件只构建一次并缓存，请求间仅替换绑定参数，
+  生成的 SQL 文本保持不变，可复用 SQLAlchemy 编译缓存与 asyncpg 预编译语句缓存
+"""
+
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime
+from enum import StrEnum
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import SQLModel
+
+from app.core.exceptions import ValidationException
+
+
+class FilterOp(StrEnum):
+    EQ = "eq"  # ?field=v 或 ?field__eq=v
+    IN = "in"  # ?field__in=v1,v2
+    RANGE = "range"  # ?field__range=lo,hi (闭区间，任一端可留空)
+    PREFIX = "prefix"  # ?field__prefix=v (LIKE 'v%')
+
+
+# 列表接口的保留参数，不参与过滤解析
+RESERVED_PARAMS = {"page", "size", "fields", "sort", "format"}
+
+# (字段, 操作符, 变体) 的元组，RANGE 的变体记录上下界是否存在
+FilterShape = tuple[tuple[str, FilterOp, str], ...]
+
+
+def _is_indexed(table: sa.Table, column: sa.Column) -> bool:
+    """列是否可走索引：主键、唯一约束，或作为某个索引的首列"""
+    if column.primary_key or column.index or column.unique:
+        return True
+    groups: list[sa.Index | sa.UniqueConstraint] = [
+        *table.indexes,
+        *(c for c in table.constraints if isinstance(c, sa.UniqueConstraint)),
+    ]
+    return any(next(iter(g.columns), None) is column for g in groups)
+
+
+# 可以支撑 LIKE 前缀匹配的索引操作符类
+PREFIX_OPCLASSES = {"text_pattern_ops", "varchar_pattern_ops", "gin_trgm_ops"}
+
+
+def _supports_prefix(table: sa.Table, column: sa.Column) -> bool:
+    """列是否有可用于 LIKE 前缀匹配的索引 (首列使用 PREFIX_OPCLASSES 之一)"""
+    for index in table.indexes:
+        if next(iter(index.columns), None) is not column:
+            continue
+        ops = index.dialect_options["postgresql"]["ops"] or {}
+        if ops.get(column.key) in PREFIX_OPCLASSES:
+            return True
+    return False
+
+
+def escape_like(value: str) -> str:
+    """转义 LIKE 通配符 (转义字符为 "/")，配合 escape="/" 使用"""
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+class FilterSet:
+    """
+    模型的过滤 / 排序白名单
+
+    用法:
+        filter_set = FilterSet(
+            SysUser,
+            filterable={"username": {FilterOp.EQ, FilterOp.PREFIX}},
+            sortable={"id", "created_at"},
+        )
+    """
+
+    def __init__(
+        self,
+        model: type[SQLModel],
+        *,
+        filterable: Mapping[str, Iterable[FilterOp]],
+        sortable: Iterable[str] = (),
+    ) -> None:
+        self.model = model
+        self.table: sa.Table = model.__table__  # type: ignore[attr-defined]
+        self.filterable = {field: set(ops) for field, ops in filterable.items()}
+        self.sortable = set(sortable)
+
+        for field in [*self.filterable, *self.sortable]:
+            if field not in self.table.columns:
+                raise ValueError(f"{self.table.name} 不存在列 {field}")
+        for field, ops in self.filterable.items():
+            column = self.table.columns[field]
+            if not _is_indexed(self.table, column):
+                raise ValueError(
+                    f"{self.table.name}.{field} 没有索引，不能声明为可过滤字段"
+                )
+            if FilterOp.PREFIX in ops and not _supports_prefix(self.table, column):
+                raise ValueError(
+                    f"{self.table.name}.{field} 没有前缀匹配索引 "
+                    "(pattern_index / trgm_index)，不能声明 prefix 过滤"
+                )
+
+        self._criteria_cache: dict[FilterShape, list[sa.ColumnElement[bool]]] = {}
+
+    # ---------- 值转换 ----------
+
+    def _coerce(self, field: str, raw: str) -> Any:
+        column = self.table.columns[field]
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return raw
+
+        try:
+            if python_type is bool:
+                if raw.lower() in ("1", "true", "yes"):
+                    return True
+                if raw.lower() in ("0", "false", "no"):
+                    return False
+                raise ValueError(raw)
+            if python_type is int:
+                return int(raw)
+            if python_type is float:
+                return float(raw)
+            if python_type is datetime:
+                return datetime.fromisoformat(raw)
+            if python_type is date:
+                return date.fromisoformat(raw)
+        except ValueError:
+            raise ValidationException(f"字段 {field} 的值无效: {raw}") from None
+        return raw
+
+    # ---------- 条件模板 ----------
+
+    def _build_criteria(self, shape: FilterShape) -> list[sa.ColumnElement[bool]]:
+        criteria: list[sa.ColumnElement[bool]] = []
+        for field, op, variant in shape:
+            column = self.table.columns[field]
+            name = f"{field}__{op}"
+            if op == FilterOp.EQ:
+                criteria.append(column == sa.bindparam(name, type_=column.type))
+            elif op == FilterOp.IN:
+                # = ANY(:array) 只绑定一个参数，SQL 文本与元素个数无关
+                values = sa.bindparam(name, type_=ARRAY(column.type))
+                criteria.append(column == sa.any_(values))
+            elif op == FilterOp.PREFIX:
+                value = sa.bindparam(name, type_=column.type)
+                criteria.append(column.startswith(value, escape="/"))
+            elif op == FilterOp.RANGE:
+                if "lo" in variant:
+                    lo = sa.bindparam(f"{name}_lo", type_=column.type)
+                    criteria.append(column >= lo)
+                if "hi" in variant:
+                    hi = sa.bindparam(f"{name}_hi", type_=column.type)
+                    criteria.append(column <= hi)
+        return criteria
+
+    # ---------- 解析 ----------
+
+    def parse_filters(
+        self, params: Iterable[tuple[str, str]]
+    ) -> list[sa.ColumnElement[bool]]:
+        """将 (key, value) 查询参数解析为 SQL 过滤条件"""
+        shape: list[tuple[str, FilterOp, str]] = []
+        values: dict[str, Any] = {}
+
+        for key, raw in params:
+            if key in RESERVED_PARAMS:
+                continue
+            field, _, op_name = key.partition("__")
+            # 与本表无关的参数 (如前端防缓存的时间戳) 直接忽略
+            if not op_name and field not in self.table.columns:
+                continue
+
+            try:
+                op = FilterOp(op_name or FilterOp.EQ)
+            except ValueError:
+                raise ValidationException(f"不支持的过滤操作: {op_name}") from None
+            if op not in self.filterable.get(field, ()):
+                raise ValidationException(f"字段 {field} 不支持 {op} 过滤")
+
+            name = f"{field}__{op}"
+            if name in values or f"{name}_lo" in values or f"{name}_hi" in values:
+                raise ValidationException(f"重复的过滤条件: {key}")
+
+            variant = ""
+            if op == FilterOp.IN:
+                items = [v for v in raw.split(",") if v != ""]
+                if not items:
+                    raise ValidationException(f"字段 {field} 的值无效: {raw}")
+                values[name] = [self._coerce(field, v) for v in items]
+            elif op == FilterOp.RANGE:
+                lo, sep, hi = raw.partition(",")
+                if not sep or not (lo or hi):
+                    raise ValidationException(f"字段 {field} 的范围无效: {raw}")
+                if lo:
+                    variant += "lo"
+                    values[f"{name}_lo"] = self._coerce(field, lo)
+                if hi:
+                    variant += "hi"
+                    values[f"{name}_hi"] = self._coerce(field, hi)
+            elif op == FilterOp.PREFIX:
+                values[name] = escape_like(raw)
+            else:
+                values[name] = self._coerce(field, raw)
+            shape.append((field, op, variant))
+
+        if not shape:
+            return []
+
+        # 参数顺序不同但条件相同的请求共享同一模板
+        shape_key = tuple(sorted(shape))
+        criteria = self._criteria_cache.get(shape_key)
+        if criteria is None:
+            criteria = self._criteria_cache[shape_key] = self._build_criteria(shape_key)
+        return [criterion.params(values) for criterion in criteria]
+
+    def parse_sort(self, sort: str | None) -> list[sa.ColumnElement[Any]]:
+        """解析 sort=-created_at,id (前缀 - 表示倒序)"""
+        if not sort:
+            return []
+
+        order_by: list[sa.ColumnElement[Any]] = []
+        for item in sort.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            desc = item.startswith("-")
+            field = item.lstrip("-+")
+            if field not in self.sortable:
+                raise ValidationException(f"字段 {field} 不支持排序")
+            column = self.table.columns[field]
+            order_by.append(column.desc() if desc else column.asc())
+        return order_by
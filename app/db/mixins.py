@@ -1,45 +1,25 @@
 from datetime import UTC, datetime
-from zoneinfo import ZoneInfo
 
 import sqlalchemy as sa
-from pydantic import ConfigDict
 from sqlmodel import Field, SQLModel
 
-# 定义北京时区
-SHANGHAI_TZ = ZoneInfo("Asia/Shanghai")
+from app.core.base_schema import DisplayDatetime
 
 
-# 2. 定义全局时间格式化函数
-def datetime_formatter(dt: datetime) -> str:
-    """
-    将任何 datetime 对象转换为 'YYYY-MM-DD HH:MM:SS' 字符串
-    """
-    if dt is None:
-        return None
-    # 补全 UTC 时区 (防止 naive datetime 报错)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=UTC)
-    # 转为北京时间并格式化
-    return dt.astimezone(SHANGHAI_TZ).strftime("%Y-%m-%d %H:%M:%S")
-
-
-# 3. 定义项目的核心基类 (替换原生的 SQLModel)
+# 定义项目的核心基类 (替换原生的 SQLModel)
 class BaseSQLModel(SQLModel):
     """
     项目所有 DB 模型的基类
-    """
 
-    model_config = ConfigDict(
-        # 只要是 datetime 类型，无论是 created_at 还是 last_login_at，都会走这个逻辑
-        json_encoders={datetime: datetime_formatter}
-    )
+    时间字段声明为 DisplayDatetime，直接输出模型时按显示时区格式化
+    """
 
 
 # ==================== 基础功能 Mixin ====================
 
 
 class TimestampMixin(SQLModel):
-    created_at: datetime = Field(
+    created_at: DisplayDatetime = Field(
         # 1. 【解决警告】使用 timezone-aware 的 UTC 时间
         default_factory=lambda: datetime.now(UTC),
         sa_type=sa.DateTime(timezone=True),
@@ -51,7 +31,7 @@ class TimestampMixin(SQLModel):
         description="创建时间",
     )
 
-    updated_at: datetime = Field(
+    updated_at: DisplayDatetime = Field(
         default_factory=lambda: datetime.now(UTC),
         sa_type=sa.DateTime(timezone=True),
         sa_column_kwargs={
@@ -82,15 +62,66 @@ class BaseModel(TimestampMixin, BaseSQLModel):
 class SoftDeleteMixin(SQLModel):
     """
     软删除混入
+
+    CRUDBase 会自动识别该字段：查询只返回未删除的行，delete 改为单条 UPDATE。
+    常用查询列建议配合 live_index() 建立部分索引，墓碑行不会拖慢在用数据的查询。
     """
 
     is_deleted: bool = Field(
         default=False,
-        sa_column_kwargs={"comment": "是否删除 0:否 1:是"},
+        sa_column_kwargs={
+            "server_default": sa.false(),
+            "comment": "是否删除 0:否 1:是",
+        },
         description="是否删除",
     )
 
 
+def live_index(table_name: str, *columns: str, unique: bool = False) -> sa.Index:
+    """
+    软删除表的部分索引 (WHERE is_deleted = false)
+
+    只索引未删除的行；唯一索引时，已删除行不再占用唯一值 (如用户名可被重新使用)。
+    查询条件需包含 is_deleted = false 才能命中，CRUDBase 会自动加上。
+    """
+    prefix = "uq" if unique else "ix"
+    return sa.Index(
+        f"{prefix}_{table_name}_{'_'.join(columns)}_live",
+        *columns,
+        unique=unique,
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def trgm_index(table_name: str, column: str) -> sa.Index:
+    """
+    软删除表的 pg_trgm GIN 部分索引，支撑 ILIKE 前缀/包含匹配与 % 相似度查询
+
+    依赖 pg_trgm 扩展 (见 alembic/versions 中的 enable_pg_trgm 迁移)
+    """
+    return sa.Index(
+        f"ix_{table_name}_{column}_trgm_live",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def pattern_index(table_name: str, column: str) -> sa.Index:
+    """
+    前缀匹配 (LIKE 'abc%') 用的 B-tree 索引 (text_pattern_ops)
+
+    数据库排序规则不是 "C" 时，普通 B-tree 索引不能用于 LIKE 前缀匹配；
+    text_pattern_ops 按字节比较，同时支持前缀匹配与等值查询
+    """
+    return sa.Index(
+        f"ix_{table_name}_{column}_pattern",
+        column,
+        postgresql_ops={column: "text_pattern_ops"},
+    )
+
+
 class SystemModel(BaseModel):
     """
     【系统配置模型】
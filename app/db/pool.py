@@ -0,0 +1,239 @@
+"""
+连接池监控与自适应容量
+
+- InstrumentedQueuePool: 在 AsyncAdaptedQueuePool 基础上记录签出等待耗时、
+  溢出签出次数、超时次数以及连接年龄
+- PoolAutoSizer: 按观测到的签出等待时间，在上下限之间调整连接池可用的溢出连接数
+
+指标均为进程内数据，多 worker 部署时每个 worker 各自统计。
+"""
+
+import asyncio
+import bisect
+import contextlib
+import time
+from typing import Any, cast
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# 直方图桶上界 (秒)，最后一个桶为 +Inf
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+AGE_BUCKETS = (1.0, 10.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0)
+
+
+class Histogram:
+    """累积直方图 (与 Prometheus histogram 语义一致)"""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float, since: list[int] | None = None) -> float:
+        """
+        估算分位数 (取所在桶的上界)
+
+        :param since: 之前的 counts 快照，传入时只统计快照之后的观测值
+        """
+        counts = self.counts
+        if since is not None:
+            counts = [c - s for c, s in zip(self.counts, since, strict=True)]
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        cumulative, acc = {}, 0
+        for bound, c in zip(self.buckets, self.counts, strict=False):
+            acc += c
+            cumulative[str(bound)] = acc
+        cumulative["+Inf"] = self.count
+        return {"buckets": cumulative, "sum": round(self.sum, 6), "count": self.count}
+
+
+class PoolMetrics:
+    """单个连接池的计数器与直方图"""
+
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram(WAIT_BUCKETS)
+        self.connection_age = Histogram(AGE_BUCKETS)
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        # 当前统计窗口内的签出连接峰值，由 PoolAutoSizer 每个周期重置
+        self.peak_checked_out = 0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """带监控指标的异步队列连接池，通过 create_async_engine(poolclass=...) 启用"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        # recreate() 会复制原连接池的事件监听，此时无需重复注册
+        if kwargs.get("_dispatch") is None:
+            event.listen(self, "checkout", self._on_checkout)
+
+    def _on_checkout(
+        self, _dbapi_connection: Any, connection_record: Any, _proxy: Any
+    ) -> None:
+        age = time.time() - connection_record.last_connect_time
+        self.metrics.connection_age.observe(age)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # dispose/失效重建时沿用同一份指标及当前溢出上限
+        pool = cast(InstrumentedQueuePool, super().recreate())
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        try:
+            fairy = super().connect()
+        except sa_exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        now = time.perf_counter()
+        metrics = self.metrics
+        metrics.checkout_wait.observe(now - start)
+        metrics.checkouts += 1
+        if self.overflow() > 0:
+            metrics.overflow_checkouts += 1
+        metrics.peak_checked_out = max(metrics.peak_checked_out, self.checkedout())
+        return fairy
+
+    @property
+    def max_overflow(self) -> int:
+        return self._max_overflow
+
+    def set_max_overflow(self, value: int) -> None:
+        """
+        调整溢出连接上限 (连接总数上限 = size + max_overflow)
+
+        收缩时已签出的溢出连接不会被打断，归还时若池已满会被直接关闭
+        """
+        with self._overflow_lock:
+            self._max_overflow = value
+
+    def stats(self) -> dict[str, Any]:
+        metrics = self.metrics
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": metrics.checkouts,
+            "overflow_checkouts": metrics.overflow_checkouts,
+            "timeouts": metrics.timeouts,
+            "checkout_wait_seconds": metrics.checkout_wait.snapshot(),
+            "connection_age_seconds": metrics.connection_age.snapshot(),
+        }
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """读取引擎的连接池指标 (非 InstrumentedQueuePool 时仅返回状态字符串)"""
+    pool = engine.sync_engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+class PoolAutoSizer:
+    """
+    连接池自适应容量控制器
+
+    每个周期查看签出等待时间的 p95：
+    - 超过目标值或出现超时时，按当前容量的 1/4 (至少 1) 扩大溢出上限
+    - 远低于目标值且峰值占用不足一半时，每次收缩 1 个连接
+    容量始终保持在 [pool_size, max_size] 区间内
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        max_size: int,
+        target_wait: float,
+        interval: float,
+    ):
+        self.engine = engine
+        self.max_size = max_size
+        self.target_wait = target_wait
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self._last_counts: list[int] | None = None
+        self._last_timeouts = 0
+
+    @property
+    def pool(self) -> InstrumentedQueuePool:
+        return self.engine.sync_engine.pool  # type: ignore[return-value]
+
+    def adjust(self) -> None:
+        """执行一次容量调整 (由后台任务周期调用)"""
+        pool = self.pool
+        metrics = pool.metrics
+        p95 = metrics.checkout_wait.quantile(0.95, self._last_counts)
+        timeouts = metrics.timeouts - self._last_timeouts
+        peak = metrics.peak_checked_out
+
+        self._last_counts = list(metrics.checkout_wait.counts)
+        self._last_timeouts = metrics.timeouts
+        metrics.peak_checked_out = pool.checkedout()
+
+        capacity = pool.size() + pool.max_overflow
+        if p95 > self.target_wait or timeouts:
+            new_capacity = min(self.max_size, capacity + max(1, capacity // 4))
+        elif p95 < self.target_wait / 4 and peak < capacity / 2:
+            new_capacity = max(pool.size(), capacity - 1)
+        else:
+            return
+        if new_capacity != capacity:
+            pool.set_max_overflow(new_capacity - pool.size())
+            logger.info(
+                "连接池容量调整 {} -> {} | p95_wait={}s timeouts={} peak={}",
+                capacity,
+                new_capacity,
+                p95,
+                timeouts,
+                peak,
+            )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.adjust()
+            except Exception:
+                logger.exception("连接池容量调整失败")
+
+    def start(self) -> None:
+        if not isinstance(self.pool, InstrumentedQueuePool):
+            logger.warning("连接池未启用监控，跳过自适应容量")
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
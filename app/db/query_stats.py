@@ -0,0 +1,71 @@
+"""
+按请求统计 SQL 执行情况
+
+通过 SQLAlchemy 的 cursor 事件累计语句数量与耗时，统计对象挂在 ContextVar 上，
+只有处于 track_queries() 范围内的执行才会被记录。
+"""
+
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryStats:
+    """单个请求内的 SQL 统计"""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """执行次数达到阈值的相同语句 (典型的 N+1 懒加载)"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "sql_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """在当前上下文中开启 SQL 统计"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Any, _cursor: Any, _statement: str, *_args: Any
+) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start_time")
+    if starts:
+        stats.duration += time.perf_counter() - starts.pop()
+    stats.count += 1
+    # 同一语句文本 (参数化后) 反复执行即视为 N+1 嫌疑
+    stats.statements[statement] += 1
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """为引擎挂载统计钩子"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
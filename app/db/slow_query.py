@@ -0,0 +1,129 @@
+"""
+慢查询记录
+
+超过 SLOW_QUERY_MS 的语句记录规整后的 SQL、参数形态 (不含参数值) 与来源路由；
+按 SLOW_QUERY_EXPLAIN_RATE 抽样对只读语句执行 EXPLAIN (ANALYZE, BUFFERS)，
+执行计划写入 logs/slow_query_*.log (见 app/core/logging.py)。
+"""
+
+import random
+import re
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.context import current_route
+
+_WHITESPACE = re.compile(r"\s+")
+# 只有不会修改数据的语句才允许 EXPLAIN ANALYZE (ANALYZE 会真正执行一次)
+_READ_ONLY_SQL = re.compile(r"^\s*(SELECT|WITH|VALUES)\b", re.IGNORECASE)
+_DATA_MODIFYING = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def param_shape(parameters: Any, executemany: bool) -> str:
+    """参数形态：只记录类型与数量，避免日志泄露敏感值"""
+    if executemany:
+        rows = list(parameters)
+        first = param_shape(rows[0], False) if rows else "()"
+        return f"{len(rows)} x {first}"
+    items: Iterable[Any]
+    if isinstance(parameters, dict):
+        items = parameters.values()
+    elif isinstance(parameters, list | tuple):
+        items = parameters
+    else:
+        return type(parameters).__name__
+
+    def describe(value: Any) -> str:
+        if isinstance(value, list | tuple):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    return "(" + ", ".join(describe(v) for v in items) + ")"
+
+
+def _explain(conn: Any, statement: str, parameters: Any) -> str:
+    """
+    在同一连接上用新游标执行 EXPLAIN，不影响原游标已缓冲的结果
+
+    EXPLAIN ANALYZE 会真正执行一次语句，可能因 statement_timeout 等失败；
+    放在保存点中执行并始终回滚到保存点，失败时请求所在的事务仍可继续使用
+    """
+    explain_cursor = conn.connection.cursor()
+    try:
+        explain_cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            explain_cursor.execute(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            return "\n".join(row[0] for row in explain_cursor.fetchall())
+        finally:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        explain_cursor.close()
+
+
+def _should_explain(statement: str, context: Any, executemany: bool) -> bool:
+    if executemany or random.random() >= settings.SLOW_QUERY_EXPLAIN_RATE:
+        return False
+    # 服务端游标 (流式导出) 仍占用着连接，不能插入其他语句
+    if context is not None and context.execution_options.get("stream_results"):
+        return False
+    return bool(_READ_ONLY_SQL.match(statement)) and not _DATA_MODIFYING.search(
+        statement
+    )
+
+
+def _before_cursor_execute(conn: Any, *_args: Any) -> None:
+    conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    _cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    starts = conn.info.get("slow_query_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    if elapsed_ms < settings.SLOW_QUERY_MS:
+        return
+
+    sql = normalize_sql(statement)
+    route = current_route()
+    logger.bind(slow_query=True).warning(
+        "慢查询 {:.1f}ms | {} | params={} | {}",
+        elapsed_ms,
+        route,
+        param_shape(parameters, executemany),
+        sql,
+    )
+    if _should_explain(statement, context, executemany):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as exc:
+            logger.bind(slow_query=True).warning("EXPLAIN 失败: {}", exc)
+            return
+        logger.bind(slow_query=True, explain=True).info(
+            "EXPLAIN | {} | {}\n{}", route, sql, plan
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """为引擎挂载慢查询钩子"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,91 @@
+"""
+资源版本号
+
+被跟踪的表上挂有语句级触发器，任何 INSERT / UPDATE / DELETE / TRUNCATE 都会在
+同一事务内递增 sys_resource_versions 中对应资源的版本号。版本号由数据库维护，
+多 worker、多实例部署时天然一致，也覆盖 CTE、批量语句、外键级联等绕过 ORM 的写入。
+
+读接口据此生成 ETag (见 app/dependencies/etag.py)，版本号未变化时无需查询业务数据。
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlmodel import Field, SQLModel, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# 表名 -> 资源名，由 track_versions() 注册
+VERSIONED_TABLES: dict[str, str] = {}
+
+BUMP_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION bump_resource_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO sys_resource_versions (resource, version) VALUES (TG_ARGV[0], 1)
+    ON CONFLICT (resource)
+    DO UPDATE SET version = sys_resource_versions.version + 1;
+    RETURN NULL;
+END
+$$
+"""
+
+
+class ResourceVersion(SQLModel, table=True):
+    """资源版本号表 (由触发器写入，应用只读)"""
+
+    __tablename__ = "sys_resource_versions"
+    __table_args__ = {"comment": "资源版本号 (用于 ETag)"}
+
+    resource: str = Field(primary_key=True, max_length=50, description="资源名")
+    version: int = Field(
+        default=0, sa_type=sa.BigInteger, description="版本号 (每次写入递增)"
+    )
+
+
+def trigger_ddl(table_name: str, resource: str) -> str:
+    return (
+        f"CREATE OR REPLACE TRIGGER trg_{table_name}_version "
+        f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table_name} "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION bump_resource_version('{resource}')"
+    )
+
+
+def track_versions(resource: str, *models: type[SQLModel]) -> None:
+    """
+    登记参与资源版本号的表
+
+    用法 (定义模型后): track_versions("menu", SysMenu)
+    """
+    for model in models:
+        VERSIONED_TABLES[str(model.__tablename__)] = resource
+
+
+@event.listens_for(sa.Table, "after_create")
+def _create_version_trigger(table: sa.Table, connection: Any, **_kw: Any) -> None:
+    # 只处理模型 metadata 的 create_all() (开发 / 测试建库)；
+    # Alembic 迁移中 op.create_table() 的表属于独立的 MetaData，触发器由迁移创建
+    # (见 alembic/versions/0006_resource_versions.py)，新增被跟踪表时需在迁移中补建
+    resource = VERSIONED_TABLES.get(table.name)
+    if (
+        resource is None
+        or table.metadata is not SQLModel.metadata
+        or connection.dialect.name != "postgresql"
+    ):
+        return
+    connection.exec_driver_sql(BUMP_FUNCTION_DDL)
+    connection.exec_driver_sql(trigger_ddl(table.name, resource))
+
+
+async def get_versions(
+    session: AsyncSession, resources: Sequence[str]
+) -> tuple[int, ...]:
+    """按 resources 的顺序返回版本号，从未写入过的资源为 0"""
+    result = await session.exec(
+        select(ResourceVersion.resource, ResourceVersion.version).where(
+            col(ResourceVersion.resource).in_(resources)
+        )
+    )
+    versions = dict(result.all())
+    return tuple(versions.get(resource, 0) for resource in resources)
@@ -1,10 +1,20 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Callable
+from itertools import cycle
+from typing import Any
 
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.exceptions import TimeoutException
+from app.db import query_stats, slow_query
+from app.db.pool import InstrumentedQueuePool
+from app.dependencies.deadline import request_deadline
 
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -13,16 +23,101 @@ engine = create_async_engine(
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=settings.DB_POOL_PRE_PING,
+    poolclass=InstrumentedQueuePool,
 )
 
+# 模块级会话工厂，整个进程共享，避免每个请求重复构造
+# AsyncSession 在第一次真正执行 SQL 时才从连接池取连接，commit/rollback 后即归还，
+# 不查库 (如命中缓存) 的请求不会占用连接
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# 只读副本引擎：事务统一以 BEGIN READ ONLY 开启，误写会直接被数据库拒绝
+replica_engines = [
+    create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        poolclass=InstrumentedQueuePool,
+        execution_options={"postgresql_readonly": True},
+    )
+    for url in settings.DATABASE_REPLICA_URLS
+]
+_replica_sessions = cycle(
+    async_sessionmaker(e, class_=AsyncSession, expire_on_commit=False)
+    for e in replica_engines
+)
+
+for _engine in (engine, *replica_engines):
+    slow_query.instrument_engine(_engine)
+    # DEBUG 模式下统计每个请求的 SQL 数量与耗时，见 app/middleware/sql_stats.py
+    if settings.DEBUG:
+        query_stats.instrument_engine(_engine)
+
+# 可以安全路由到副本的请求方法
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# 写请求后下发的粘滞 Cookie，有效期内该客户端的读请求仍走主库
+STICKY_COOKIE = "db_primary"
+# 需要下发粘滞 Cookie 的请求标记 (request.state)，由 ReplicaStickyMiddleware 写入响应
+STICKY_STATE = "db_primary_sticky"
+# PostgreSQL query_canceled，statement_timeout 触发时返回
+QUERY_CANCELED = "57014"
+
+
+def _statement_timeout_hook(request: Request) -> Callable[..., None]:
+    """每个事务开始时按请求剩余时间设置 statement_timeout (SET LOCAL 随事务结束失效)"""
+
+    def after_begin(_session: Any, _transaction: Any, connection: Any) -> None:
+        deadline = request_deadline(request)
+        if deadline is None:
+            return
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            raise TimeoutException()
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {remaining_ms}")
+
+    return after_begin
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    """主库会话"""
     async with async_session() as session:
         yield session
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """别名函数，与get_async_session功能相同，用于保持一致性"""
-    async for session in get_async_session():
+async def get_replica_session() -> AsyncGenerator[AsyncSession, None]:
+    """只读副本会话 (多个副本轮询)，未配置副本时回退到主库"""
+    factory = next(_replica_sessions) if replica_engines else async_session
+    async with factory() as session:
+        yield session
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    请求级会话依赖，按请求方法读写分离
+
+    - GET/HEAD/OPTIONS 走只读副本 (只读事务)
+    - 其他方法走主库，并由 ReplicaStickyMiddleware 下发粘滞 Cookie，
+      DB_REPLICA_STICKY_SECONDS 内该客户端的读请求也走主库，
+      避免刚写入的数据因复制延迟读不到
+    - 每个事务按请求剩余时限设置 statement_timeout，超时转为 TimeoutException
+    """
+    factory = async_session
+    if replica_engines:
+        if request.method in SAFE_METHODS and STICKY_COOKIE not in request.cookies:
+            factory = next(_replica_sessions)
+        elif request.method not in SAFE_METHODS:
+            setattr(request.state, STICKY_STATE, True)
+    # 会话本身不占连接，首条 SQL 时才签出，请求结束 (依赖退出) 时归还
+    session = factory()
+    event.listen(session.sync_session, "after_begin", _statement_timeout_hook(request))
+    try:
         yield session
+    except DBAPIError as exc:
+        if getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED:
+            raise TimeoutException() from exc
+        raise
+    finally:
+        # 请求被取消 (客户端断开等) 时也要完整关闭会话，确保连接回到连接池
+        await asyncio.shield(session.close())
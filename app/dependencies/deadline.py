@@ -0,0 +1,41 @@
+import time
+
+from fastapi import Request
+
+from app.core.config import settings
+
+
+class Deadline:
+    """
+    路由级请求时限依赖类
+    用法: dependencies=[Depends(Deadline(5_000))]
+
+    剩余时间会在每个数据库事务开始时以 SET LOCAL statement_timeout 下发，
+    需放在其他会查库的依赖 (如 Perms) 之前
+    """
+
+    def __init__(self, timeout_ms: int):
+        self.timeout_ms = timeout_ms
+
+    async def __call__(self, request: Request) -> None:
+        request.state.deadline = _started_at(request) + self.timeout_ms / 1000
+
+
+def _started_at(request: Request) -> float:
+    """请求到达时间，由 RequestContextMiddleware 记录；未经过该中间件时以首次读取为准"""
+    started_at = getattr(request.state, "started_at", None)
+    if started_at is None:
+        started_at = request.state.started_at = time.monotonic()
+    return started_at
+
+
+def request_deadline(request: Request) -> float | None:
+    """
+    当前请求的截止时间 (time.monotonic 时钟)
+
+    未声明 Deadline 的路由使用 REQUEST_DEADLINE_MS，配置为 0 时不限时
+    """
+    deadline = getattr(request.state, "deadline", None)
+    if deadline is None and settings.REQUEST_DEADLINE_MS > 0:
+        deadline = _started_at(request) + settings.REQUEST_DEADLINE_MS / 1000
+    return deadline
@@ -0,0 +1,106 @@
+from fastapi import Depends, Request, Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.etag import check_not_modified, make_etag
+from app.core.resp import accepts_msgpack
+from app.db.versioning import get_versions
+from app.dependencies.auth import get_current_user
+from app.dependencies.database import get_session
+from app.system.models import SysUser
+
+
+class VersionETag:
+    """
+    基于资源版本号的条件 GET 依赖类
+    用法: dependencies=[Depends(VersionETag("menu"))]
+
+    只查询一次版本号表 (主键查找) 生成 ETag，与 If-None-Match 匹配时直接返回 304，
+    处理函数中的业务查询与序列化都不会执行。
+    版本号先于业务数据读取，期间发生的写入最多导致客户端多拉取一次，不会返回过期内容。
+    JSON 与 MessagePack 是同一资源的不同表示，协商出的媒体类型一并计入 ETag。
+    资源名见 app/system/models.py 中的 track_versions()。
+    """
+
+    cache_control = "no-cache"
+
+    def __init__(self, *resources: str):
+        self.resources = resources
+        self._salts: dict[str | None, str] = {}
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_session),
+    ) -> None:
+        versions = await get_versions(session, self.resources)
+        etag = make_etag(self._salt(request), _media_type(request), *versions)
+        check_not_modified(request, response, etag, self.cache_control)
+
+    def _salt(self, request: Request) -> str:
+        """
+        响应结构指纹：response_model 的 JSON Schema 与显示时区
+
+        接口输出结构随代码发布变化时，旧 ETag 自动失效
+        """
+        route = request.scope.get("route")
+        key = getattr(route, "unique_id", None)
+        salt = self._salts.get(key)
+        if salt is None:
+            model = getattr(route, "response_model", None)
+            schema = TypeAdapter(model).json_schema() if model is not None else None
+            salt = make_etag(to_json(schema), settings.DISPLAY_TIMEZONE)
+            self._salts[key] = salt
+        return salt
+
+
+def _media_type(request: Request) -> str:
+    """与 MsgPackMiddleware 相同的协商结果"""
+    return "msgpack" if accepts_msgpack(request.headers.get("accept")) else "json"
+
+
+class UserVersionETag(VersionETag):
+    """
+    按当前用户区分的版本号 ETag
+    用法: dependencies=[Depends(UserVersionETag("menu", "role_menu"))]
+
+    用户 ID 与 updated_at (超级管理员标记、状态等变更) 一并计入 ETag
+    """
+
+    cache_control = "private, no-cache"
+
+    async def __call__(  # type: ignore[override]
+        self,
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_session),
+        current_user: SysUser = Depends(get_current_user),
+    ) -> None:
+        versions = await get_versions(session, self.resources)
+        etag = make_etag(
+            self._salt(request),
+            _media_type(request),
+            current_user.id,
+            current_user.updated_at,
+            *versions,
+        )
+        check_not_modified(request, response, etag, self.cache_control)
+
+
+class ContentETag:
+    """
+    基于响应内容摘要的条件 GET 依赖类 (没有版本号可用时)
+    用法: dependencies=[Depends(ContentETag(private=True))]
+
+    由 ETagMiddleware 对完整响应体取摘要生成 ETag，匹配时改为返回 304；
+    处理函数照常执行，节省的是传输而不是查询。
+    """
+
+    def __init__(self, private: bool = False):
+        self.cache_control = "private, no-cache" if private else "no-cache"
+
+    def __call__(self, request: Request) -> None:
+        request.state.content_etag = self.cache_control
@@ -0,0 +1,37 @@
+from fastapi import Query
+from pydantic import BaseModel
+
+from app.core.exceptions import ValidationException
+
+
+class SparseFields:
+    """
+    稀疏字段 (fields=) 依赖注入类
+    用法: fields: list[str] | None = Depends(SparseFields(SysUserResponse))
+
+    只允许请求响应 Schema 中声明过的字段，防止通过 fields 读取
+    hashed_password 等未对外暴露的列。
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self.allowed = set(schema.model_fields)
+
+    def __call__(
+        self,
+        fields: str | None = Query(
+            default=None,
+            description="只返回指定字段，逗号分隔，如 id,username,email",
+        ),
+    ) -> list[str] | None:
+        if not fields:
+            return None
+
+        # 去重并保持请求顺序
+        requested = list(
+            dict.fromkeys(f.strip() for f in fields.split(",") if f.strip())
+        )
+        invalid = [f for f in requested if f not in self.allowed]
+        if invalid:
+            raise ValidationException(f"不支持的字段: {', '.join(invalid)}")
+        return requested or None
@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+import sqlalchemy as sa
+from fastapi import Query, Request
+
+from app.db.filters import FilterSet
+
+
+@dataclass
+class ListFilters:
+    """解析后的过滤与排序条件，直接传给 get_page(filters=..., order_by=...)"""
+
+    filters: list[sa.ColumnElement[bool]] = field(default_factory=list)
+    order_by: list[sa.ColumnElement[Any]] = field(default_factory=list)
+
+
+class ListQuery:
+    """
+    列表过滤 / 排序依赖注入类
+    用法: query: ListFilters = Depends(ListQuery(crud_user.filter_set))
+    """
+
+    def __init__(self, filter_set: FilterSet) -> None:
+        self.filter_set = filter_set
+
+    def __call__(
+        self,
+        request: Request,
+        sort: str | None = Query(
+            default=None, description="排序字段，逗号分隔，- 前缀表示倒序"
+        ),
+    ) -> ListFilters:
+        return ListFilters(
+            filters=self.filter_set.parse_filters(request.query_params.multi_items()),
+            order_by=self.filter_set.parse_sort(sort),
+        )
@@ -15,6 +15,14 @@ from app.core.exceptions import (
     http_exception_handler,
     validation_exception_handler,
 )
+from app.middleware import (
+    CompressionMiddleware,
+    ETagMiddleware,
+    MsgPackMiddleware,
+    ReplicaStickyMiddleware,
+    RequestContextMiddleware,
+    SQLStatsMiddleware,
+)
 from app.utils.lifespan import lifespan
 
 limiter = Limiter(key_func=get_remote_address)
@@ -30,7 +38,8 @@ def create_app() -> FastAPI:
         redirect_slashes=False,
         docs_url=None,
         redoc_url=None,
-        openapi_url="/openapi.json",
+        # /openapi.json 由 register_docs 注册，返回缓存的预压缩文档
+        openapi_url=None,
         lifespan=lifespan,
     )
 
@@ -43,10 +52,23 @@ def create_app() -> FastAPI:
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(BusinessException, business_exception_handler)
 
-    # 2. 注册业务路由
+    # 2. 注册中间件
+    if settings.DEBUG:
+        app.add_middleware(SQLStatsMiddleware)
+    if settings.DATABASE_REPLICA_URLS:
+        app.add_middleware(ReplicaStickyMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    # MessagePack 协商，位于 ETag 内层，两种格式的响应体各自生成摘要
+    app.add_middleware(MsgPackMiddleware)
+    # 内容摘要 ETag 需按未压缩的响应体计算，放在压缩中间件内层
+    app.add_middleware(ETagMiddleware)
+    # 最外层：压缩其它中间件追加响应头之后的最终响应
+    app.add_middleware(CompressionMiddleware)
+
+    # 3. 注册业务路由
     app.include_router(api_v1_router, prefix="/api/v1")
 
-    # 3. 注册文档路由 (Scalar)
+    # 4. 注册文档路由 (Scalar)
     register_docs(app)
 
     return app
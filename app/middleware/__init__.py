@@ -0,0 +1,15 @@
+from .compression import CompressionMiddleware
+from .etag import ETagMiddleware
+from .msgpack import MsgPackMiddleware
+from .replica_sticky import ReplicaStickyMiddleware
+from .request_context import RequestContextMiddleware
+from .sql_stats import SQLStatsMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "ETagMiddleware",
+    "MsgPackMiddleware",
+    "ReplicaStickyMiddleware",
+    "RequestContextMiddleware",
+    "SQLStatsMiddleware",
+]
@@ -0,0 +1,106 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.compression import (
+    Codec,
+    StreamCompressor,
+    compression_level,
+    is_compressible,
+    negotiate_encoding,
+)
+from app.core.config import settings
+
+
+class CompressionMiddleware:
+    """
+    按 Accept-Encoding 协商的响应压缩中间件 (zstd / br / gzip)
+
+    - 一次性返回的响应小于 COMPRESSION_MIN_SIZE 时不压缩
+    - 流式响应 (如导出) 逐块压缩，不受大小阈值限制
+    - 已带 Content-Encoding 的响应 (如 CompressedPayload) 及不可压缩的媒体类型原样透传
+    - 压缩后强 ETag 转为弱 ETag，与未压缩版本区分
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        codec = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedResponder(self.app, codec)(scope, receive, send)
+
+
+class _CompressedResponder:
+    """单个请求的压缩状态：暂存响应头，直到看到第一块响应体再决定是否压缩"""
+
+    def __init__(self, app: ASGIApp, codec: Codec) -> None:
+        self.app = app
+        self.codec = codec
+        self.send: Send
+        self.start_message: Message | None = None
+        self.compressor: StreamCompressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = not is_compressible(Headers(raw=message["headers"]))
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.compressor is not None:
+            # 流式响应的后续分块
+            chunk = self.compressor.compress(body)
+            if not more_body:
+                chunk += self.compressor.flush()
+            await self.send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+            return
+
+        start = self.start_message
+        assert start is not None
+        if not more_body and len(body) < settings.COMPRESSION_MIN_SIZE:
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers = MutableHeaders(scope=start)
+        headers["Content-Encoding"] = self.codec.name
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        level = compression_level(self.codec.name)
+        if more_body:
+            del headers["Content-Length"]
+            self.compressor = self.codec.stream(level)
+            body = self.compressor.compress(body)
+        else:
+            body = self.codec.compress(body, level)
+            headers["Content-Length"] = str(len(body))
+
+        await self.send(start)
+        await self.send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
@@ -0,0 +1,64 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.etag import content_etag, etag_matches
+
+
+class ETagMiddleware:
+    """
+    内容摘要 ETag 中间件，只处理声明了 ContentETag 依赖的 GET 请求
+
+    - 对 200 的完整响应体取摘要生成弱 ETag
+    - 与 If-None-Match 匹配时丢弃响应体，改为 304
+    - 流式响应及已带 ETag 的响应 (如 VersionETag) 原样透传
+    - 需注册在 CompressionMiddleware 内层，按未压缩的内容计算摘要
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Message | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message
+            # 依赖执行后才能知道是否启用，在响应开始时读取标记
+            cache_control = scope.get("state", {}).get("content_etag")
+            if message["type"] == "http.response.start":
+                if (
+                    cache_control
+                    and message["status"] == 200
+                    and "etag" not in Headers(raw=message["headers"])
+                ):
+                    start_message = message
+                    return
+                await send(message)
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            if message.get("more_body", False):
+                await send(start)
+                await send(message)
+                return
+
+            etag = content_etag(message.get("body", b""))
+            headers["ETag"] = etag
+            headers["Cache-Control"] = cache_control
+            if etag_matches(if_none_match, etag):
+                start["status"] = 304
+                del headers["Content-Length"]
+                del headers["Content-Type"]
+                message = {"type": "http.response.body", "body": b""}
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
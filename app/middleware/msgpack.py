@@ -0,0 +1,134 @@
+import contextlib
+
+from pydantic_core import from_json, to_json
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.resp import (
+    MSGPACK_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPES,
+    accepts_msgpack,
+    msgpack,
+)
+
+
+class MsgPackMiddleware:
+    """
+    MessagePack 内容协商中间件 (未安装 msgpack 时直接透传)
+
+    - 请求体 Content-Type 为 application/msgpack 时解码并转为 JSON 交给 FastAPI 解析，
+      路由的请求体声明与校验规则不变；无法解码时原样交给 FastAPI，按请求体解析错误返回 400
+    - Accept 优先 application/msgpack 时，将 JSON 响应转为 MessagePack。
+      路由仍走 pydantic-core 直接输出 JSON 的快速路径，再解析后由 msgpack 编码，
+      耗时与由模型直接编码相当 (见 scripts/bench_msgpack.py)，无需改动各路由；
+      异常处理器直接输出 MessagePack
+    - JSON / MessagePack 响应追加 Vary: Accept
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or msgpack is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_type = headers.get("content-type", "").partition(";")[0].strip()
+        if content_type in MSGPACK_MEDIA_TYPES:
+            scope, receive = await _decode_request_body(scope, receive)
+
+        if not accepts_msgpack(headers.get("accept")):
+            await self.app(scope, receive, _vary_on_accept(send))
+            return
+
+        start_message: Message | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                response_type = response_headers.get("content-type", "")
+                if response_type.startswith("application/json"):
+                    start_message = message
+                    return
+                if response_type.startswith(MSGPACK_MEDIA_TYPE):
+                    _add_vary_accept(response_headers)
+                await send(message)
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            _add_vary_accept(headers)
+            if message.get("more_body", False):
+                # 分块输出的 JSON 无法整体转换，保持原样
+                await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if body:
+                body = msgpack.packb(from_json(body))
+                headers["Content-Length"] = str(len(body))
+            headers["Content-Type"] = MSGPACK_MEDIA_TYPE
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _vary_on_accept(send: Send) -> Send:
+    async def send_wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(scope=message)
+            if headers.get("content-type", "").startswith("application/json"):
+                _add_vary_accept(headers)
+        await send(message)
+
+    return send_wrapper
+
+
+def _add_vary_accept(headers: MutableHeaders) -> None:
+    """追加 Vary: Accept (条件 GET 依赖已设置时不重复追加)"""
+    vary = headers.get("vary", "")
+    if "accept" not in {item.strip().lower() for item in vary.split(",")}:
+        headers.add_vary_header("Accept")
+
+
+async def _decode_request_body(scope: Scope, receive: Receive) -> tuple[Scope, Receive]:
+    """读取完整的 MessagePack 请求体并转为 JSON，返回改写后的 scope 与 receive"""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # 客户端在发送请求体期间断开，交由下游按断开处理
+            return scope, _replay(message, receive)
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+
+    body = b"".join(chunks)
+    with contextlib.suppress(ValueError, TypeError):
+        # 无法解码时保留原始字节，由 FastAPI 按请求体解析错误返回 400
+        body = to_json(msgpack.unpackb(body))
+
+    headers = MutableHeaders(scope=scope)
+    headers["Content-Type"] = "application/json"
+    headers["Content-Length"] = str(len(body))
+    request_message = {"type": "http.request", "body": body, "more_body": False}
+    return scope, _replay(request_message, receive)
+
+
+def _replay(message: Message, receive: Receive) -> Receive:
+    """先返回已读取的消息，之后的调用 (如等待断开) 交回原 receive"""
+    pending: list[Message] = [message]
+
+    async def wrapped() -> Message:
+        if pending:
+            return pending.pop()
+        return await receive()
+
+    return wrapped
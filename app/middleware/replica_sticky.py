@@ -0,0 +1,37 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.dependencies.database import STICKY_COOKIE, STICKY_STATE
+
+
+class ReplicaStickyMiddleware:
+    """
+    读写分离粘滞 Cookie 中间件 (配置了只读副本时启用)
+
+    get_session 为写请求打上标记，这里在最终响应上追加 Set-Cookie：
+    处理函数直接返回 Response (导出、MessagePack / 快速 JSON 响应等) 时，
+    依赖注入的 response 上设置的响应头会被丢弃，不能依赖它下发
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.cookie = (
+            f"{STICKY_COOKIE}=1; HttpOnly; "
+            f"Max-Age={settings.DB_REPLICA_STICKY_SECONDS}; Path=/; SameSite=lax"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # request.state 即 scope["state"]，依赖执行后才会被写入
+                state = scope.get("state", {})
+                if state.get(STICKY_STATE):
+                    MutableHeaders(scope=message).append("set-cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
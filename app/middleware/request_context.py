@@ -0,0 +1,26 @@
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.context import request_scope
+
+
+class RequestContextMiddleware:
+    """
+    将当前请求的 scope 放入 ContextVar，供慢查询日志等非请求代码定位来源路由；
+    同时在请求到达时记录 request.state.started_at，作为 Deadline 计时起点
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        scope.setdefault("state", {})["started_at"] = time.monotonic()
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
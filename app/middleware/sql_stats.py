@@ -0,0 +1,57 @@
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.context import route_template
+from app.db.query_stats import track_queries
+
+
+class SQLStatsMiddleware:
+    """
+    请求级 SQL 统计中间件 (仅在 DEBUG 模式下注册)
+
+    - 响应头返回 X-DB-Query-Count / X-DB-Query-Time (毫秒)
+    - 语句数超过路由预算 (SQL_ROUTE_BUDGETS，默认 SQL_QUERY_BUDGET) 时记录警告
+    - 同一语句重复执行达到 SQL_N_PLUS_ONE_THRESHOLD 次时按 N+1 记录警告
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                    headers["X-DB-Query-Time"] = f"{stats.duration * 1000:.2f}"
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        # 路由匹配后 scope 中才有 path_params，按路由模板而非实际路径匹配预算
+        path = route_template(scope)
+        budget = settings.SQL_ROUTE_BUDGETS.get(path, settings.SQL_QUERY_BUDGET)
+        if stats.count > budget:
+            logger.warning(
+                "SQL 语句数超出预算 | {} {} | count={} budget={} time={:.2f}ms",
+                scope["method"],
+                path,
+                stats.count,
+                budget,
+                stats.duration * 1000,
+            )
+        for sql, times in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            logger.warning(
+                "疑似 N+1 查询 | {} {} | 重复 {} 次: {}",
+                scope["method"],
+                path,
+                times,
+                " ".join(sql.split())[:500],
+            )
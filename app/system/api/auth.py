@@ -5,6 +5,7 @@ from app.core.resp import Result
 
 # 依赖注入
 from app.dependencies.database import get_session
+from app.dependencies.deadline import Deadline
 from app.system.schemas.auth import RefreshTokenRequest, TokenSchema, UserLogin
 from app.system.services.auth_service import auth_service
 
@@ -19,6 +20,7 @@ router = APIRouter()
     summary="用户登录",
     description="使用用户名和密码登录，获取 Access Token 和 Refresh Token",
     response_model=Result[TokenSchema],
+    dependencies=[Depends(Deadline(5_000))],
 )
 async def login(
     credentials: UserLogin,
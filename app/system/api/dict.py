@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.resp import PageInfo, Result
+from app.core.export import ExportFormat, export_response
+from app.core.resp import PageInfo, Result, sparse_response
 from app.dependencies.database import get_session as get_db
+from app.dependencies.deadline import Deadline
+from app.dependencies.etag import VersionETag
+from app.dependencies.fields import SparseFields
+from app.dependencies.filters import ListFilters, ListQuery
 from app.dependencies.pagination import PageDep
+from app.dependencies.permission import Perms
 from app.system.crud.crud_dict import crud_dict
 from app.system.crud.crud_dict_data import crud_dict_data
 from app.system.schemas.dict import (
@@ -21,13 +28,49 @@ router = APIRouter()
 
 @router.get("", response_model=Result[PageInfo[DictResponse]])
 async def get_dicts(
-    pagination: PageDep, session: AsyncSession = Depends(get_db)
-) -> Result[PageInfo[DictResponse]]:
-    """获取字典列表"""
+    pagination: PageDep,
+    session: AsyncSession = Depends(get_db),
+    fields: list[str] | None = Depends(SparseFields(DictResponse)),
+    query: ListFilters = Depends(ListQuery(crud_dict.filter_set)),
+) -> Result[PageInfo[DictResponse]] | Response:
+    """获取字典列表 (支持 code__prefix=、id__in= 过滤及 sort= 排序)"""
     dicts, total = await crud_dict.get_page(
-        session, page=pagination.page, page_size=pagination.size
+        session,
+        page=pagination.page,
+        page_size=pagination.size,
+        fields=fields,
+        filters=query.filters,
+        order_by=query.order_by,
+    )
+    result = Result.success_page(dicts, total, pagination.page, pagination.size)
+    if fields:
+        return sparse_response(DictResponse, fields, result)
+    return result
+
+
+@router.get(
+    "/data/export",
+    dependencies=[Depends(Deadline(300_000)), Depends(Perms("system:dict:export"))],
+)
+async def export_dict_data(
+    session: AsyncSession = Depends(get_db),
+    fmt: ExportFormat = Query(
+        default=ExportFormat.CSV, alias="format", description="导出格式"
+    ),
+    fields: list[str] | None = Depends(SparseFields(DictDataResponse)),
+    query: ListFilters = Depends(ListQuery(crud_dict_data.filter_set)),
+) -> StreamingResponse:
+    """
+    流式导出字典数据 (可用 dict_id= 只导出指定字典)
+    需要权限: system:dict:export
+    """
+    fields = fields or crud_dict_data.column_fields(DictDataResponse)
+    return export_response(
+        crud_dict_data.stream(session, fields=fields, filters=query.filters),
+        crud_dict_data.get_columns(fields),
+        fmt,
+        "dict_data",
     )
-    return Result.success_page(dicts, total, pagination.page, pagination.size)
 
 
 @router.get("/{dict_id}", response_model=Result[DictResponse])
@@ -41,7 +84,11 @@ async def get_dict(
     return Result.success(dict_item)
 
 
-@router.get("/code/{dict_code}", response_model=Result)
+@router.get(
+    "/code/{dict_code}",
+    response_model=Result,
+    dependencies=[Depends(VersionETag("dict"))],
+)
 async def get_dict_by_code(
     dict_code: str, session: AsyncSession = Depends(get_db)
 ) -> Result:
@@ -54,17 +101,32 @@ async def get_dict_by_code(
 
 @router.get("/{dict_id}/data", response_model=Result[PageInfo[DictDataResponse]])
 async def get_dict_data(
-    dict_id: int, pagination: PageDep, session: AsyncSession = Depends(get_db)
-) -> Result[PageInfo[DictDataResponse]]:
+    dict_id: int,
+    pagination: PageDep,
+    session: AsyncSession = Depends(get_db),
+    fields: list[str] | None = Depends(SparseFields(DictDataResponse)),
+    query: ListFilters = Depends(ListQuery(crud_dict_data.filter_set)),
+) -> Result[PageInfo[DictDataResponse]] | Response:
     """获取字典数据列表"""
     dict_item = await crud_dict.get(session, dict_id)
     if not dict_item:
         return Result.error(404, "字典不存在")
 
     dict_data_list, total = await crud_dict_data.get_page(
-        session, dict_id=dict_id, page=pagination.page, page_size=pagination.size
+        session,
+        dict_id=dict_id,
+        page=pagination.page,
+        page_size=pagination.size,
+        fields=fields,
+        filters=query.filters,
+        order_by=query.order_by,
+    )
+    result = Result.success_page(
+        dict_data_list, total, pagination.page, pagination.size
     )
-    return Result.success_page(dict_data_list, total, pagination.page, pagination.size)
+    if fields:
+        return sparse_response(DictDataResponse, fields, result)
+    return result
 
 
 @router.post("/", response_model=Result[DictResponse])
@@ -1,47 +1,110 @@
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.resp import PageInfo, Result
+from app.core.export import ExportFormat, export_response
+from app.core.resp import PageInfo, Result, sparse_response
+from app.core.routing import TrustedRoute
 from app.dependencies.auth import get_current_user
 from app.dependencies.database import get_session as get_db
+from app.dependencies.deadline import Deadline
+from app.dependencies.etag import UserVersionETag, VersionETag
+from app.dependencies.fields import SparseFields
+from app.dependencies.filters import ListFilters, ListQuery
 from app.dependencies.pagination import PageDep
+from app.dependencies.permission import Perms
 from app.system.crud.crud_menu import crud_menu
-from app.system.models import SysRole, SysUser
+from app.system.models import SysMenu, SysRole, SysUser
 from app.system.schemas.menu import MenuCreate, MenuResponse, MenuUpdate
 from app.system.services.menu_service import sys_menu_service
 
-router = APIRouter()
+# 菜单树等返回 Result[...] 参数化实例的接口跳过 response_model 二次校验
+router = APIRouter(route_class=TrustedRoute)
 
 
-@router.get("/me", response_model=Result[list[MenuResponse]])
+def _menu_response(menu: SysMenu) -> MenuResponse:
+    """
+    详情接口不返回子菜单
+
+    children 是延迟加载的关系，直接按 ORM 对象校验会在序列化时触发数据库 IO
+    (异步会话下报 MissingGreenlet)，这里只取列字段构造响应模型
+    """
+    return MenuResponse.model_validate(menu.model_dump())
+
+
+@router.get(
+    "/me",
+    response_model=Result[list[MenuResponse]],
+    dependencies=[Depends(UserVersionETag("menu", "role_menu"))],
+)
 async def get_my_menus(
     session: AsyncSession = Depends(get_db),
     current_user: SysUser = Depends(get_current_user),
 ) -> Result[list[MenuResponse]]:
     """获取当前用户的菜单树"""
     menus = await sys_menu_service.get_user_menu_tree(session, current_user)
-    return Result.success(menus)
+    return Result[list[MenuResponse]].success(menus)
 
 
 @router.get("", response_model=Result[PageInfo[MenuResponse]])
 async def get_menus(
-    pagination: PageDep, session: AsyncSession = Depends(get_db)
-) -> Result[PageInfo[MenuResponse]]:
-    """获取菜单列表"""
+    pagination: PageDep,
+    session: AsyncSession = Depends(get_db),
+    fields: list[str] | None = Depends(SparseFields(MenuResponse)),
+    query: ListFilters = Depends(ListQuery(crud_menu.filter_set)),
+) -> Result[PageInfo[MenuResponse]] | Response:
+    """获取菜单列表 (支持 parent_id=、permission__prefix= 过滤及 sort= 排序)"""
     menus, total = await crud_menu.get_page(
-        session, page=pagination.page, page_size=pagination.size
+        session,
+        page=pagination.page,
+        page_size=pagination.size,
+        fields=fields,
+        filters=query.filters,
+        order_by=query.order_by,
     )
-    return Result.success_page(menus, total, pagination.page, pagination.size)
+    result = Result.success_page(menus, total, pagination.page, pagination.size)
+    if fields:
+        return sparse_response(MenuResponse, fields, result)
+    return result
 
 
-@router.get("/tree", response_model=Result[list[MenuResponse]])
+@router.get(
+    "/tree",
+    response_model=Result[list[MenuResponse]],
+    dependencies=[Depends(VersionETag("menu"))],
+)
 async def get_menu_tree(
     parent_id: int | None = None, session: AsyncSession = Depends(get_db)
 ) -> Result[list[MenuResponse]]:
     """获取菜单树形结构"""
     menus = await crud_menu.get_tree(session, parent_id=parent_id)
-    return Result.success(menus)
+    return Result[list[MenuResponse]].success(menus)
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(Deadline(300_000)), Depends(Perms("system:menu:export"))],
+)
+async def export_menus(
+    session: AsyncSession = Depends(get_db),
+    fmt: ExportFormat = Query(
+        default=ExportFormat.CSV, alias="format", description="导出格式"
+    ),
+    fields: list[str] | None = Depends(SparseFields(MenuResponse)),
+    query: ListFilters = Depends(ListQuery(crud_menu.filter_set)),
+) -> StreamingResponse:
+    """
+    流式导出全部菜单
+    需要权限: system:menu:export
+    """
+    fields = fields or crud_menu.column_fields(MenuResponse)
+    return export_response(
+        crud_menu.stream(session, fields=fields, filters=query.filters),
+        crud_menu.get_columns(fields),
+        fmt,
+        "menus",
+    )
 
 
 @router.get("/{menu_id}", response_model=Result[MenuResponse])
@@ -52,7 +115,7 @@ async def get_menu(
     menu = await crud_menu.get(session, menu_id)
     if not menu:
         return Result.error(404, "菜单不存在")
-    return Result.success(menu)
+    return Result[MenuResponse].success(_menu_response(menu))
 
 
 @router.get("/{menu_id}/roles", response_model=Result[list[SysRole]])
@@ -79,7 +142,7 @@ async def update_menu(
 ) -> Result[MenuResponse]:
     """更新菜单"""
     menu = await sys_menu_service.update_menu(session, menu_id, menu_in)
-    return Result.success(menu)
+    return Result[MenuResponse].success(_menu_response(menu))
 
 
 @router.delete("/{menu_id}", response_model=Result[str])
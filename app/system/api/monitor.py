@@ -0,0 +1,30 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.core.resp import Result
+from app.db.pool import pool_stats
+from app.dependencies.database import engine, replica_engines
+from app.dependencies.permission import Perms
+
+router = APIRouter()
+
+
+@router.get(
+    "/pool",
+    response_model=Result[dict[str, Any]],
+    dependencies=[Depends(Perms("system:monitor:pool"))],
+)
+async def get_pool_metrics() -> Result[dict[str, Any]]:
+    """
+    获取数据库连接池指标 (当前 worker 进程)
+
+    包含签出等待耗时直方图、占用/空闲连接数、溢出与超时次数、连接年龄分布
+    需要权限: system:monitor:pool
+    """
+    return Result.success(
+        {
+            "primary": pool_stats(engine),
+            "replicas": [pool_stats(e) for e in replica_engines],
+        }
+    )
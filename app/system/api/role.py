@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.resp import PageInfo, Result
+from app.core.export import ExportFormat, export_response
+from app.core.resp import PageInfo, Result, sparse_response
 from app.dependencies.auth import get_current_active_user
 from app.dependencies.database import get_session
+from app.dependencies.deadline import Deadline
+from app.dependencies.fields import SparseFields
+from app.dependencies.filters import ListFilters, ListQuery
 from app.dependencies.pagination import PageDep
+from app.dependencies.permission import Perms
 from app.system.crud.crud_role import crud_role
 from app.system.models import SysUser
 from app.system.schemas.role import RoleCreate, RoleResponse, RoleUpdate
@@ -18,12 +24,47 @@ async def get_roles(
     pagination: PageDep,
     session: AsyncSession = Depends(get_session),
     current_user: SysUser = Depends(get_current_active_user),
-) -> Result[PageInfo[RoleResponse]]:
-    """获取角色列表"""
+    fields: list[str] | None = Depends(SparseFields(RoleResponse)),
+    query: ListFilters = Depends(ListQuery(crud_role.filter_set)),
+) -> Result[PageInfo[RoleResponse]] | Response:
+    """获取角色列表 (支持 code__prefix=、id__in= 过滤及 sort= 排序)"""
     roles, total = await crud_role.get_page(
-        session, page=pagination.page, page_size=pagination.size
+        session,
+        page=pagination.page,
+        page_size=pagination.size,
+        fields=fields,
+        filters=query.filters,
+        order_by=query.order_by,
+    )
+    result = Result.success_page(roles, total, pagination.page, pagination.size)
+    if fields:
+        return sparse_response(RoleResponse, fields, result)
+    return result
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(Deadline(300_000)), Depends(Perms("system:role:export"))],
+)
+async def export_roles(
+    session: AsyncSession = Depends(get_session),
+    fmt: ExportFormat = Query(
+        default=ExportFormat.CSV, alias="format", description="导出格式"
+    ),
+    fields: list[str] | None = Depends(SparseFields(RoleResponse)),
+    query: ListFilters = Depends(ListQuery(crud_role.filter_set)),
+) -> StreamingResponse:
+    """
+    流式导出全部角色
+    需要权限: system:role:export
+    """
+    fields = fields or crud_role.column_fields(RoleResponse)
+    return export_response(
+        crud_role.stream(session, fields=fields, filters=query.filters),
+        crud_role.get_columns(fields),
+        fmt,
+        "roles",
     )
-    return Result.success_page(roles, total, pagination.page, pagination.size)
 
 
 @router.get("/{role_id}", response_model=Result[RoleResponse])
@@ -38,9 +38,11 @@ async def set_role_menus(
     if not role:
         return Result.error(404, "角色不存在")
 
-    # 分配菜单
-    success = await crud_role_menu.assign_menu_to_role(session, role_id, menu_ids)
-    if not success:
-        return Result.error(500, "分配菜单失败")
+    # 差量同步菜单，菜单不存在时抛出 ValidationException
+    added, removed = await crud_role_menu.assign_menu_to_role(
+        session, role_id, menu_ids
+    )
+    if not (added or removed):
+        return Result.success(msg="菜单分配成功", data="权限未变化")
 
     return Result.success(msg="菜单分配成功", data="分配成功")
@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 from app.system.api import dict as dict_api
-from app.system.api import menu, role, role_menu, user
+from app.system.api import menu, monitor, role, role_menu, user
 
 api_router = APIRouter()
 
@@ -10,3 +10,4 @@ api_router.include_router(role.router, prefix="/roles", tags=["Sys: Role"])
 api_router.include_router(menu.router, prefix="/menus", tags=["Sys: Menu"])
 api_router.include_router(dict_api.router, prefix="/dicts", tags=["Sys: Dict"])
 api_router.include_router(role_menu.router, prefix="/roles", tags=["Sys: Role"])
+api_router.include_router(monitor.router, prefix="/monitor", tags=["Sys: Monitor"])
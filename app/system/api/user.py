@@ -1,33 +1,57 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.exceptions import (
     NotFoundException,
     PermissionException,
 )
-from app.core.resp import PageInfo, Result
+from app.core.export import ExportFormat, export_response
+from app.core.resp import PageInfo, Result, sparse_response
+from app.core.routing import TrustedRoute
 from app.dependencies.auth import get_current_user
 from app.dependencies.database import get_session
+from app.dependencies.deadline import Deadline
+from app.dependencies.etag import ContentETag
+from app.dependencies.fields import SparseFields
+from app.dependencies.filters import ListFilters, ListQuery
 from app.dependencies.pagination import PageDep
 from app.dependencies.permission import Perms
 from app.system.crud.crud_user import crud_user
 from app.system.models import SysUser
-from app.system.schemas.user import SysUserCreate, SysUserResponse, SysUserUpdate
+from app.system.schemas.user import (
+    SysUserCreate,
+    SysUserResponse,
+    SysUserUpdate,
+    UserBulkCreate,
+    UserBulkCreateResult,
+    UserRoleAssign,
+    UserRoleAssignResult,
+    UserSearchItem,
+    UserSearchMode,
+)
 from app.system.services.user_service import sys_user_service
 
-router = APIRouter()
+# 返回 Result[...] 参数化实例的接口跳过 response_model 二次校验
+router = APIRouter(route_class=TrustedRoute)
 
 
-@router.get("/me", summary="获取当前用户信息", response_model=Result[SysUserResponse])
+@router.get(
+    "/me",
+    summary="获取当前用户信息",
+    response_model=Result[SysUserResponse],
+    dependencies=[Depends(ContentETag(private=True))],
+)
 async def get_current_user_info(
+    session: AsyncSession = Depends(get_session),
     current_user: SysUser = Depends(get_current_user),
 ) -> Result[SysUserResponse]:
     """
     获取当前登录用户的详细信息
     无需特定权限标识，登录即可访问
     """
-    user_response = SysUserResponse.model_validate(current_user)
-    return Result.success(user_response)
+    user_response = await sys_user_service.to_response(session, current_user)
+    return Result[SysUserResponse].success(user_response)
 
 
 @router.get(
@@ -41,10 +65,14 @@ async def get_user_list(
     session: AsyncSession = Depends(get_session),
     pagination: PageDep,
     current_user: SysUser = Depends(get_current_user),
-) -> Result[PageInfo[SysUserResponse]]:
+    fields: list[str] | None = Depends(SparseFields(SysUserResponse)),
+    query: ListFilters = Depends(ListQuery(crud_user.filter_set)),
+) -> Result[PageInfo[SysUserResponse]] | Response:
     """
     分页获取用户列表
     需要权限: system:user:list
+    支持 fields=id,username,email 只返回指定字段
+    支持 username__prefix=、email=、id__in= 过滤及 sort=-created_at 排序
 
     业务异常会被全局异常处理器自动捕获并转换为统一的 Result 格式。
     """
@@ -53,8 +81,65 @@ async def get_user_list(
         page=pagination.page,
         size=pagination.size,
         current_user=current_user,
+        fields=fields,
+        filters=query.filters,
+        order_by=query.order_by,
+    )
+    if fields:
+        return sparse_response(SysUserResponse, fields, Result.success(page_info))
+    return Result[PageInfo[SysUserResponse]].success(page_info)
+
+
+@router.get(
+    "/search",
+    summary="搜索用户",
+    response_model=Result[list[UserSearchItem]],
+    dependencies=[Depends(Perms("system:user:list"))],
+)
+async def search_users(
+    *,
+    session: AsyncSession = Depends(get_session),
+    q: str = Query(min_length=1, max_length=100, description="关键字"),
+    mode: UserSearchMode = Query(
+        default=UserSearchMode.PREFIX, description="prefix 前缀 / fuzzy 模糊"
+    ),
+    limit: int = Query(default=10, ge=1, le=50, description="最多返回条数"),
+) -> Result[list[UserSearchItem]]:
+    """
+    按用户名 / 邮箱 / 备注搜索用户 (pg_trgm 索引)，结果按相似度排序
+    需要权限: system:user:list
+    """
+    items = await sys_user_service.search_users(session, q, mode, limit)
+    return Result[list[UserSearchItem]].success(items)
+
+
+@router.get(
+    "/export",
+    summary="导出用户",
+    dependencies=[Depends(Deadline(300_000)), Depends(Perms("system:user:export"))],
+)
+async def export_users(
+    *,
+    session: AsyncSession = Depends(get_session),
+    fmt: ExportFormat = Query(
+        default=ExportFormat.CSV, alias="format", description="导出格式"
+    ),
+    fields: list[str] | None = Depends(SparseFields(SysUserResponse)),
+    query: ListFilters = Depends(ListQuery(crud_user.filter_set)),
+) -> StreamingResponse:
+    """
+    流式导出全部用户 (NDJSON / CSV / Parquet)
+    需要权限: system:user:export
+
+    基于服务端游标分块读取，适合百万级数据导出。
+    """
+    fields = fields or crud_user.column_fields(SysUserResponse)
+    return export_response(
+        crud_user.stream(session, fields=fields, filters=query.filters),
+        crud_user.get_columns(fields),
+        fmt,
+        "users",
     )
-    return Result.success(page_info)
 
 
 @router.post(
@@ -75,10 +160,53 @@ async def create_user(
     业务异常会被全局异常处理器自动捕获并转换为统一的 Result 格式。
     """
     user = await sys_user_service.create_user(session, user_in)
-    user_response = SysUserResponse.model_validate(user)
+    user_response = await sys_user_service.to_response(session, user)
     return Result.success(user_response)
 
 
+@router.post(
+    "/bulk",
+    summary="批量创建用户",
+    response_model=Result[UserBulkCreateResult],
+    dependencies=[Depends(Deadline(120_000)), Depends(Perms("system:user:add"))],
+)
+async def bulk_create_users(
+    *,
+    session: AsyncSession = Depends(get_session),
+    body: UserBulkCreate,
+) -> Result[UserBulkCreateResult]:
+    """
+    批量创建用户 (单次最多 5000 条)
+    需要权限: system:user:add
+
+    字段校验失败时整批返回 422 (含出错行下标)；
+    批内重复、用户名 / 邮箱已存在或角色不存在的行在 errors 中逐条返回，其余行正常创建。
+    """
+    result = await sys_user_service.bulk_create_users(session, body.users)
+    return Result.success(result)
+
+
+@router.put(
+    "/roles",
+    summary="批量分配用户角色",
+    response_model=Result[UserRoleAssignResult],
+    dependencies=[Depends(Perms("system:user:update"))],
+)
+async def assign_user_roles(
+    *,
+    session: AsyncSession = Depends(get_session),
+    body: UserRoleAssign,
+) -> Result[UserRoleAssignResult]:
+    """
+    为一批用户添加 / 移除角色，整批在一个事务中完成
+    需要权限: system:user:update
+
+    已拥有的角色不会重复添加，未拥有的角色移除时忽略。
+    """
+    result = await sys_user_service.assign_roles(session, body)
+    return Result.success(result)
+
+
 @router.put(
     "/{user_id}",
     summary="更新用户",
@@ -114,7 +242,7 @@ async def update_user(
 
     # 3. 执行更新
     user = await sys_user_service.update_user(session, user_id, user_in)
-    user_response = SysUserResponse.model_validate(user)
+    user_response = await sys_user_service.to_response(session, user)
     return Result.success(user_response)
 
 
@@ -139,8 +267,8 @@ async def get_user(
     if not user:
         raise NotFoundException("用户不存在")
 
-    user_response = SysUserResponse.model_validate(user)
-    return Result.success(user_response)
+    user_response = await sys_user_service.to_response(session, user)
+    return Result[SysUserResponse].success(user_response)
 
 
 @router.delete(
@@ -4,6 +4,7 @@ from app.system.crud.crud_menu import crud_menu
 from app.system.crud.crud_role import crud_role
 from app.system.crud.crud_role_menu import crud_role_menu
 from app.system.crud.crud_user import crud_user
+from app.system.crud.crud_user_role import crud_user_role
 
 __all__ = [
     "crud_user",
@@ -12,4 +13,5 @@ __all__ = [
     "crud_dict",
     "crud_dict_data",
     "crud_role_menu",
+    "crud_user_role",
 ]
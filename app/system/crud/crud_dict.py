@@ -3,11 +3,24 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db.crud_base import CRUDBase
+from app.db.filters import FilterOp, FilterSet
 from app.system.models import SysDict
 from app.system.schemas.dict import DictCreate, DictUpdate
 
 
 class CRUDDict(CRUDBase[SysDict, DictCreate, DictUpdate]):
+    upsert_conflict_columns = ("code",)
+    # code 列的 unique=True 未显式命名，使用 PostgreSQL 默认名 <表>_<列>_key
+    unique_messages = {"uq_sys_dicts_code": "字典编码已存在"}
+    filter_set = FilterSet(
+        SysDict,
+        filterable={
+            "id": {FilterOp.EQ, FilterOp.IN},
+            "code": {FilterOp.EQ, FilterOp.IN, FilterOp.PREFIX},
+        },
+        sortable={"id", "code", "name", "created_at"},
+    )
+
     async def get_by_code(self, session: AsyncSession, code: str) -> SysDict | None:
         """根据字典编码获取字典"""
         statement = select(SysDict).where(SysDict.code == code)
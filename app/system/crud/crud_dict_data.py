@@ -1,14 +1,24 @@
 from typing import Any
 
-from sqlmodel import col, func, select
+from sqlmodel import func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db.crud_base import CRUDBase
+from app.db.filters import FilterOp, FilterSet
 from app.system.models import SysDictData
 from app.system.schemas.dict import DictDataCreate, DictDataUpdate
 
 
 class CRUDDictData(CRUDBase[SysDictData, DictDataCreate, DictDataUpdate]):
+    filter_set = FilterSet(
+        SysDictData,
+        filterable={
+            "id": {FilterOp.EQ, FilterOp.IN},
+            "dict_id": {FilterOp.EQ, FilterOp.IN},
+        },
+        sortable={"id", "sort", "value", "created_at"},
+    )
+
     async def get_by_dict_id(
         self, session: AsyncSession, dict_id: int, skip: int = 0, limit: int = 100
     ) -> list[SysDictData]:
@@ -40,43 +50,16 @@ class CRUDDictData(CRUDBase[SysDictData, DictDataCreate, DictDataUpdate]):
         page_size: int = 10,
         dict_id: int | None = None,
         **kwargs: Any,
-    ) -> tuple[list[SysDictData], int]:
+    ) -> tuple[list[Any], int]:
         """
         获取分页列表 (包含总数)
         :return: (items, total_count)
         """
-        # 1. 构建基础查询
-        statement = select(self.model)
-
-        # 添加字典ID过滤条件
-        if dict_id is not None:
-            statement = statement.where(self.model.dict_id == dict_id)
-
-        # 2. 动态添加过滤条件 (简单的相等查询)
-        for key, value in kwargs.items():
-            if value is not None and hasattr(self.model, key):
-                statement = statement.where(getattr(self.model, key) == value)
-
-        # 3. 计算总数 (性能优化：只查询 ID 或使用 count(*))
-        # 使用 func.count() 避免加载所有数据到内存
-        count_statement = select(func.count()).select_from(statement.subquery())
-        total_result = await session.exec(count_statement)
-        total = total_result.one()
-
-        # 4. 分页查询
-        # 注意：前端通常传 page/page_size，数据库需要 offset/limit
-        offset = (page - 1) * page_size
-        statement = statement.offset(offset).limit(page_size)
-
-        # 可选：默认按创建时间倒序 (如果表里有 created_at)
-        if hasattr(self.model, "created_at"):
-            # type: ignore
-            statement = statement.order_by(
-                col(self.model.created_at).desc()
-            )
-
-        result = await session.exec(statement)
-        return list(result.all()), total
+        # 字典ID作为简单相等过滤交给基类处理 (None 时不过滤)，
+        # 其余能力 (fields / filters / 排序) 与基类保持一致
+        return await super().get_page(
+            session, page=page, page_size=page_size, dict_id=dict_id, **kwargs
+        )
 
 
 crud_dict_data = CRUDDictData(SysDictData)
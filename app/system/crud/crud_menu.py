@@ -1,14 +1,40 @@
 
+import sqlalchemy as sa
 from sqlalchemy.orm import noload
-from sqlmodel import col, select
+from sqlmodel import col, delete, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db.crud_base import CRUDBase
+from app.db.filters import FilterOp, FilterSet
 from app.system.models import SysMenu, SysRoleMenu, SysUser
 from app.system.schemas.menu import MenuCreate, MenuResponse, MenuUpdate
 
 
 class CRUDMenu(CRUDBase[SysMenu, MenuCreate, MenuUpdate]):
+    filter_set = FilterSet(
+        SysMenu,
+        filterable={
+            "id": {FilterOp.EQ, FilterOp.IN},
+            "parent_id": {FilterOp.EQ, FilterOp.IN},
+            "permission": {FilterOp.EQ, FilterOp.PREFIX},
+        },
+        sortable={"id", "sort", "title", "created_at"},
+    )
+
+    async def _delete_relations(
+        self, session: AsyncSession, ids: sa.BindParameter
+    ) -> None:
+        """删除菜单前清理角色-菜单关联，并将子菜单置为顶级 (与 ORM 删除行为一致)"""
+        await session.exec(
+            delete(SysRoleMenu).where(SysRoleMenu.menu_id == sa.any_(ids))
+        )
+        await session.exec(
+            update(SysMenu)
+            .where(SysMenu.parent_id == sa.any_(ids))
+            .values(parent_id=None)
+            .execution_options(synchronize_session=False)
+        )
+
     def _build_pydantic_tree(self, menus: list[MenuResponse]) -> list[MenuResponse]:
         """
         在内存中从 Pydantic 模型列表构建树形结构.
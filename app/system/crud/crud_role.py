@@ -1,12 +1,37 @@
-from sqlmodel import select
+import sqlalchemy as sa
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.db.crud_base import CRUDBase
-from app.system.models import SysRole
+from app.db.filters import FilterOp, FilterSet
+from app.system.models import SysRole, SysRoleMenu, SysUserRole
 from app.system.schemas.role import RoleCreate, RoleUpdate
 
 
 class CRUDRole(CRUDBase[SysRole, RoleCreate, RoleUpdate]):
+    upsert_conflict_columns = ("code",)
+    # code 列的 unique=True 未显式命名，使用 PostgreSQL 默认名 <表>_<列>_key
+    unique_messages = {"uq_sys_roles_code": "角色编码已存在"}
+    filter_set = FilterSet(
+        SysRole,
+        filterable={
+            "id": {FilterOp.EQ, FilterOp.IN},
+            "code": {FilterOp.EQ, FilterOp.IN, FilterOp.PREFIX},
+        },
+        sortable={"id", "code", "name", "created_at"},
+    )
+
+    async def _delete_relations(
+        self, session: AsyncSession, ids: sa.BindParameter
+    ) -> None:
+        """删除角色前清理用户-角色、角色-菜单关联"""
+        await session.exec(
+            delete(SysUserRole).where(SysUserRole.role_id == sa.any_(ids))
+        )
+        await session.exec(
+            delete(SysRoleMenu).where(SysRoleMenu.role_id == sa.any_(ids))
+        )
+
     async def get_by_code(self, session: AsyncSession, code: str) -> SysRole | None:
         """根据编码获取角色"""
         statement = select(SysRole).where(SysRole.code == code)
@@ -1,7 +1,10 @@
-
-from sqlmodel import delete, select
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import col, delete, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.exceptions import ValidationException
 from app.system.models import SysMenu, SysRole, SysRoleMenu
 
 
@@ -34,23 +37,65 @@ class CRUDRoleMenu:
 
     async def assign_menu_to_role(
         self, session: AsyncSession, role_id: int, menu_ids: list[int]
-    ) -> bool:
-        """为角色分配菜单"""
-        try:
-            # 先删除该角色的所有菜单关联
-            delete_statement = delete(SysRoleMenu).where(SysRoleMenu.role_id == role_id)
-            await session.exec(delete_statement)
-
-            # 添加新的菜单关联
-            for menu_id in menu_ids:
-                role_menu = SysRoleMenu(role_id=role_id, menu_id=menu_id)
-                session.add(role_menu)
+    ) -> tuple[int, int]:
+        """
+        将角色的菜单同步为 menu_ids (差量写入)
+
+        一条语句内完成：
+        - valid: unnest(:ids) 关联 sys_menus，过滤出真实存在的菜单
+        - added: INSERT ... SELECT 新增的菜单，已有关联 ON CONFLICT DO NOTHING
+        - removed: DELETE 不在 menu_ids 中的旧关联
+        未变化的关联行不会被改写，也不会被加锁
+
+        :return: (新增数量, 删除数量)，均为 0 表示权限未变化
+        :raises ValidationException: menu_ids 中存在不存在的菜单时抛出，整体回滚
+        """
+        ids = sa.bindparam("menu_ids", sorted(set(menu_ids)), type_=ARRAY(sa.Integer))
+        wanted = func.unnest(ids).table_valued("id").render_derived("wanted")
+        valid = (
+            sa.select(col(SysMenu.id))
+            .join_from(wanted, SysMenu, SysMenu.id == wanted.c.id)
+            .cte("valid")
+        )
+        added = (
+            pg_insert(SysRoleMenu)
+            .from_select(
+                ["role_id", "menu_id"],
+                sa.select(sa.literal(role_id), valid.c.id),
+                # CTE 中的 INSERT 不会计算 Python 端默认值 (会绑定为 NULL)，
+                # 时间戳交给列的 server_default now()
+                include_defaults=False,
+            )
+            .on_conflict_do_nothing()
+            .returning(col(SysRoleMenu.menu_id))
+            .cte("added")
+        )
+        removed = (
+            delete(SysRoleMenu)
+            .where(
+                SysRoleMenu.role_id == role_id,
+                SysRoleMenu.menu_id != sa.all_(ids),
+            )
+            .returning(col(SysRoleMenu.menu_id))
+            .cte("removed")
+        )
+        statement = select(
+            sa.select(func.array_agg(valid.c.id)).scalar_subquery(),
+            sa.select(func.count()).select_from(added).scalar_subquery(),
+            sa.select(func.count()).select_from(removed).scalar_subquery(),
+        )
 
+        try:
+            result = await session.exec(statement)
+            valid_ids, added_count, removed_count = result.one()
+            missing = set(menu_ids) - set(valid_ids or [])
+            if missing:
+                raise ValidationException(f"菜单不存在: {sorted(missing)}")
             await session.commit()
-            return True
         except Exception:
             await session.rollback()
-            return False
+            raise
+        return added_count, removed_count
 
     async def add_menu_to_role(
         self, session: AsyncSession, role_id: int, menu_id: int
@@ -1,66 +1,281 @@
+from collections.abc import Sequence
 from typing import Any
 
-from sqlmodel import col, select
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import col, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security import hash_password, verify_password
-from app.db.crud_base import CRUDBase
+from app.core.exceptions import ValidationException
+from app.core.security import hash_password, hash_passwords, verify_password
+from app.db.crud_base import CRUDBase, _chunked
+from app.db.filters import FilterOp, FilterSet, escape_like
+from app.system.crud.crud_user_role import crud_user_role
 from app.system.models import SysUser, SysUserRole
-from app.system.schemas.user import SysUserCreate, SysUserUpdate
+from app.system.schemas.user import SysUserCreate, SysUserUpdate, UserSearchMode
 
 
 class CRUDSysUser(CRUDBase[SysUser, SysUserCreate, SysUserUpdate]):
+    upsert_conflict_columns = ("username",)
+    # 按用户名 upsert 时不覆盖已有用户的密码、权限与登录状态
+    upsert_exclude_columns = (
+        "hashed_password",
+        "is_active",
+        "is_superuser",
+        "last_login_at",
+    )
+    unique_messages = {
+        "uq_sys_users_username_live": "用户名已存在",
+        "uq_sys_users_email_live": "邮箱已存在",
+    }
+    filter_set = FilterSet(
+        SysUser,
+        filterable={
+            "id": {FilterOp.EQ, FilterOp.IN},
+            "username": {FilterOp.EQ, FilterOp.IN, FilterOp.PREFIX},
+            "email": {FilterOp.EQ, FilterOp.PREFIX},
+        },
+        sortable={"id", "username", "created_at", "last_login_at"},
+    )
+
+    def role_ids_column(self) -> sa.ColumnElement[list[int]]:
+        """
+        用户角色 ID 数组列 (array_agg 关联子查询，无角色时为空数组)
+
+        作为 get_page 的 extra_columns 使用时，子查询只对分页后的行执行，
+        走 sys_user_roles 主键索引，不需要加载 SysRole 实体
+        """
+        role_ids = (
+            sa.select(func.array_agg(SysUserRole.role_id))
+            .where(SysUserRole.user_id == SysUser.id)
+            .scalar_subquery()
+        )
+        return func.coalesce(role_ids, array([], type_=sa.Integer)).label("role_ids")
+
+    async def search(
+        self,
+        session: AsyncSession,
+        *,
+        keyword: str,
+        mode: UserSearchMode = UserSearchMode.PREFIX,
+        limit: int = 10,
+    ) -> list[dict[str, Any]]:
+        """
+        按用户名 / 邮箱 / 备注搜索未删除用户，按相似度降序返回
+
+        - prefix: ILIKE 'keyword%'
+        - fuzzy: pg_trgm 相似度运算符 %，阈值由 pg_trgm.similarity_threshold 决定
+        两种模式都由 trgm_index() 建立的 GIN 部分索引支撑
+        """
+        columns = [col(SysUser.username), col(SysUser.email), col(SysUser.remark)]
+        # 同一个绑定参数对象在语句中复用，只占一个参数位
+        term = sa.bindparam("keyword", keyword, type_=sa.String)
+        if mode is UserSearchMode.PREFIX:
+            pattern = sa.bindparam(
+                "pattern", f"{escape_like(keyword)}%", type_=sa.String
+            )
+            matches = [c.ilike(pattern, escape="/") for c in columns]
+        else:
+            matches = [c.op("%", is_comparison=True)(term) for c in columns]
+        score = func.greatest(
+            *(func.similarity(func.coalesce(c, ""), term) for c in columns)
+        ).label("score")
+
+        # Core 投影查询按行字典返回，SQLModel 的 session.exec 重载未覆盖，按 Any 处理
+        statement: Any = (
+            sa.select(col(SysUser.id), *columns, score)
+            .where(sa.or_(*matches), *self.live_criteria())
+            .order_by(score.desc(), SysUser.id)
+            .limit(limit)
+        )
+        result = await session.exec(statement)
+        return [dict(row) for row in result.mappings()]
+
     async def get_by_username(
         self, session: AsyncSession, username: str
     ) -> SysUser | None:
-        statement = select(SysUser).where(SysUser.username == username)
+        statement = select(SysUser).where(
+            SysUser.username == username, *self.live_criteria()
+        )
         result = await session.exec(statement)
         return result.first()
 
     async def get_by_email(
         self, session: AsyncSession, email: str
     ) -> SysUser | None:
-        statement = select(SysUser).where(SysUser.email == email)
+        statement = select(SysUser).where(
+            SysUser.email == email, *self.live_criteria()
+        )
         result = await session.exec(statement)
         return result.first()
 
-    async def create(self, session: AsyncSession, *, obj_in: SysUserCreate) -> SysUser:
+    async def find_taken(
+        self,
+        session: AsyncSession,
+        *,
+        usernames: Sequence[str],
+        emails: Sequence[str],
+    ) -> tuple[set[str], set[str]]:
+        """
+        一次查询找出已被未删除用户占用的用户名与邮箱
+
+        :return: (已占用的用户名集合, 已占用的邮箱集合)
+        """
+        if not usernames and not emails:
+            return set(), set()
+        username_param = sa.bindparam(
+            "usernames", list(set(usernames)), type_=ARRAY(sa.String)
+        )
+        email_param = sa.bindparam("emails", list(set(emails)), type_=ARRAY(sa.String))
+        statement = select(col(SysUser.username), col(SysUser.email)).where(
+            sa.or_(
+                col(SysUser.username) == sa.any_(username_param),
+                col(SysUser.email) == sa.any_(email_param),
+            ),
+            *self.live_criteria(),
+        )
+        result = await session.exec(statement)
+        taken_usernames: set[str] = set()
+        taken_emails: set[str] = set()
+        for username, email in result.all():
+            taken_usernames.add(username)
+            if email is not None:
+                taken_emails.add(email)
+        return taken_usernames, taken_emails
+
+    async def bulk_provision(
+        self,
+        session: AsyncSession,
+        *,
+        objs_in: Sequence[SysUserCreate],
+        hashed_passwords: Sequence[str],
+        chunk_size: int | None = None,
+    ) -> dict[str, int]:
+        """
+        批量创建用户并分配角色，整批在同一事务中提交
+
+        - 密码由调用方预先哈希 (见 hash_passwords)，与 objs_in 按位置对应
+        - 多行 INSERT ... ON CONFLICT DO NOTHING RETURNING，
+          并发写入导致的唯一冲突行被跳过而不是让整批失败
+        - 用户角色关联以多行 INSERT 一次写入
+
+        :return: {用户名: 新用户 ID}，不包含因冲突被跳过的行
+        """
+        if not objs_in:
+            return {}
+
+        rows, role_ids_by_username = [], {}
+        for obj_in, hashed in zip(objs_in, hashed_passwords, strict=True):
+            create_data = self._create_data(obj_in, hashed)
+            db_data = SysUser.model_validate(create_data).model_dump()
+            db_data.pop("id", None)
+            rows.append(db_data)
+            role_ids_by_username[obj_in.username] = obj_in.role_ids or []
+
+        chunk_size = chunk_size or self.bulk_chunk_size
+        created: dict[str, int] = {}
+        try:
+            statement = (
+                pg_insert(SysUser)
+                .on_conflict_do_nothing()
+                .returning(col(SysUser.id), col(SysUser.username))
+            )
+            for chunk in _chunked(rows, chunk_size):
+                result = await session.exec(statement, params=list(chunk))
+                created.update((username, id) for id, username in result.all())
+
+            links = [
+                {"user_id": user_id, "role_id": role_id}
+                for username, user_id in created.items()
+                for role_id in set(role_ids_by_username[username])
+            ]
+            link_statement = pg_insert(SysUserRole).on_conflict_do_nothing()
+            for chunk in _chunked(links, chunk_size):
+                await session.exec(link_statement, params=list(chunk))
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return created
+
+    async def _prepare_create_rows(
+        self, objs_in: Sequence[SysUserCreate]
+    ) -> list[dict[str, Any]]:
         """
-        重写 Create：因为需要处理密码哈希，且输入模型(UserCreate)与数据库模型(User)字段不完全一致
+        重写创建数据转换：因为需要处理密码哈希，且输入模型(UserCreate)与数据库模型(User)字段不完全一致
+        create、bulk_create 与 bulk_upsert 均会经过这里，密码在进程池中批量哈希，不阻塞事件循环
         """
-        # 1. 转为字典
-        create_data = obj_in.model_dump()
-        # 2. 弹出明文密码并加密
-        password = create_data.pop("password")
-        create_data["hashed_password"] = hash_password(password)
-
-        # 3. 创建数据库对象
-        db_obj = SysUser.model_validate(create_data)
-
-        # 4. 执行入库
-        session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
-        return db_obj
-
-    async def update(
+        hashed = await hash_passwords([obj_in.password for obj_in in objs_in])
+        return [
+            self._create_data(obj_in, hashed_password)
+            for obj_in, hashed_password in zip(objs_in, hashed, strict=True)
+        ]
+
+    @staticmethod
+    def _create_data(obj_in: SysUserCreate, hashed_password: str) -> dict[str, Any]:
+        """明文密码替换为哈希值；角色不是表列，由 _after_create 写入关联表"""
+        create_data = obj_in.model_dump(exclude={"password", "role_ids"})
+        create_data["hashed_password"] = hashed_password
+        return create_data
+
+    async def bulk_upsert(
         self,
         session: AsyncSession,
         *,
+        objs_in: Sequence[SysUserCreate],
+        conflict_columns: Sequence[str] | None = None,
+        update_columns: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> list[SysUser]:
+        """
+        批量创建或更新用户
+
+        ON CONFLICT 分支不经过 _after_create，传入 role_ids 时直接拒绝而不是静默丢弃，
+        角色请通过 assign 分配
+        """
+        if any(obj_in.role_ids is not None for obj_in in objs_in):
+            raise ValidationException("创建或更新用户时不支持 role_ids，请单独分配角色")
+        return await super().bulk_upsert(
+            session,
+            objs_in=objs_in,
+            conflict_columns=conflict_columns,
+            update_columns=update_columns,
+            chunk_size=chunk_size,
+        )
+
+    async def _after_create(
+        self, session: AsyncSession, db_obj: SysUser, obj_in: SysUserCreate
+    ) -> None:
+        if obj_in.role_ids:
+            await crud_user_role.sync_user_roles(session, db_obj.id, obj_in.role_ids)
+
+    async def _after_update(
+        self,
+        session: AsyncSession,
         db_obj: SysUser,
         obj_in: SysUserUpdate | dict[str, Any],
-    ) -> SysUser:
+    ) -> None:
+        # role_ids 为 None (未传) 时不改动角色，传空列表表示清空
         if isinstance(obj_in, dict):
-            update_data = obj_in
+            role_ids = obj_in.get("role_ids")
         else:
-            # 这里的实现非常棒，完美利用了 Pydantic 的 exclude_unset
-            update_data = obj_in.model_dump(exclude_unset=True)
+            role_ids = obj_in.role_ids
+        if role_ids is not None:
+            await crud_user_role.sync_user_roles(session, db_obj.id, role_ids)
+
+    def _prepare_update_data(
+        self, obj_in: SysUserUpdate | dict[str, Any]
+    ) -> dict[str, Any]:
+        # 这里的实现非常棒，完美利用了 Pydantic 的 exclude_unset
+        update_data = dict(super()._prepare_update_data(obj_in))
 
         if "password" in update_data:
             password = update_data.pop("password")
             update_data["hashed_password"] = hash_password(password)
+        update_data.pop("role_ids", None)
 
-        return await super().update(session, db_obj=db_obj, obj_in=update_data)
+        return update_data
 
     async def get_by_role_ids(
         self, session: AsyncSession, role_ids: list[int]
@@ -72,7 +287,7 @@ class CRUDSysUser(CRUDBase[SysUser, SysUserCreate, SysUserUpdate]):
         statement = (
             select(SysUser)
             .join(SysUserRole, SysUser.id == SysUserRole.user_id)
-            .where(col(SysUserRole.role_id).in_(role_ids))
+            .where(col(SysUserRole.role_id).in_(role_ids), *self.live_criteria())
             .distinct()  # 去重，防止一个用户有多个角色时被查出来多次
         )
         result = await session.exec(statement)
@@ -0,0 +1,163 @@
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import col, delete, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.system.models import SysRole, SysUser, SysUserRole
+
+
+def _int_array(name: str, values: Sequence[int]) -> sa.BindParameter:
+    return sa.bindparam(name, sorted(set(values)), type_=ARRAY(sa.Integer))
+
+
+def _count(cte: sa.CTE) -> sa.ScalarSelect:
+    return sa.select(func.count()).select_from(cte).scalar_subquery()
+
+
+def _existing_ids(
+    column: sa.ColumnElement[int],
+    ids: sa.BindParameter,
+    *criteria: sa.ColumnElement[bool],
+) -> sa.CTE:
+    """unnest(:ids) 关联目标表，过滤出真实存在的 ID"""
+    wanted = func.unnest(ids).table_valued("id").render_derived(f"wanted_{ids.key}")
+    return (
+        sa.select(column.label("id"))
+        .join_from(wanted, column.table, column == wanted.c.id)
+        .where(*criteria)
+        .cte(f"valid_{ids.key}")
+    )
+
+
+class CRUDUserRole:
+    """
+    用户-角色关联的集合式读写
+
+    新增使用 INSERT ... SELECT ... ON CONFLICT DO NOTHING，删除使用 = ANY / <> ALL，
+    已存在且未变化的关联行不会被改写
+    """
+
+    async def get_role_ids(self, session: AsyncSession, user_id: int) -> list[int]:
+        """查询单个用户的角色 ID (升序)"""
+        result = await session.exec(
+            select(col(SysUserRole.role_id))
+            .where(SysUserRole.user_id == user_id)
+            .order_by(col(SysUserRole.role_id))
+        )
+        return list(result.all())
+
+    async def sync_user_roles(
+        self, session: AsyncSession, user_id: int, role_ids: Sequence[int]
+    ) -> tuple[int, int]:
+        """
+        将单个用户的角色同步为 role_ids (差量写入，不提交事务，由调用方提交)
+
+        :return: (新增数量, 删除数量)
+        :raises ValidationException: role_ids 中存在不存在的角色时抛出
+        """
+        ids = _int_array("role_ids", role_ids)
+        valid = _existing_ids(col(SysRole.id), ids)
+        added = (
+            pg_insert(SysUserRole)
+            .from_select(
+                ["user_id", "role_id"],
+                sa.select(sa.literal(user_id), valid.c.id),
+                # CTE 中的 INSERT 不会计算 Python 端默认值 (会绑定为 NULL)，
+                # 时间戳交给列的 server_default now()
+                include_defaults=False,
+            )
+            .on_conflict_do_nothing()
+            .returning(col(SysUserRole.role_id))
+            .cte("added")
+        )
+        removed = (
+            delete(SysUserRole)
+            .where(SysUserRole.user_id == user_id, SysUserRole.role_id != sa.all_(ids))
+            .returning(col(SysUserRole.role_id))
+            .cte("removed")
+        )
+        statement = select(
+            sa.select(func.array_agg(valid.c.id)).scalar_subquery(),
+            _count(added),
+            _count(removed),
+        )
+        result = await session.exec(statement)
+        valid_ids, added_count, removed_count = result.one()
+        missing = set(role_ids) - set(valid_ids or [])
+        if missing:
+            raise ValidationException(f"角色不存在: {sorted(missing)}")
+        return added_count, removed_count
+
+    async def assign(
+        self,
+        session: AsyncSession,
+        *,
+        user_ids: Sequence[int],
+        add_role_ids: Sequence[int] = (),
+        remove_role_ids: Sequence[int] = (),
+    ) -> tuple[int, int]:
+        """
+        批量为用户添加 / 移除角色，一条语句、一个事务完成
+
+        - added: 有效用户 x 有效角色 的笛卡尔积 INSERT ... ON CONFLICT DO NOTHING
+        - removed: user_id = ANY(:user_ids) AND role_id = ANY(:remove_role_ids)
+
+        :return: (新增关联数量, 删除关联数量)
+        :raises ValidationException: 用户或待添加的角色不存在时抛出，整体回滚
+        """
+        user_param = _int_array("user_ids", user_ids)
+        add_param = _int_array("add_role_ids", add_role_ids)
+        remove_param = _int_array("remove_role_ids", remove_role_ids)
+
+        users = _existing_ids(
+            col(SysUser.id), user_param, col(SysUser.is_deleted) == sa.false()
+        )
+        roles = _existing_ids(col(SysRole.id), add_param)
+        added = (
+            pg_insert(SysUserRole)
+            .from_select(
+                ["user_id", "role_id"],
+                sa.select(users.c.id, roles.c.id).join_from(users, roles, sa.true()),
+                include_defaults=False,  # 同 sync_user_roles
+            )
+            .on_conflict_do_nothing()
+            .returning(col(SysUserRole.role_id))
+            .cte("added")
+        )
+        removed = (
+            delete(SysUserRole)
+            .where(
+                SysUserRole.user_id == sa.any_(user_param),
+                SysUserRole.role_id == sa.any_(remove_param),
+            )
+            .returning(col(SysUserRole.role_id))
+            .cte("removed")
+        )
+        statement = select(
+            sa.select(func.array_agg(users.c.id)).scalar_subquery(),
+            sa.select(func.array_agg(roles.c.id)).scalar_subquery(),
+            _count(added),
+            _count(removed),
+        )
+
+        try:
+            result = await session.exec(statement)
+            valid_users, valid_roles, added_count, removed_count = result.one()
+            missing_users = set(user_ids) - set(valid_users or [])
+            if missing_users:
+                raise ValidationException(f"用户不存在: {sorted(missing_users)}")
+            missing_roles = set(add_role_ids) - set(valid_roles or [])
+            if missing_roles:
+                raise ValidationException(f"角色不存在: {sorted(missing_roles)}")
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        return added_count, removed_count
+
+
+crud_user_role = CRUDUserRole()
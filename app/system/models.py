@@ -5,7 +5,17 @@ import sqlalchemy as sa
 from sqlalchemy import DateTime
 from sqlmodel import Column, Field, Relationship, SQLModel
 
-from app.db.mixins import BaseModel, SystemModel, TimestampMixin
+from app.core.base_schema import DisplayDatetime
+from app.db.mixins import (
+    BaseModel,
+    SoftDeleteMixin,
+    SystemModel,
+    TimestampMixin,
+    live_index,
+    pattern_index,
+    trgm_index,
+)
+from app.db.versioning import track_versions
 
 # ===========================================================================
 # 关联表 (Link Tables) - 外键全部改为 int
@@ -45,20 +55,27 @@ class SysRoleMenu(TimestampMixin, SQLModel, table=True):
 # ===========================================================================
 
 
-class SysUser(BaseModel, table=True):
-    """系统用户表"""
+class SysUser(BaseModel, SoftDeleteMixin, table=True):
+    """系统用户表 (软删除)"""
 
     __tablename__ = "sys_users"
-    __table_args__ = {"comment": "后台系统用户管理"}
-
-    username: str = Field(unique=True, index=True, max_length=50, description="用户名")
-    email: str | None = Field(
-        default=None, unique=True, index=True, max_length=100, description="邮箱"
-    )
+    __table_args__ = (
+        # 用户名 / 邮箱只在未删除的用户中唯一
+        live_index("sys_users", "username", unique=True),
+        live_index("sys_users", "email", unique=True),
+        # 用户搜索 (用户名 / 邮箱 / 备注)
+        trgm_index("sys_users", "username"),
+        trgm_index("sys_users", "email"),
+        trgm_index("sys_users", "remark"),
+        {"comment": "后台系统用户管理"},
+    )
+
+    username: str = Field(max_length=50, description="用户名")
+    email: str | None = Field(default=None, max_length=100, description="邮箱")
     hashed_password: str = Field(description="密码哈希值")
     is_active: bool = Field(default=True, description="是否激活")
     is_superuser: bool = Field(default=False, description="是否超级管理员")
-    last_login_at: datetime | None = Field(
+    last_login_at: DisplayDatetime | None = Field(
         default=None,
         sa_column=Column(DateTime(timezone=True)),
         description="最后登录时间",
@@ -117,10 +134,16 @@ class SysRole(SystemModel, table=True):
     """角色表"""
 
     __tablename__ = "sys_roles"
-    __table_args__ = {"comment": "系统角色管理"}
+    __table_args__ = (
+        # 角色编码前缀过滤 (code__prefix=)
+        pattern_index("sys_roles", "code"),
+        # 显式命名，CRUD 层按约束名 (unique_messages) 转换唯一冲突
+        sa.UniqueConstraint("code", name="uq_sys_roles_code"),
+        {"comment": "系统角色管理"},
+    )
 
     name: str = Field(max_length=50, description="角色名称")
-    code: str = Field(unique=True, max_length=50, description="角色编码")
+    code: str = Field(max_length=50, description="角色编码")
     description: str | None = Field(
         default=None, max_length=200, description="角色描述"
     )
@@ -136,10 +159,14 @@ class SysMenu(SystemModel, table=True):
     """菜单表"""
 
     __tablename__ = "sys_menus"
-    __table_args__ = {"comment": "系统菜单管理"}
+    __table_args__ = (
+        # 权限标识前缀过滤 (permission__prefix=system:user:)
+        pattern_index("sys_menus", "permission"),
+        {"comment": "系统菜单管理"},
+    )
 
     parent_id: int | None = Field(
-        default=None, foreign_key="sys_menus.id", description="父菜单ID"
+        default=None, foreign_key="sys_menus.id", index=True, description="父菜单ID"
     )
     title: str = Field(max_length=50, description="菜单标题")
     name: str | None = Field(default=None, max_length=50, description="路由名称")
@@ -169,10 +196,16 @@ class SysDict(SystemModel, table=True):
     """字典类型表"""
 
     __tablename__ = "sys_dicts"
-    __table_args__ = {"comment": "系统字典管理"}
+    __table_args__ = (
+        # 字典编码前缀过滤 (code__prefix=)
+        pattern_index("sys_dicts", "code"),
+        # 显式命名，CRUD 层按约束名 (unique_messages) 转换唯一冲突
+        sa.UniqueConstraint("code", name="uq_sys_dicts_code"),
+        {"comment": "系统字典管理"},
+    )
 
     name: str = Field(max_length=50, description="字典名称")
-    code: str = Field(unique=True, max_length=50, description="字典编码")
+    code: str = Field(max_length=50, description="字典编码")
     description: str | None = Field(default=None, max_length=200, description="描述")
 
     # 关系
@@ -189,7 +222,7 @@ class SysDictData(SystemModel, table=True):
     __table_args__ = {"comment": "系统字典数据管理"}
 
     dict_id: int = Field(
-        foreign_key="sys_dicts.id", ondelete="CASCADE", description="字典ID"
+        foreign_key="sys_dicts.id", ondelete="CASCADE", index=True, description="字典ID"
     )
     label: str = Field(max_length=100, description="展示标签")
     value: str = Field(max_length=100, description="字典值")
@@ -201,3 +234,15 @@ class SysDictData(SystemModel, table=True):
 
     # 关系
     sys_dict: SysDict = Relationship(back_populates="data")
+
+
+# ===========================================================================
+# 资源版本号 (ETag)：以下表的任何写操作都会递增对应资源的版本号
+# ===========================================================================
+
+# 菜单本身 (菜单树)
+track_versions("menu", SysMenu)
+# 角色及授权关系 (当前用户菜单)
+track_versions("role_menu", SysRole, SysRoleMenu, SysUserRole)
+# 字典及字典数据
+track_versions("dict", SysDict, SysDictData)
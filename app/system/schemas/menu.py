@@ -1,8 +1,6 @@
-from datetime import datetime
-
 from pydantic import BaseModel
 
-from app.core.base_schema import BaseSchema
+from app.core.base_schema import BaseSchema, DisplayDatetime
 
 
 class MenuBase(BaseSchema):
@@ -39,8 +37,8 @@ class MenuUpdate(BaseModel):
 
 class MenuResponse(MenuBase):
     id: int
-    created_at: datetime
-    updated_at: datetime
+    created_at: DisplayDatetime
+    updated_at: DisplayDatetime
     children: list["MenuResponse"] | None = None
 
     class Config:
@@ -1,8 +1,8 @@
-from datetime import datetime
+from enum import StrEnum
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
-from app.core.base_schema import BaseSchema
+from app.core.base_schema import BaseSchema, DisplayDatetime
 
 
 class SysUserBase(BaseSchema):
@@ -28,17 +28,63 @@ class SysUserUpdate(BaseModel):
     password: str | None = None
 
 
+class UserBulkCreate(BaseModel):
+    """批量创建用户请求，字段校验失败时整批返回 422，唯一性冲突等业务错误逐行报告"""
+
+    users: list[SysUserCreate] = Field(min_length=1, max_length=5000)
+
+
+class UserBulkError(BaseSchema):
+    index: int  # 行在请求中的下标 (从 0 开始)
+    username: str | None = None
+    msg: str
+
+
+class UserBulkCreateResult(BaseSchema):
+    created: int
+    ids: dict[str, int]  # 用户名 -> 新用户 ID
+    errors: list[UserBulkError]
+
+
+class UserRoleAssign(BaseModel):
+    """批量调整用户角色：为 user_ids 中的每个用户添加 / 移除角色"""
+
+    user_ids: list[int] = Field(min_length=1, max_length=5000)
+    add_role_ids: list[int] = []
+    remove_role_ids: list[int] = []
+
+
+class UserRoleAssignResult(BaseSchema):
+    added: int  # 新增的用户-角色关联数
+    removed: int  # 删除的用户-角色关联数
+
+
 class SysUserResponse(SysUserBase):
     id: int
-    last_login_at: datetime | None = None
-    created_at: datetime
-    updated_at: datetime
+    last_login_at: DisplayDatetime | None = None
+    created_at: DisplayDatetime
+    updated_at: DisplayDatetime
     role_ids: list[int] | None = None
 
     class Config:
         from_attributes = True
 
 
+class UserSearchMode(StrEnum):
+    """用户搜索模式"""
+
+    PREFIX = "prefix"  # 前缀匹配 (typeahead)
+    FUZZY = "fuzzy"  # 三元组相似度模糊匹配 (容忍拼写错误)
+
+
+class UserSearchItem(BaseSchema):
+    id: int
+    username: str
+    email: str | None = None
+    remark: str | None = None
+    score: float
+
+
 class UserLogin(BaseModel):
     username: str
     password: str
@@ -6,6 +6,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 from app.core.exceptions import AuthenticationException
 from app.core.security import create_access_token, create_refresh_token, decode_token
+from app.system.crud.crud_user import crud_user
 from app.system.models import SysUser, SysUserToken
 from app.system.schemas.auth import TokenSchema
 
@@ -105,7 +106,7 @@ class AuthService:
 
         # 6. 签发全新的一对 Token
         # 这里需要查询用户对象来确保用户没被禁用 (可选)
-        user = await session.get(SysUser, db_token.user_id)
+        user = await crud_user.get(session, db_token.user_id)
         if not user or not user.is_active:
             raise AuthenticationException("用户不存在或已被禁用")
 
@@ -19,16 +19,13 @@ class SysDictService:
     async def update_dict(
         self, session: AsyncSession, dict_id: int, obj_in: DictUpdate
     ) -> SysDict:
-        db_obj = await crud_dict.get(session, dict_id)
-        if not db_obj:
-            raise NotFoundException("字典不存在")
-        return await crud_dict.update(session, db_obj=db_obj, obj_in=obj_in)
+        return await crud_dict.update_by_id(
+            session, id=dict_id, obj_in=obj_in, msg="字典不存在"
+        )
 
     async def delete_dict(self, session: AsyncSession, dict_id: int) -> None:
-        db_obj = await crud_dict.get(session, dict_id)
-        if not db_obj:
-            raise NotFoundException("字典不存在")
-        await crud_dict.delete(session, id=dict_id)
+        # 字典数据由外键 ON DELETE CASCADE 级联删除
+        await crud_dict.delete_by_id(session, id=dict_id, msg="字典不存在")
 
     async def get_dict_by_code(self, session: AsyncSession, code: str) -> dict | None:
         dict_item = await crud_dict.get_by_code(session, code)
@@ -58,16 +55,12 @@ class SysDictService:
     async def update_dict_data(
         self, session: AsyncSession, data_id: int, obj_in: DictDataUpdate
     ):
-        db_obj = await crud_dict_data.get(session, data_id)
-        if not db_obj:
-            raise NotFoundException("字典数据不存在")
-        return await crud_dict_data.update(session, db_obj=db_obj, obj_in=obj_in)
+        return await crud_dict_data.update_by_id(
+            session, id=data_id, obj_in=obj_in, msg="字典数据不存在"
+        )
 
     async def delete_dict_data(self, session: AsyncSession, data_id: int) -> None:
-        db_obj = await crud_dict_data.get(session, data_id)
-        if not db_obj:
-            raise NotFoundException("字典数据不存在")
-        await crud_dict_data.delete(session, id=data_id)
+        await crud_dict_data.delete_by_id(session, id=data_id, msg="字典数据不存在")
 
 
 sys_dict_service = SysDictService()
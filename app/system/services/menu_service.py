@@ -21,16 +21,12 @@ class SysMenuService:
     async def update_menu(
         self, session: AsyncSession, menu_id: int, obj_in: MenuUpdate
     ) -> SysMenu:
-        db_obj = await crud_menu.get(session, menu_id)
-        if not db_obj:
-            raise NotFoundException("菜单不存在")
-        return await crud_menu.update(session, db_obj=db_obj, obj_in=obj_in)
+        return await crud_menu.update_by_id(
+            session, id=menu_id, obj_in=obj_in, msg="菜单不存在"
+        )
 
     async def delete_menu(self, session: AsyncSession, menu_id: int) -> None:
-        db_obj = await crud_menu.get(session, menu_id)
-        if not db_obj:
-            raise NotFoundException("菜单不存在")
-        await crud_menu.delete(session, id=menu_id)
+        await crud_menu.delete_by_id(session, id=menu_id, msg="菜单不存在")
 
     async def get_menu_roles(self, session: AsyncSession, menu_id: int) -> list:
         db_obj = await crud_menu.get(session, menu_id)
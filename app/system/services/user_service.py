@@ -1,6 +1,8 @@
+from collections.abc import Sequence
 from datetime import UTC, datetime
+from typing import Any
 
-from sqlalchemy.orm import selectinload
+from pydantic import TypeAdapter, ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.exceptions import (
@@ -10,9 +12,26 @@ from app.core.exceptions import (
     ValidationException,
 )
 from app.core.resp import PageInfo
+from app.core.security import hash_passwords
+from app.system.crud.crud_role import crud_role
 from app.system.crud.crud_user import crud_user
+from app.system.crud.crud_user_role import crud_user_role
 from app.system.models import SysUser
-from app.system.schemas.user import SysUserCreate, SysUserResponse, SysUserUpdate
+from app.system.schemas.user import (
+    SysUserCreate,
+    SysUserResponse,
+    SysUserUpdate,
+    UserBulkCreateResult,
+    UserBulkError,
+    UserRoleAssign,
+    UserRoleAssignResult,
+    UserSearchItem,
+    UserSearchMode,
+)
+
+# 批量校验分页行，避免逐条 model_validate
+_user_list_adapter = TypeAdapter(list[SysUserResponse])
+_search_list_adapter = TypeAdapter(list[UserSearchItem])
 
 
 class SysUserService:
@@ -32,19 +51,104 @@ class SysUserService:
         Raises:
             ValidationException: 用户名或邮箱已存在时抛出
         """
-        # 检查用户名是否已存在
-        user = await crud_user.get_by_username(session, obj_in.username)
-        if user:
-            raise ValidationException("用户名已存在")
+        # 单条 INSERT，用户名 / 邮箱唯一性由部分唯一索引保证，冲突时 CRUD 层转换为业务异常
+        return await crud_user.create(session, obj_in=obj_in)
 
-        # 检查邮箱是否已存在
-        user = await crud_user.get_by_email(session, obj_in.email)
-        if user:
-            raise ValidationException("邮箱已存在")
+    async def to_response(
+        self, session: AsyncSession, user: SysUser
+    ) -> SysUserResponse:
+        """
+        构建单个用户的响应，附带角色 ID
 
-        # 创建用户
-        user = await crud_user.create(session, obj_in=obj_in)
-        return user
+        Args:
+            session: 数据库会话
+            user: 用户对象
+
+        Returns:
+            SysUserResponse: 用户响应数据
+        """
+        # role_ids 不是表列，单条响应单独查询一次关联表 (分页列表见 get_user_page)
+        role_ids = await crud_user_role.get_role_ids(session, user.id)
+        return SysUserResponse.model_validate(user).model_copy(
+            update={"role_ids": role_ids}
+        )
+
+    async def bulk_create_users(
+        self,
+        session: AsyncSession,
+        rows: Sequence[SysUserCreate | dict[str, Any]],
+    ) -> UserBulkCreateResult:
+        """
+        批量创建用户，逐行报告错误而不中断整批
+
+        Args:
+            session: 数据库会话
+            rows: 用户数据；字典行 (如导入脚本读取的原始数据) 按 SysUserCreate 逐行校验
+
+        Returns:
+            UserBulkCreateResult: 创建数量、用户名到 ID 的映射及失败行
+        """
+        errors: list[UserBulkError] = []
+
+        def reject(index: int, username: str | None, msg: str) -> None:
+            errors.append(UserBulkError(index=index, username=username, msg=msg))
+
+        # 1. 逐行校验字段，并剔除批内重复的用户名 / 邮箱
+        valid: list[tuple[int, SysUserCreate]] = []
+        seen_usernames, seen_emails = set(), set()
+        for index, row in enumerate(rows):
+            if isinstance(row, SysUserCreate):
+                obj_in = row
+            else:
+                try:
+                    obj_in = SysUserCreate.model_validate(row)
+                except ValidationError as e:
+                    err = e.errors()[0]
+                    loc = ".".join(str(p) for p in err["loc"])
+                    reject(index, row.get("username"), f"{loc}: {err['msg']}")
+                    continue
+            if obj_in.username in seen_usernames:
+                reject(index, obj_in.username, "用户名在本批中重复")
+                continue
+            if obj_in.email in seen_emails:
+                reject(index, obj_in.username, "邮箱在本批中重复")
+                continue
+            seen_usernames.add(obj_in.username)
+            seen_emails.add(obj_in.email)
+            valid.append((index, obj_in))
+
+        # 2. 一次查询校验唯一性，一次查询校验角色
+        taken_usernames, taken_emails = await crud_user.find_taken(
+            session, usernames=list(seen_usernames), emails=list(seen_emails)
+        )
+        role_ids = {rid for _, obj_in in valid for rid in obj_in.role_ids or []}
+        existing_roles = await crud_role.get_existing_ids(session, list(role_ids))
+
+        pending: list[tuple[int, SysUserCreate]] = []
+        for index, obj_in in valid:
+            if obj_in.username in taken_usernames:
+                reject(index, obj_in.username, "用户名已存在")
+            elif obj_in.email in taken_emails:
+                reject(index, obj_in.username, "邮箱已存在")
+            elif missing := set(obj_in.role_ids or []) - existing_roles:
+                reject(index, obj_in.username, f"角色不存在: {sorted(missing)}")
+            else:
+                pending.append((index, obj_in))
+
+        # 3. 进程池并行哈希后批量写入
+        objs_in = [obj_in for _, obj_in in pending]
+        hashed = await hash_passwords([obj_in.password for obj_in in objs_in])
+        ids = await crud_user.bulk_provision(
+            session, objs_in=objs_in, hashed_passwords=hashed
+        )
+
+        # 校验后被并发请求抢先创建的行会被 ON CONFLICT 跳过
+        for index, obj_in in pending:
+            if obj_in.username not in ids:
+                reject(index, obj_in.username, "用户名或邮箱已存在")
+
+        errors.sort(key=lambda e: e.index)
+        return UserBulkCreateResult(created=len(ids), ids=ids, errors=errors)
 
     async def update_user(
         self, session: AsyncSession, user_id: int, obj_in: SysUserUpdate
@@ -62,21 +166,39 @@ class SysUserService:
 
         Raises:
             NotFoundException: 用户不存在时抛出
-            ValidationException: 邮箱已存在时抛出
+            ValidationException: 用户名或邮箱已存在时抛出
         """
-        # 1. 查找是否存在
-        db_obj = await crud_user.get(session, user_id)
-        if not db_obj:
-            raise NotFoundException("用户不存在")
+        # 单条 UPDATE ... RETURNING，用户不存在时抛出 NotFoundException，
+        # 用户名 / 邮箱冲突时抛出 ValidationException
+        return await crud_user.update_by_id(
+            session, id=user_id, obj_in=obj_in, msg="用户不存在"
+        )
 
-        # 2. 检查邮箱唯一性 (如果修改了邮箱)
-        if obj_in.email and obj_in.email != db_obj.email:
-            if await crud_user.get_by_email(session, obj_in.email):
-                raise ValidationException("邮箱已存在")
+    async def assign_roles(
+        self, session: AsyncSession, obj_in: UserRoleAssign
+    ) -> UserRoleAssignResult:
+        """
+        批量为用户添加 / 移除角色 (单事务)
 
-        user = await crud_user.update(session, db_obj=db_obj, obj_in=obj_in)
+        Args:
+            session: 数据库会话
+            obj_in: 用户 ID 列表及待添加 / 移除的角色 ID
 
-        return user
+        Returns:
+            UserRoleAssignResult: 实际新增 / 删除的关联数量
+
+        Raises:
+            ValidationException: 同一角色同时出现在添加与移除中，或用户 / 角色不存在时抛出
+        """
+        if conflict := set(obj_in.add_role_ids) & set(obj_in.remove_role_ids):
+            raise ValidationException(f"角色不能同时添加和移除: {sorted(conflict)}")
+        added, removed = await crud_user_role.assign(
+            session,
+            user_ids=obj_in.user_ids,
+            add_role_ids=obj_in.add_role_ids,
+            remove_role_ids=obj_in.remove_role_ids,
+        )
+        return UserRoleAssignResult(added=added, removed=removed)
 
     async def update_last_login(self, session: AsyncSession, user_id: int) -> SysUser:
         """
@@ -140,7 +262,10 @@ class SysUserService:
         page: int,
         size: int,
         current_user: SysUser,
-    ) -> PageInfo[SysUserResponse]:
+        fields: Sequence[str] | None = None,
+        filters: Sequence[Any] | None = None,
+        order_by: Sequence[Any] | None = None,
+    ) -> PageInfo[Any]:
         """
         获取用户分页列表
 
@@ -149,9 +274,12 @@ class SysUserService:
             page: 页码
             size: 每页数量
             current_user: 当前登录用户
+            fields: 只查询的字段 (稀疏字段)，传入时 items 为行字典
+            filters: 过滤条件 (由 ListQuery 解析)
+            order_by: 排序条件 (由 ListQuery 解析)
 
         Returns:
-            PageInfo[SysUserResponse]: 用户分页数据
+            PageInfo[SysUserResponse]: 用户分页数据 (传入 fields 时为 PageInfo[dict])
 
         Raises:
             PermissionException: 非超级管理员访问时抛出
@@ -159,31 +287,63 @@ class SysUserService:
         if not current_user.is_superuser:
             raise PermissionException("权限不足")
 
-        users, total = await crud_user.get_page(
+        # 投影查询：用户列 + array_agg(role_id) 一条语句取回，不构建 ORM 对象
+        # role_ids 不是表列，需要时以聚合子查询附加
+        columns = list(fields or crud_user.column_fields(SysUserResponse))
+        extra_columns = []
+        if fields is None or "role_ids" in columns:
+            extra_columns.append(crud_user.role_ids_column())
+        columns = [f for f in columns if f != "role_ids"]
+
+        rows, total = await crud_user.get_page(
             session,
             page=page,
             page_size=size,
-            options=[selectinload(SysUser.roles)],  # type: ignore
+            fields=columns,
+            extra_columns=extra_columns,
+            filters=filters,
+            order_by=order_by,
         )
 
-        user_responses = []
-        for user in users:
-            # 过滤掉 ID 为 None 的情况，确保类型安全 (List[int])
-            role_ids = [role.id for role in user.roles if role.id is not None]
-
-            # 使用 model_validate 转换
-            # (确保 SysUserResponse 允许 extra fields 或者手动构建 dict)
-            user_resp = SysUserResponse.model_validate(user)
-            user_resp.role_ids = role_ids
-
-            user_responses.append(user_resp)
-
         # 计算总页数
         pages = (total + size - 1) // size if size > 0 else 0
 
+        # 稀疏字段：直接返回行字典
+        if fields:
+            return PageInfo[dict[str, Any]](
+                items=rows, total=total, page=page, size=size, pages=pages
+            )
         return PageInfo[SysUserResponse](
-            items=user_responses, total=total, page=page, size=size, pages=pages
+            items=_user_list_adapter.validate_python(rows),
+            total=total,
+            page=page,
+            size=size,
+            pages=pages,
+        )
+
+    async def search_users(
+        self,
+        session: AsyncSession,
+        keyword: str,
+        mode: UserSearchMode,
+        limit: int,
+    ) -> list[UserSearchItem]:
+        """
+        搜索用户 (用户名 / 邮箱 / 备注)
+
+        Args:
+            session: 数据库会话
+            keyword: 关键字
+            mode: 搜索模式 (prefix 前缀 / fuzzy 模糊)
+            limit: 最多返回条数
+
+        Returns:
+            list[UserSearchItem]: 按相似度降序排列的结果
+        """
+        rows = await crud_user.search(
+            session, keyword=keyword.strip(), mode=mode, limit=limit
         )
+        return _search_list_adapter.validate_python(rows)
 
 
 sys_user_service = SysUserService()
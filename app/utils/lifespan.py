@@ -0,0 +1,40 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.security import shutdown_hash_executor
+from app.db.pool import PoolAutoSizer
+from app.dependencies.database import engine, replica_engines
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    应用生命周期：启动时初始化日志与连接池控制器，关闭时释放数据库连接与哈希进程池
+    """
+    setup_logging()
+
+    sizers = []
+    if settings.DB_POOL_AUTOSIZE:
+        sizers = [
+            PoolAutoSizer(
+                e,
+                max_size=settings.DB_POOL_MAX_SIZE,
+                target_wait=settings.DB_POOL_TARGET_WAIT_MS / 1000,
+                interval=settings.DB_POOL_AUTOSIZE_INTERVAL,
+            )
+            for e in (engine, *replica_engines)
+        ]
+        for sizer in sizers:
+            sizer.start()
+
+    yield
+
+    for sizer in sizers:
+        await sizer.stop()
+    for e in (engine, *replica_engines):
+        await e.dispose()
+    shutdown_hash_executor()
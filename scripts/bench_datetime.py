@@ -0,0 +1,77 @@
+import argparse
+import sys
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from loguru import logger
+
+from app.core.base_schema import DISPLAY_TZ, format_datetime
+from scripts.bench_msgpack import NOW, timeit, user_page
+
+# =======================================================
+# 用法:
+#   python scripts/bench_datetime.py
+#   python scripts/bench_datetime.py --rows 500 --loops 2000
+#
+# 比较显示时间的格式化方式 (不连数据库):
+#   - strftime:  改造前 json_encoders 的实现 (ZoneInfo + strftime)
+#   - zoneinfo:  当前实现 format_datetime (ZoneInfo + isoformat)
+#   - fixed:     换成固定偏移 timezone 后再 isoformat (历史夏令时会算错，仅作对照)
+# 以及 GET /users 分页整体 dump_json 的耗时
+# =======================================================
+
+
+# =======================================================
+# 1. 格式化方式
+# =======================================================
+def formatters() -> dict[str, Callable[[datetime], str]]:
+    offset = NOW.astimezone(DISPLAY_TZ).utcoffset() or timedelta(0)
+    fixed = timezone(offset)
+    return {
+        "strftime": lambda dt: dt.astimezone(DISPLAY_TZ).strftime("%Y-%m-%d %H:%M:%S"),
+        "zoneinfo": format_datetime,
+        "fixed": lambda dt: dt.astimezone(fixed).isoformat(" ", "seconds")[:19],
+    }
+
+
+# =======================================================
+# 2. 计时
+# =======================================================
+def bench_values(values: list[datetime], loops: int) -> None:
+    logger.info(f"格式化 {len(values)} 个时间 (时区 {DISPLAY_TZ})")
+    logger.info(f"  {'format':<10}{'per value(ns)':>15}")
+    for name, fn in formatters().items():
+        cost = timeit(lambda fn=fn: [fn(dt) for dt in values], loops)
+        cost = cost * 1000 / len(values)
+        logger.info(f"  {name:<10}{cost:>15.0f}")
+
+
+def bench_page(rows: int, loops: int) -> None:
+    adapter, value = user_page(rows)
+    cost = timeit(lambda: adapter.dump_json(value), loops)
+    logger.info(f"GET /users ({rows} 行，每行 3 个时间) dump_json: {cost:.1f}us")
+
+
+# =======================================================
+# 3. 脚本主入口
+# =======================================================
+def main() -> None:
+    parser = argparse.ArgumentParser(description="显示时间格式化耗时对比")
+    parser.add_argument("--rows", type=int, default=100, help="分页行数")
+    parser.add_argument("--loops", type=int, default=500, help="每项计时的循环次数")
+    args = parser.parse_args()
+
+    # 分布在约一年内的时间，覆盖有夏令时时区的两种偏移
+    values = [
+        NOW - timedelta(hours=i * 8760 // (args.rows * 3)) for i in range(args.rows * 3)
+    ]
+    bench_values(values, args.loops)
+    bench_page(args.rows, args.loops)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from loguru import logger
+from pydantic import TypeAdapter, ValidationError
+
+from app.core.resp import FastJSONResponse, Result
+from app.system.schemas.user import UserBulkCreate
+from scripts.bench_msgpack import menu_tree, timeit, user_page
+
+# =======================================================
+# 用法:
+#   python scripts/bench_json.py
+#   python scripts/bench_json.py --rows 500 --loops 2000
+#
+# 按接口的 response_model 构造数据 (不连数据库)，比较响应体的 JSON 编码路径:
+#   - legacy:  改造前的路径 JSONResponse(jsonable_encoder(...))，先转字典再 json.dumps
+#   - fast:    FastJSONResponse，pydantic-core 由模型直接输出 bytes
+#   - route:   声明 response_model 的路由在默认响应类下的路径 (TypeAdapter.dump_json)
+# 三种路径输出的响应体字节一致，bytes 列可用于核对
+# =======================================================
+
+
+# =======================================================
+# 1. 构造错误响应数据
+# =======================================================
+def validation_error(rows: int) -> tuple[TypeAdapter, Any]:
+    """POST /users/bulk 的 422 响应 (每行邮箱格式错误)"""
+    users = [
+        {"username": f"user{i:05d}", "email": "invalid", "password": "x"}
+        for i in range(rows)
+    ]
+    try:
+        UserBulkCreate.model_validate({"users": users})
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+    model = Result[Any]
+    return TypeAdapter(model), model.error(code=422, msg="参数校验错误", data=errors)
+
+
+# =======================================================
+# 2. 计时
+# =======================================================
+def bench(name: str, adapter: TypeAdapter, value: Any, loops: int) -> None:
+    encoders: dict[str, Callable[[], bytes]] = {
+        "legacy": lambda: JSONResponse(jsonable_encoder(value)).body,
+        "fast": lambda: FastJSONResponse(value).body,
+        "route": lambda: adapter.dump_json(value),
+    }
+    logger.info(name)
+    logger.info(f"  {'path':<10}{'encode(us)':>12}{'bytes':>10}")
+    baseline = None
+    for path, fn in encoders.items():
+        cost = timeit(fn, loops)
+        baseline = baseline or cost
+        logger.info(
+            f"  {path:<10}{cost:>12.1f}{len(fn()):>10}  ({baseline / cost:.1f}x)"
+        )
+
+
+# =======================================================
+# 3. 脚本主入口
+# =======================================================
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON 响应编码路径对比")
+    parser.add_argument("--rows", type=int, default=100, help="每个接口的行数")
+    parser.add_argument("--loops", type=int, default=500, help="每项计时的循环次数")
+    args = parser.parse_args()
+
+    bench(f"GET /users ({args.rows} 行)", *user_page(args.rows), args.loops)
+    bench(f"GET /menus/tree ({args.rows} 个菜单)", *menu_tree(args.rows), args.loops)
+    bench(
+        f"422 参数校验错误 ({args.rows} 条)",
+        *validation_error(args.rows),
+        args.loops,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import gzip
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from loguru import logger
+from pydantic import TypeAdapter
+from pydantic_core import from_json
+
+from app.core.resp import PageInfo, Result, msgpack
+from app.system.schemas.menu import MenuResponse
+from app.system.schemas.user import SysUserResponse
+
+# =======================================================
+# 用法:
+#   python scripts/bench_msgpack.py
+#   python scripts/bench_msgpack.py --rows 500 --loops 2000
+#
+# 按接口的 response_model 构造数据 (不连数据库)，比较 JSON 与 MessagePack 的
+# 编码耗时与体积:
+#   - json:        路由的 JSON 输出 (dump_json)
+#   - transcode:   MsgPackMiddleware 的路径，JSON 输出后再转换 (dump_json + from_json + packb)
+#   - direct:      由模型直接编码 (dump_python(mode="json") + packb)，与异常处理器相同
+# =======================================================
+
+NOW = datetime(2026, 10, 19, 6, 3, 8, tzinfo=UTC)
+
+
+# =======================================================
+# 1. 构造接口数据
+# =======================================================
+def user_page(rows: int) -> tuple[TypeAdapter, Any]:
+    """GET /users 分页"""
+    users = [
+        SysUserResponse(
+            id=i,
+            username=f"user{i:05d}",
+            email=f"user{i:05d}@example.com",
+            remark="批量导入",
+            last_login_at=NOW,
+            created_at=NOW,
+            updated_at=NOW,
+            role_ids=[1, 2],
+        )
+        for i in range(rows)
+    ]
+    model = Result[PageInfo[SysUserResponse]]
+    value = model.success(
+        PageInfo[SysUserResponse](
+            items=users, total=rows * 10, page=1, size=rows, pages=10
+        )
+    )
+    return TypeAdapter(model), value
+
+
+def menu_tree(rows: int) -> tuple[TypeAdapter, Any]:
+    """GET /menus/tree (每个目录下挂 9 个菜单)"""
+    menus = []
+    for i in range(0, rows, 10):
+        children = [
+            MenuResponse(
+                id=i + j,
+                title=f"菜单{i + j}",
+                name=f"menu{i + j}",
+                path=f"/system/menu{i + j}",
+                component=f"system/menu{i + j}/index",
+                icon="menu",
+                sort=j,
+                parent_id=i,
+                menu_type=2,
+                created_at=NOW,
+                updated_at=NOW,
+            )
+            for j in range(1, 10)
+        ]
+        menus.append(
+            MenuResponse(
+                id=i,
+                title=f"目录{i}",
+                name=f"dir{i}",
+                path=f"/dir{i}",
+                icon="folder",
+                sort=i,
+                created_at=NOW,
+                updated_at=NOW,
+                children=children,
+            )
+        )
+    model = Result[list[MenuResponse]]
+    return TypeAdapter(model), model.success(menus)
+
+
+# =======================================================
+# 2. 计时
+# =======================================================
+def timeit(fn: Callable[[], bytes], loops: int, repeat: int = 5) -> float:
+    """单次编码耗时 (微秒)，取 repeat 轮中最快的一轮以排除调度抖动"""
+    for _ in range(min(loops, 50)):
+        fn()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / loops * 1e6
+
+
+def bench(name: str, adapter: TypeAdapter, value: Any, loops: int) -> None:
+    encoders: dict[str, Callable[[], bytes]] = {
+        "json": lambda: adapter.dump_json(value),
+        "transcode": lambda: msgpack.packb(from_json(adapter.dump_json(value))),
+        "direct": lambda: msgpack.packb(adapter.dump_python(value, mode="json")),
+    }
+    logger.info(name)
+    logger.info(f"  {'format':<10}{'encode(us)':>12}{'bytes':>10}{'gzip':>10}")
+    for fmt, fn in encoders.items():
+        body = fn()
+        logger.info(
+            f"  {fmt:<10}{timeit(fn, loops):>12.1f}{len(body):>10}"
+            f"{len(gzip.compress(body)):>10}"
+        )
+
+
+# =======================================================
+# 3. 脚本主入口
+# =======================================================
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON / MessagePack 编码对比")
+    parser.add_argument("--rows", type=int, default=100, help="每个接口的行数")
+    parser.add_argument("--loops", type=int, default=1000, help="每项计时的循环次数")
+    args = parser.parse_args()
+
+    if msgpack is None:
+        sys.exit("未安装 msgpack: uv sync --extra msgpack")
+
+    bench(f"GET /users ({args.rows} 行)", *user_page(args.rows), args.loops)
+    bench(f"GET /menus/tree ({args.rows} 个菜单)", *menu_tree(args.rows), args.loops)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# 基础配置 (仅需数据库连接) 与业务模块
+from app.core.config import settings
+from app.core.security import shutdown_hash_executor
+from app.system.services.user_service import sys_user_service
+
+# =======================================================
+# 用法:
+#   python scripts/import_users.py users.csv
+#   python scripts/import_users.py users.jsonl --batch-size 2000
+#
+# CSV 表头: username,email,password[,is_active,is_superuser,remark,role_ids]
+#   role_ids 多个角色用分号分隔，如 "1;3"
+# JSON: 数组文件 (.json) 或每行一个对象 (.jsonl / .ndjson)
+# =======================================================
+
+
+# =======================================================
+# 1. 读取文件
+# =======================================================
+def _read_csv(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open(newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            # 空列视为未填写，交给 Schema 默认值
+            data: dict[str, Any] = {k: v for k, v in row.items() if v not in ("", None)}
+            if "role_ids" in data:
+                # 只拆分不转换，非法的角色 ID 由 SysUserCreate 校验并按行报告
+                data["role_ids"] = [
+                    r.strip() for r in data["role_ids"].split(";") if r.strip()
+                ]
+            yield data
+
+
+def _read_json(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open(encoding="utf-8") as f:
+        if path.suffix == ".json":
+            yield from json.load(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_rows(path: Path) -> Iterator[dict[str, Any]]:
+    if path.suffix == ".csv":
+        return _read_csv(path)
+    return _read_json(path)
+
+
+def batched(
+    rows: Iterator[dict[str, Any]], size: int
+) -> Iterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# =======================================================
+# 2. 导入逻辑
+# =======================================================
+async def import_users(session: AsyncSession, path: Path, batch_size: int) -> None:
+    """
+    分批导入用户，每批一个事务，失败行逐条输出而不中断导入
+    """
+    created = failed = offset = 0
+    for batch in batched(read_rows(path), batch_size):
+        result = await sys_user_service.bulk_create_users(session, batch)
+        created += result.created
+        failed += len(result.errors)
+        for err in result.errors:
+            logger.warning(
+                f"⚠️ 第 {offset + err.index + 1} 条 ({err.username}): {err.msg}"
+            )
+        offset += len(batch)
+        logger.info(f"   - 已处理 {offset} 条，成功 {created} 条")
+
+    logger.success(f"✅ 导入完成：成功 {created} 条，失败 {failed} 条")
+
+
+# =======================================================
+# 3. 脚本主入口
+# =======================================================
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="批量导入用户")
+    parser.add_argument("file", type=Path, help="CSV / JSON / JSONL 文件")
+    parser.add_argument("--batch-size", type=int, default=1000, help="每批条数")
+    args = parser.parse_args()
+
+    logger.info(f"🔄 开始导入用户: {args.file}")
+
+    # 创建数据库引擎
+    engine = create_async_engine(settings.DATABASE_URL, echo=False)
+
+    # 创建 Session 工厂
+    AsyncSessionLocal = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    try:
+        async with AsyncSessionLocal() as session:
+            await import_users(session, args.file, args.batch_size)
+    finally:
+        shutdown_hash_executor()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
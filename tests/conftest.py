@@ -0,0 +1,192 @@
+import os
+
+# 测试不连接真实数据库，必填配置给出占位值 (环境变量 / .env 中的配置优先)
+for _key, _value in {
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "test",
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from collections.abc import AsyncIterator, Iterator, Sequence  # noqa: E402
+from importlib import import_module  # noqa: E402
+from typing import Any  # noqa: E402
+
+import pytest  # noqa: E402
+import sqlalchemy as sa  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from loguru import logger  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlmodel import SQLModel, func  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from app.dependencies.auth import get_current_user  # noqa: E402
+from app.dependencies.database import get_session  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.system.crud.crud_user import crud_user  # noqa: E402
+from app.system.models import SysUser, SysUserRole  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fake_password_hashing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """测试中不启动密码哈希进程池，哈希值为可预期的占位串"""
+
+    async def hash_passwords(passwords: Sequence[str]) -> list[str]:
+        return [f"hashed:{p}" for p in passwords]
+
+    # app.system.crud 包导出了同名的 crud_user 实例，按模块路径取模块本身
+    for module in ("app.system.crud.crud_user", "app.system.services.user_service"):
+        monkeypatch.setattr(import_module(module), "hash_passwords", hash_passwords)
+
+
+@pytest.fixture
+def log_messages() -> Iterator[list[str]]:
+    """收集测试期间 loguru 输出的日志消息"""
+    messages: list[str] = []
+    handler_id = logger.add(
+        lambda message: messages.append(message.record["message"]), level="DEBUG"
+    )
+    yield messages
+    logger.remove(handler_id)
+
+
+@pytest.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    """内存 SQLite 引擎 (单连接共享)，每个用例独立建表"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    """准备测试数据用的会话"""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+async def admin(session: AsyncSession) -> SysUser:
+    """已入库的超级管理员"""
+    user = SysUser(
+        username="admin",
+        email="admin@example.com",
+        hashed_password="x",
+        is_superuser=True,
+    )
+    session.add(user)
+    await session.commit()
+    return user
+
+
+@pytest.fixture
+def app(engine: AsyncEngine, admin: SysUser) -> FastAPI:
+    """
+    完整装配的应用 (中间件、异常处理器、路由)
+
+    数据库会话替换为测试引擎，当前用户固定为 admin
+    """
+    app = create_app()
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    # 与 session 夹具中的实例分开，避免跨会话共享 ORM 对象
+    current_user = SysUser.model_validate(admin.model_dump())
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_current_user] = lambda: current_user
+    return app
+
+
+@pytest.fixture
+async def client(app: FastAPI) -> AsyncIterator[AsyncClient]:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def sqlite_role_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+    """SQLite 没有 array_agg，role_ids 聚合列改用 json_group_array"""
+
+    def role_ids_column() -> sa.ColumnElement[list[int]]:
+        role_ids = (
+            sa.select(func.json_group_array(SysUserRole.role_id))
+            .where(SysUserRole.user_id == SysUser.id)
+            .scalar_subquery()
+        )
+        return sa.type_coerce(role_ids, sa.JSON).label("role_ids")
+
+    monkeypatch.setattr(crud_user, "role_ids_column", role_ids_column)
+
+
+class FakeResult:
+    """会话执行结果的替身，按需返回预置的行"""
+
+    def __init__(self, rows: Sequence[Any] = (), rowcount: int = 0) -> None:
+        self.rows = list(rows)
+        self.rowcount = rowcount
+
+    def all(self) -> list[Any]:
+        return self.rows
+
+    def one(self) -> Any:
+        (row,) = self.rows
+        return row
+
+    def first(self) -> Any:
+        return self.rows[0] if self.rows else None
+
+    def scalars(self) -> "FakeResult":
+        return self
+
+
+class RecordingSession:
+    """
+    记录执行语句的会话替身
+
+    PostgreSQL 专有语句 (ON CONFLICT、= ANY(:ids)、可写 CTE) 无法在 SQLite 上执行，
+    测试按 PostgreSQL 方言编译后检查 SQL，并用 results 依次模拟返回值
+    """
+
+    def __init__(self) -> None:
+        self.results: list[FakeResult] = []
+        self.statements: list[Any] = []
+        self.params: list[Any] = []
+        self.committed = self.rolled_back = False
+
+    async def exec(self, statement: Any, params: Any = None, **_kw: Any) -> FakeResult:
+        self.statements.append(statement)
+        self.params.append(params)
+        return self.results.pop(0) if self.results else FakeResult()
+
+    async def commit(self) -> None:
+        self.committed = True
+
+    async def rollback(self) -> None:
+        self.rolled_back = True
+
+    def sql(self, index: int = -1) -> str:
+        """第 index 条语句按 PostgreSQL 方言编译后的 SQL"""
+        return str(self.statements[index].compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def recording_session() -> RecordingSession:
+    return RecordingSession()
@@ -0,0 +1,267 @@
+from collections.abc import AsyncIterator
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import security
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    hash_password,
+    verify_password,
+)
+from app.dependencies.database import get_session
+from app.main import create_app
+from app.system.models import (
+    SysMenu,
+    SysRole,
+    SysRoleMenu,
+    SysUser,
+    SysUserRole,
+    SysUserToken,
+)
+
+
+@pytest.fixture
+async def alice(session: AsyncSession) -> SysUser:
+    """使用真实 bcrypt 哈希的普通用户，拥有 system:role:export 权限"""
+    user = SysUser(
+        username="alice",
+        email="alice@example.com",
+        hashed_password=hash_password("secret"),
+    )
+    role = SysRole(name="运维", code="ops")
+    menu = SysMenu(title="角色导出", name="RoleExport", permission="system:role:export")
+    session.add_all([user, role, menu])
+    await session.flush()
+    session.add_all(
+        [
+            SysUserRole(user_id=user.id, role_id=role.id),
+            SysRoleMenu(role_id=role.id, menu_id=menu.id),
+        ]
+    )
+    await session.commit()
+    return user
+
+
+@pytest.fixture
+async def auth_client(engine: AsyncEngine) -> AsyncIterator[AsyncClient]:
+    """只替换数据库会话的应用，当前用户由 Bearer 令牌解析"""
+    app: FastAPI = create_app()
+
+    async def override_session() -> AsyncIterator[AsyncSession]:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def _bearer(user_id: object) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+async def _login(client: AsyncClient, password: str = "secret") -> dict:
+    response = await client.post(
+        "/api/v1/auth/login", json={"username": "alice", "password": password}
+    )
+    return response.json()
+
+
+def test_password_hash_round_trip() -> None:
+    hashed = hash_password("secret")
+
+    assert hashed != "secret"
+    assert verify_password("secret", hashed)
+    assert not verify_password("wrong", hashed)
+
+
+def test_tokens_carry_type_and_subject() -> None:
+    access = decode_token(create_access_token({"sub": "1"}))
+    refresh = decode_token(create_refresh_token({"sub": "1"}, timedelta(minutes=1)))
+
+    assert access is not None
+    assert refresh is not None
+    assert (access["type"], refresh["type"]) == ("access", "refresh")
+    assert access["sub"] == refresh["sub"] == "1"
+
+
+def test_refresh_tokens_are_unique_within_a_second() -> None:
+    assert create_refresh_token({"sub": "1"}) != create_refresh_token({"sub": "1"})
+
+
+@pytest.mark.parametrize(
+    "token",
+    ["not-a-jwt", create_access_token({"sub": "1"}, timedelta(seconds=-1))],
+    ids=["malformed", "expired"],
+)
+def test_decode_token_rejects_invalid_tokens(token: str) -> None:
+    assert decode_token(token) is None
+
+
+async def test_hash_passwords_empty_input_skips_pool() -> None:
+    # autouse 夹具替换的是导入方模块中的引用，这里调用的是原始实现
+    assert await security.hash_passwords([]) == []
+    assert security._hash_executor is None
+
+
+async def test_login_refresh_and_logout(
+    auth_client: AsyncClient, session: AsyncSession, alice: SysUser
+) -> None:
+    body = await _login(auth_client)
+
+    assert body["code"] == 0
+    assert body["data"]["tokenType"] == "Bearer"
+    access, refresh = body["data"]["accessToken"], body["data"]["refreshToken"]
+    assert decode_token(access)["sub"] == str(alice.id)  # type: ignore[index]
+
+    response = await auth_client.post(
+        "/api/v1/auth/logout", json={"refresh_token": refresh}
+    )
+    assert response.json()["data"] == "退出成功"
+    token = (
+        await session.exec(select(SysUserToken).where(SysUserToken.token == refresh))
+    ).one()
+    await session.refresh(token)
+    assert token.is_used
+
+    # 已作废的刷新令牌再次使用视为重放
+    response = await auth_client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": refresh}
+    )
+    assert response.json()["msg"] == "安全警告：检测到异常令牌使用，请重新登录"
+
+
+@pytest.mark.parametrize(
+    ("username", "password", "message"),
+    [
+        ("alice", "wrong", "用户名或密码错误"),
+        ("nobody", "secret", "用户名或密码错误"),
+    ],
+)
+@pytest.mark.usefixtures("alice")
+async def test_login_rejects_bad_credentials(
+    auth_client: AsyncClient,
+    username: str,
+    password: str,
+    message: str,
+) -> None:
+    response = await auth_client.post(
+        "/api/v1/auth/login", json={"username": username, "password": password}
+    )
+
+    assert response.json()["msg"] == message
+
+
+@pytest.mark.usefixtures("alice")
+async def test_repeated_logins_store_distinct_tokens(
+    auth_client: AsyncClient, session: AsyncSession
+) -> None:
+    first, second = await _login(auth_client), await _login(auth_client)
+
+    assert first["code"] == second["code"] == 0
+    tokens = (await session.exec(select(SysUserToken.token))).all()
+    assert len(set(tokens)) == 2
+
+
+async def test_login_rejects_inactive_user(
+    auth_client: AsyncClient, session: AsyncSession, alice: SysUser
+) -> None:
+    alice.is_active = False
+    session.add(alice)
+    await session.commit()
+
+    assert (await _login(auth_client))["msg"] == "用户已被禁用"
+
+
+@pytest.mark.parametrize(
+    ("token", "message"),
+    [
+        ("not-a-jwt", "无效的刷新令牌"),
+        (create_access_token({"sub": "1"}), "无效的刷新令牌"),
+        (create_refresh_token({"sub": "1"}), "令牌无效或已失效"),
+    ],
+    ids=["malformed", "access-token", "unknown"],
+)
+async def test_refresh_rejects_invalid_tokens(
+    auth_client: AsyncClient, token: str, message: str
+) -> None:
+    response = await auth_client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": token}
+    )
+
+    assert response.json()["msg"] == message
+
+
+async def test_logout_ignores_unknown_token(auth_client: AsyncClient) -> None:
+    response = await auth_client.post(
+        "/api/v1/auth/logout", json={"refresh_token": "unknown"}
+    )
+
+    assert response.json()["data"] == "退出成功"
+
+
+async def test_bearer_token_resolves_current_user(
+    auth_client: AsyncClient, alice: SysUser
+) -> None:
+    response = await auth_client.get("/api/v1/sys/roles", headers=_bearer(alice.id))
+
+    assert response.json()["code"] == 0
+    assert response.json()["data"]["total"] == 1
+
+
+@pytest.mark.parametrize(
+    ("headers", "message"),
+    [
+        ({"Authorization": "Bearer not-a-jwt"}, "Invalid token"),
+        (
+            {"Authorization": f"Bearer {create_access_token({'type': 'access'})}"},
+            "Invalid token",
+        ),
+        (_bearer("abc"), "Invalid token"),
+        (_bearer(999), "User not found"),
+    ],
+    ids=["malformed", "no-subject", "bad-subject", "unknown-user"],
+)
+@pytest.mark.usefixtures("alice")
+async def test_bearer_token_rejections(
+    auth_client: AsyncClient, headers: dict[str, str], message: str
+) -> None:
+    response = await auth_client.get("/api/v1/sys/roles", headers=headers)
+
+    assert response.json()["code"] == 401
+    assert response.json()["msg"] == message
+
+
+async def test_bearer_token_rejects_inactive_user(
+    auth_client: AsyncClient, session: AsyncSession, alice: SysUser
+) -> None:
+    alice.is_active = False
+    session.add(alice)
+    await session.commit()
+
+    response = await auth_client.get("/api/v1/sys/roles", headers=_bearer(alice.id))
+
+    assert response.json()["code"] == 403
+
+
+async def test_perms_checks_menu_permissions(
+    auth_client: AsyncClient, alice: SysUser
+) -> None:
+    headers = _bearer(alice.id)
+
+    allowed = await auth_client.get("/api/v1/sys/roles/export", headers=headers)
+    denied = await auth_client.get("/api/v1/sys/menus/export", headers=headers)
+
+    assert allowed.status_code == 200
+    assert allowed.text.splitlines()[1].startswith("运维,ops,")
+    assert denied.json()["code"] == 403
+    assert denied.json()["msg"] == "权限不足，需要权限: system:menu:export"
@@ -0,0 +1,177 @@
+import gzip
+import zlib
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from starlette.datastructures import Headers
+
+from app.core.compression import (
+    CODECS,
+    CompressedPayload,
+    is_compressible,
+    negotiate_encoding,
+)
+from app.core.config import settings
+from app.middleware import CompressionMiddleware
+
+BIG = "压缩" * 2048
+
+
+@pytest.fixture
+async def compressed_client() -> AsyncIterator[AsyncClient]:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    payload = CompressedPayload(BIG.encode())
+
+    @app.get("/big")
+    async def big() -> PlainTextResponse:
+        return PlainTextResponse(BIG, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    @app.get("/image")
+    async def image() -> Response:
+        return Response(b"\x89PNG" * 1024, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def rows() -> AsyncIterator[str]:
+            for i in range(3):
+                yield f"{i},{'x' * 10}\n"
+
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    @app.get("/payload")
+    async def cached(request: Request) -> Response:
+        return payload.response(request)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0.5, identity", "gzip"),
+        ("*", next(iter(CODECS))),
+        ("gzip;q=0", None),
+        ("*;q=0", None),
+        ("gzip;q=abc", None),
+        ("deflate, ,", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding: str, expected: str | None) -> None:
+    codec = negotiate_encoding(accept_encoding)
+    assert (codec.name if codec else None) == expected
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"content-type": "application/json"}, True),
+        ({"content-type": "application/problem+json"}, True),
+        ({"content-type": "image/png"}, False),
+        ({"content-type": "text/plain", "content-encoding": "gzip"}, False),
+        ({}, False),
+    ],
+)
+def test_is_compressible(headers: dict[str, str], expected: bool) -> None:
+    assert is_compressible(Headers(headers)) is expected
+
+
+async def test_compresses_large_response(compressed_client: AsyncClient) -> None:
+    resp = await compressed_client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    # 压缩后的表示与原始内容不同，强 ETag 转为弱 ETag
+    assert resp.headers["etag"] == 'W/"abc"'
+    assert int(resp.headers["content-length"]) < len(BIG.encode())
+    assert resp.text == BIG
+
+
+async def test_skips_small_and_incompressible(compressed_client: AsyncClient) -> None:
+    headers = {"Accept-Encoding": "gzip"}
+
+    small = await compressed_client.get("/small", headers=headers)
+    image = await compressed_client.get("/image", headers=headers)
+
+    assert "content-encoding" not in small.headers
+    assert small.text == "ok"
+    assert "content-encoding" not in image.headers
+    assert image.content.startswith(b"\x89PNG")
+
+
+async def test_skips_without_accept_encoding(compressed_client: AsyncClient) -> None:
+    resp = await compressed_client.get("/big", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in resp.headers
+    assert resp.headers["etag"] == '"abc"'
+
+
+async def test_skips_head_requests(compressed_client: AsyncClient) -> None:
+    resp = await compressed_client.head("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in resp.headers
+
+
+async def test_streams_compressed_chunks(compressed_client: AsyncClient) -> None:
+    resp = await compressed_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert resp.text == "".join(f"{i},{'x' * 10}\n" for i in range(3))
+
+
+async def test_precompressed_payload(compressed_client: AsyncClient) -> None:
+    resp = await compressed_client.get("/payload", headers={"Accept-Encoding": "gzip"})
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.text == BIG
+
+    resp = await compressed_client.get(
+        "/payload", headers={"Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in resp.headers
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.text == BIG
+
+
+def test_payload_encodes_once() -> None:
+    payload = CompressedPayload(BIG.encode())
+    codec = CODECS["gzip"]
+
+    first = payload.encoded(codec)
+
+    assert payload.encoded(codec) is first
+    assert gzip.decompress(first) == BIG.encode()
+
+
+async def test_small_payload_not_compressed(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 1 << 20)
+    request = Request(
+        {"type": "http", "headers": [(b"accept-encoding", b"gzip")], "method": "GET"}
+    )
+
+    resp = CompressedPayload(b"{}").response(request)
+
+    assert resp.body == b"{}"
+    assert "content-encoding" not in resp.headers
+    assert "vary" not in resp.headers
+
+
+def test_gzip_stream_matches_gzip_format() -> None:
+    stream = CODECS["gzip"].stream(6)
+
+    data = stream.compress(b"abc" * 100) + stream.flush()
+
+    assert zlib.decompress(data, 31) == b"abc" * 100
@@ -0,0 +1,86 @@
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.system.crud.crud_role import crud_role
+from app.system.crud.crud_user import crud_user
+from app.system.schemas.role import RoleCreate, RoleUpdate
+from tests.conftest import FakeResult, RecordingSession
+
+
+async def test_bulk_update_skips_missing_ids(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult([1]))
+
+    updated = await crud_role.bulk_update(
+        recording_session,  # type: ignore[arg-type]
+        objs_in={1: RoleUpdate(name="运维"), 2: {"name": "审计"}, 3: RoleUpdate()},
+    )
+
+    assert updated == 1
+    assert "sys_roles.id = ANY (%(ids)s::INTEGER[])" in recording_session.sql(0)
+    assert recording_session.statements[0].compile().params["ids"] == [1, 2]
+    assert recording_session.params[1] == [{"name": "运维", "id": 1}]
+    assert recording_session.committed
+
+
+async def test_bulk_delete_soft_deletes_with_any(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult(rowcount=2))
+
+    deleted = await crud_user.bulk_delete(recording_session, ids=[3, 1, 3])  # type: ignore[arg-type]
+
+    assert deleted == 2
+    sql = recording_session.sql()
+    assert sql.startswith("UPDATE sys_users SET is_deleted=")
+    assert "sys_users.is_deleted = false AND sys_users.id = ANY" in sql
+    assert recording_session.statements[-1].compile().params["ids"] == [3, 1]
+
+
+async def test_bulk_delete_cleans_relations_before_hard_delete(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.extend(
+        [FakeResult(), FakeResult(), FakeResult(rowcount=1)]
+    )
+
+    deleted = await crud_role.bulk_delete(recording_session, ids=[5])  # type: ignore[arg-type]
+
+    assert deleted == 1
+    assert [recording_session.sql(i).split(" WHERE")[0] for i in range(3)] == [
+        "DELETE FROM sys_user_roles",
+        "DELETE FROM sys_role_menus",
+        "DELETE FROM sys_roles",
+    ]
+
+
+async def test_bulk_delete_rolls_back_on_error(
+    recording_session: RecordingSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def fail(*_args: object, **_kw: object) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(recording_session, "exec", fail)
+
+    with pytest.raises(RuntimeError):
+        await crud_user.bulk_delete(recording_session, ids=[1])  # type: ignore[arg-type]
+    assert recording_session.rolled_back
+    assert not recording_session.committed
+
+
+async def test_bulk_create_inserts_in_chunks(session: AsyncSession) -> None:
+    objs_in = [RoleCreate(name=f"角色{i}", code=f"r{i}") for i in range(5)]
+
+    roles = await crud_role.bulk_create(session, objs_in=objs_in, chunk_size=2)
+
+    assert [role.code for role in roles] == ["r0", "r1", "r2", "r3", "r4"]
+    assert all(role.id is not None for role in roles)
+    _, total = await crud_role.get_page(session)
+    assert total == 5
+
+
+async def test_bulk_create_empty(recording_session: RecordingSession) -> None:
+    assert await crud_role.bulk_create(recording_session, objs_in=[]) == []  # type: ignore[arg-type]
+    assert recording_session.statements == []
+    assert not recording_session.committed
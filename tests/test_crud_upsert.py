@@ -0,0 +1,113 @@
+import pytest
+
+from app.core.exceptions import ValidationException
+from app.system.crud.crud_role import crud_role
+from app.system.crud.crud_user import crud_user
+from app.system.models import SysRole
+from app.system.schemas.role import RoleCreate
+from app.system.schemas.user import SysUserCreate
+from tests.conftest import FakeResult, RecordingSession
+
+
+def _set_clause(sql: str) -> set[str]:
+    """DO UPDATE SET 中的赋值 (按表的列顺序渲染，与传入顺序无关)"""
+    clause = sql.split(" DO UPDATE SET ")[1].split(" RETURNING ")[0]
+    return set(clause.split(", "))
+
+
+async def test_bulk_upsert_on_conflict_do_update(
+    recording_session: RecordingSession,
+) -> None:
+    objs_in = [
+        RoleCreate(name="旧名称", code="ops"),
+        RoleCreate(name="审计", code="audit"),
+        RoleCreate(name="运维", code="ops"),
+    ]
+
+    await crud_role.bulk_upsert(recording_session, objs_in=objs_in)  # type: ignore[arg-type]
+
+    sql = recording_session.sql()
+    assert "ON CONFLICT (code) DO UPDATE SET" in sql
+    assert _set_clause(sql) == {
+        "status = excluded.status",
+        "name = excluded.name",
+        "description = excluded.description",
+        "updated_at = now()",
+    }
+    # 同一冲突键在一条语句内只保留最后一条
+    (rows,) = recording_session.params
+    assert [(row["code"], row["name"]) for row in rows] == [
+        ("ops", "运维"),
+        ("audit", "审计"),
+    ]
+    assert recording_session.committed
+
+
+async def test_bulk_upsert_update_columns(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult([SysRole(name="运维", code="ops")]))
+
+    await crud_role.upsert(
+        recording_session,  # type: ignore[arg-type]
+        obj_in=RoleCreate(name="运维", code="ops"),
+        update_columns=["name"],
+    )
+
+    assert _set_clause(recording_session.sql()) == {
+        "name = excluded.name",
+        "updated_at = now()",
+    }
+
+
+@pytest.mark.parametrize("columns", [["code"], ["created_at"], ["missing"]])
+async def test_bulk_upsert_rejects_non_updatable_columns(
+    recording_session: RecordingSession, columns: list[str]
+) -> None:
+    with pytest.raises(ValueError, match="upsert 不能更新的字段"):
+        await crud_role.bulk_upsert(
+            recording_session,  # type: ignore[arg-type]
+            objs_in=[RoleCreate(name="运维", code="ops")],
+            update_columns=columns,
+        )
+    assert recording_session.statements == []
+
+
+async def test_bulk_upsert_requires_conflict_columns(
+    recording_session: RecordingSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(crud_role, "upsert_conflict_columns", ())
+
+    with pytest.raises(ValueError, match="upsert_conflict_columns"):
+        await crud_role.bulk_upsert(recording_session, objs_in=[])  # type: ignore[arg-type]
+
+
+async def test_user_upsert_keeps_credentials(
+    recording_session: RecordingSession,
+) -> None:
+    obj_in = SysUserCreate(username="alice", email="alice@example.com", password="pw")
+
+    await crud_user.bulk_upsert(recording_session, objs_in=[obj_in])  # type: ignore[arg-type]
+
+    sql = recording_session.sql()
+    # 软删除表的唯一索引是部分索引，冲突推断带上相同的谓词
+    assert "ON CONFLICT (username) WHERE is_deleted = false DO UPDATE" in sql
+    assert _set_clause(sql) == {
+        "email = excluded.email",
+        "remark = excluded.remark",
+        "updated_at = now()",
+    }
+    (rows,) = recording_session.params
+    assert rows[0]["hashed_password"] == "hashed:pw"
+
+
+async def test_user_upsert_rejects_role_ids(
+    recording_session: RecordingSession,
+) -> None:
+    obj_in = SysUserCreate(
+        username="alice", email="alice@example.com", password="pw", role_ids=[]
+    )
+
+    with pytest.raises(ValidationException, match="role_ids"):
+        await crud_user.bulk_upsert(recording_session, objs_in=[obj_in])  # type: ignore[arg-type]
+    assert recording_session.statements == []
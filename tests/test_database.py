@@ -0,0 +1,114 @@
+from itertools import cycle
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.dependencies import database
+from app.dependencies.database import (
+    STICKY_COOKIE,
+    STICKY_STATE,
+    get_session,
+)
+from app.middleware import ReplicaStickyMiddleware
+
+
+def _request(method: str = "GET", cookie: str | None = None) -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+def _sticky(request: Request) -> bool:
+    return getattr(request.state, STICKY_STATE, False)
+
+
+@pytest.fixture
+def replicas(engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch) -> None:
+    """主库与两个副本的会话工厂 (同一测试引擎，以 info["name"] 区分)"""
+
+    def factory(name: str) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(engine, class_=AsyncSession, info={"name": name})
+
+    monkeypatch.setattr(database, "async_session", factory("primary"))
+    monkeypatch.setattr(database, "replica_engines", [engine, engine])
+    monkeypatch.setattr(
+        database, "_replica_sessions", cycle([factory("r1"), factory("r2")])
+    )
+
+
+async def _route(request: Request) -> str:
+    """get_session 为该请求选择的会话"""
+    sessions = get_session(request)
+    session = await anext(sessions)
+    await sessions.aclose()
+    return session.info["name"]
+
+
+@pytest.mark.usefixtures("replicas")
+async def test_reads_round_robin_replicas() -> None:
+    requests = [_request("GET") for _ in range(3)]
+
+    assert [await _route(request) for request in requests] == ["r1", "r2", "r1"]
+    assert await _route(_request("HEAD")) == "r2"
+    assert not any(_sticky(request) for request in requests)
+
+
+@pytest.mark.usefixtures("replicas")
+async def test_write_uses_primary_and_marks_sticky() -> None:
+    request = _request("POST")
+
+    assert await _route(request) == "primary"
+    assert _sticky(request)
+
+
+@pytest.mark.usefixtures("replicas")
+async def test_sticky_cookie_routes_reads_to_primary() -> None:
+    request = _request("GET", cookie=f"{STICKY_COOKIE}=1")
+
+    assert await _route(request) == "primary"
+    assert not _sticky(request)
+
+
+async def test_without_replicas_everything_uses_primary(
+    engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    primary = async_sessionmaker(engine, class_=AsyncSession, info={"name": "primary"})
+    monkeypatch.setattr(database, "async_session", primary)
+    monkeypatch.setattr(database, "replica_engines", [])
+    request = _request("DELETE")
+
+    assert await _route(_request("GET")) == "primary"
+    assert await _route(request) == "primary"
+    assert not _sticky(request)
+
+
+@pytest.mark.usefixtures("replicas")
+async def test_sticky_cookie_survives_endpoint_responses() -> None:
+    """处理函数直接返回 Response 时，粘滞 Cookie 仍随最终响应下发"""
+    app = FastAPI()
+    app.add_middleware(ReplicaStickyMiddleware)
+
+    @app.api_route("/items", methods=["GET", "POST"])
+    async def items(session: AsyncSession = Depends(get_session)) -> PlainTextResponse:
+        return PlainTextResponse(session.info["name"])
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post("/items")
+        assert resp.text == "primary"
+        cookie = resp.headers["set-cookie"]
+        assert cookie.startswith(f"{STICKY_COOKIE}=1;")
+        assert "HttpOnly" in cookie
+        assert "SameSite=lax" in cookie
+
+        # 客户端带回 Cookie 后，读请求也走主库
+        resp = await client.get("/items")
+        assert resp.text == "primary"
+        assert "set-cookie" not in resp.headers
+
+        client.cookies.clear()
+        resp = await client.get("/items")
+        assert resp.text.startswith("r")
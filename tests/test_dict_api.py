@@ -0,0 +1,106 @@
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.system.models import SysDict, SysDictData
+
+
+@pytest.fixture
+async def gender(session: AsyncSession) -> SysDict:
+    """带两条字典数据的性别字典"""
+    obj = SysDict(name="性别", code="gender")
+    session.add(obj)
+    await session.flush()
+    session.add_all(
+        [
+            SysDictData(dict_id=obj.id, label="女", value="2", sort=1),
+            SysDictData(dict_id=obj.id, label="男", value="1", sort=0),
+        ]
+    )
+    await session.commit()
+    return obj
+
+
+async def test_create_and_update_dict(client: AsyncClient) -> None:
+    created = await client.post(
+        "/api/v1/sys/dicts/", json={"name": "状态", "code": "status"}
+    )
+    dict_id = created.json()["data"]["id"]
+
+    updated = await client.put(f"/api/v1/sys/dicts/{dict_id}", json={"name": "状态2"})
+    detail = await client.get(f"/api/v1/sys/dicts/{dict_id}")
+
+    assert created.json()["data"]["code"] == "status"
+    assert updated.json()["data"]["name"] == "状态2"
+    assert detail.json()["data"]["name"] == "状态2"
+
+
+@pytest.mark.usefixtures("gender")
+async def test_list_dicts_with_sparse_fields(client: AsyncClient) -> None:
+    resp = await client.get("/api/v1/sys/dicts", params={"fields": "code"})
+
+    assert resp.json()["data"]["items"] == [{"code": "gender"}]
+    assert resp.json()["data"]["total"] == 1
+
+
+async def test_get_dict_by_code_includes_data(
+    client: AsyncClient, gender: SysDict
+) -> None:
+    resp = await client.get("/api/v1/sys/dicts/code/gender")
+
+    data = resp.json()["data"]
+    assert data["id"] == gender.id
+    assert {d["label"] for d in data["data"]} == {"男", "女"}
+
+
+async def test_dict_data_crud(client: AsyncClient, gender: SysDict) -> None:
+    created = await client.post(
+        f"/api/v1/sys/dicts/{gender.id}/data",
+        json={"dict_id": gender.id, "label": "未知", "value": "0", "sort": 2},
+    )
+    data_id = created.json()["data"]["id"]
+
+    updated = await client.put(
+        f"/api/v1/sys/dicts/data/{data_id}", json={"label": "保密"}
+    )
+    page = await client.get(
+        f"/api/v1/sys/dicts/{gender.id}/data", params={"fields": "label"}
+    )
+    deleted = await client.delete(f"/api/v1/sys/dicts/data/{data_id}")
+
+    assert updated.json()["data"]["label"] == "保密"
+    assert {"label": "保密"} in page.json()["data"]["items"]
+    assert page.json()["data"]["total"] == 3
+    assert deleted.json()["data"] == "字典数据删除成功"
+
+
+async def test_delete_dict(client: AsyncClient, gender: SysDict) -> None:
+    deleted = await client.delete(f"/api/v1/sys/dicts/{gender.id}")
+    detail = await client.get(f"/api/v1/sys/dicts/{gender.id}")
+
+    assert deleted.json()["data"] == "字典删除成功"
+    assert detail.json()["code"] == 404
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "json"),
+    [
+        ("GET", "/api/v1/sys/dicts/999", None),
+        ("GET", "/api/v1/sys/dicts/code/missing", None),
+        ("GET", "/api/v1/sys/dicts/999/data", None),
+        ("PUT", "/api/v1/sys/dicts/999", {"name": "x"}),
+        ("DELETE", "/api/v1/sys/dicts/999", None),
+        (
+            "POST",
+            "/api/v1/sys/dicts/999/data",
+            {"dict_id": 999, "label": "x", "value": "x"},
+        ),
+    ],
+)
+async def test_missing_dict_returns_404(
+    client: AsyncClient, method: str, url: str, json: dict | None
+) -> None:
+    resp = await client.request(method, url, json=json)
+
+    assert resp.json()["code"] == 404
+    assert resp.json()["msg"] == "字典不存在"
@@ -0,0 +1,19 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.base_schema import format_datetime
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (datetime(2026, 10, 19, 6, 3, 8, 999_999, tzinfo=UTC), "2026-10-19 14:03:08"),
+        # naive datetime 按 UTC 处理
+        (datetime(2026, 1, 1, 0, 0, 0), "2026-01-01 08:00:00"),
+        # Asia/Shanghai 1986-1991 实行夏令时 (UTC+9)，不能按当前偏移折算
+        (datetime(1988, 7, 1, 0, 0, 0, tzinfo=UTC), "1988-07-01 09:00:00"),
+    ],
+)
+def test_format_datetime_uses_zone_rules(value: datetime, expected: str) -> None:
+    assert format_datetime(value) == expected
@@ -0,0 +1,167 @@
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.etag import content_etag, etag_matches
+from app.core.resp import MSGPACK_MEDIA_TYPE
+from app.db.versioning import ResourceVersion
+from app.dependencies.etag import ContentETag
+from app.middleware import ETagMiddleware
+from app.system.models import SysRole, SysUser, SysUserRole
+
+MENU_TREE = "/api/v1/sys/menus/tree"
+
+
+async def test_version_etag_not_modified(client: AsyncClient) -> None:
+    resp = await client.get(MENU_TREE)
+
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "no-cache"
+    assert resp.headers["vary"] == "Accept"
+    etag = resp.headers["etag"]
+
+    resp = await client.get(MENU_TREE, headers={"If-None-Match": etag})
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+    assert resp.headers["vary"] == "Accept"
+
+
+async def test_version_etag_changes_with_version(
+    client: AsyncClient, session: AsyncSession
+) -> None:
+    etag = (await client.get(MENU_TREE)).headers["etag"]
+
+    # SQLite 上没有触发器，直接写入版本号模拟菜单表的变更
+    session.add(ResourceVersion(resource="menu", version=1))
+    await session.commit()
+    resp = await client.get(MENU_TREE, headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+async def test_version_etag_per_media_type(client: AsyncClient) -> None:
+    json_etag = (await client.get(MENU_TREE)).headers["etag"]
+
+    resp = await client.get(
+        MENU_TREE, headers={"Accept": MSGPACK_MEDIA_TYPE, "If-None-Match": json_etag}
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith(MSGPACK_MEDIA_TYPE)
+    assert resp.headers["etag"] != json_etag
+    assert resp.headers["vary"] == "Accept"
+
+
+ME = "/api/v1/sys/users/me"
+
+
+async def test_content_etag_not_modified(client: AsyncClient) -> None:
+    resp = await client.get(ME)
+
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "private, no-cache"
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+
+    resp = await client.get(ME, headers={"If-None-Match": f'"other", {etag}'})
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+    assert "content-type" not in resp.headers
+
+
+async def test_content_etag_changes_with_content(
+    client: AsyncClient, session: AsyncSession, admin: SysUser
+) -> None:
+    etag = (await client.get(ME)).headers["etag"]
+
+    role = SysRole(name="运维", code="ops")
+    session.add(role)
+    await session.flush()
+    session.add(SysUserRole(user_id=admin.id, role_id=role.id))
+    await session.commit()
+    resp = await client.get(ME, headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+@pytest.fixture
+async def etag_client() -> AsyncIterator[AsyncClient]:
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware)
+    content_etag = [Depends(ContentETag())]
+
+    @app.get("/plain", dependencies=content_etag)
+    async def plain() -> dict[str, int]:
+        return {"a": 1}
+
+    @app.get("/untracked")
+    async def untracked() -> dict[str, int]:
+        return {"a": 1}
+
+    @app.get("/stream", dependencies=content_etag)
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            yield b"a"
+            yield b"b"
+
+        return StreamingResponse(chunks())
+
+    @app.get("/tagged", dependencies=content_etag)
+    async def tagged() -> PlainTextResponse:
+        return PlainTextResponse("x", headers={"ETag": '"v1"'})
+
+    @app.get("/created", dependencies=content_etag, status_code=201)
+    async def created() -> dict[str, int]:
+        return {"a": 1}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    ("path", "etag"),
+    [("/untracked", None), ("/stream", None), ("/tagged", '"v1"'), ("/created", None)],
+)
+async def test_content_etag_passthrough(
+    etag_client: AsyncClient, path: str, etag: str | None
+) -> None:
+    resp = await etag_client.get(path, headers={"If-None-Match": "*"})
+
+    assert resp.status_code in (200, 201)
+    assert resp.headers.get("etag") == etag
+
+
+async def test_content_etag_only_for_get(etag_client: AsyncClient) -> None:
+    resp = await etag_client.get("/plain")
+    assert resp.headers["etag"] == content_etag(b'{"a":1}')
+    assert resp.headers["cache-control"] == "no-cache"
+
+    resp = await etag_client.head("/plain")
+    assert "etag" not in resp.headers
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        (None, False),
+        ("", False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", W/"abc"', True),
+        ("*", True),
+        ('"abcd"', False),
+    ],
+)
+def test_etag_matches(if_none_match: str | None, expected: bool) -> None:
+    assert etag_matches(if_none_match, 'W/"abc"') is expected
@@ -0,0 +1,138 @@
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import export
+from app.core.exceptions import ValidationException
+from app.core.export import ExportFormat, export_response
+from app.system.models import SysDict, SysDictData
+
+_columns = [
+    sa.Column("id", sa.Integer),
+    sa.Column("name", sa.String),
+    sa.Column("amount", sa.Numeric),
+    sa.Column("day", sa.Date),
+]
+_chunks = [
+    [
+        {"id": 1, "name": "甲", "amount": Decimal("1.50"), "day": date(2024, 1, 2)},
+        {"id": 2, "name": None, "amount": None, "day": None},
+    ],
+    [{"id": 3, "name": "丙", "amount": Decimal("3"), "day": date(2024, 3, 4)}],
+]
+
+
+async def _rows(keys: set[str]) -> AsyncIterator[list[dict[str, Any]]]:
+    for chunk in _chunks:
+        yield [{k: v for k, v in row.items() if k in keys} for row in chunk]
+
+
+async def _body(fmt: ExportFormat, columns: list[sa.Column] = _columns) -> list[bytes]:
+    rows = _rows({c.key for c in columns})
+    response = export_response(rows, columns, fmt, "items")
+    return [part async for part in response.body_iterator]  # type: ignore[misc]
+
+
+async def test_ndjson_encodes_one_part_per_chunk() -> None:
+    parts = await _body(ExportFormat.NDJSON)
+
+    assert len(parts) == 2
+    lines = b"".join(parts).decode().splitlines()
+    assert json.loads(lines[0]) == {
+        "id": 1,
+        "name": "甲",
+        "amount": "1.50",
+        "day": "2024-01-02",
+    }
+    assert len(lines) == 3
+
+
+async def test_csv_writes_bom_and_header_once() -> None:
+    parts = await _body(ExportFormat.CSV)
+
+    assert len(parts) == 2
+    text = b"".join(parts).decode()
+    assert text.splitlines() == [
+        "﻿id,name,amount,day",
+        "1,甲,1.50,2024-01-02",
+        "2,,,",
+        "3,丙,3,2024-03-04",
+    ]
+
+
+@pytest.mark.skipif(export.pa is None, reason="未安装 pyarrow")
+async def test_parquet_writes_typed_row_groups() -> None:
+    columns = [c for c in _columns if c.key != "amount"]
+    parts = await _body(ExportFormat.PARQUET, columns)
+
+    # 每块一个 row group，最后一段为文件尾
+    assert len(parts) == 3
+    table = export.pq.read_table(io.BytesIO(b"".join(parts)))
+    assert table.num_rows == 3
+    assert table.column("id").to_pylist() == [1, 2, 3]
+    assert table.column("name").to_pylist() == ["甲", None, "丙"]
+    assert str(table.schema.field("day").type) == "date32[day]"
+
+
+@pytest.mark.skipif(export.pa is None, reason="未安装 pyarrow")
+def test_arrow_type_follows_column_type() -> None:
+    assert str(export._arrow_type(sa.Column("a", sa.Boolean))) == "bool"
+    assert str(export._arrow_type(sa.Column("a", sa.Float))) == "double"
+    assert str(export._arrow_type(sa.Column("a", sa.DateTime))) == "timestamp[us]"
+    assert (
+        str(export._arrow_type(sa.Column("a", sa.DateTime(timezone=True))))
+        == "timestamp[us, tz=UTC]"
+    )
+    assert str(export._arrow_type(sa.Column("a", sa.JSON))) == "string"
+
+
+def test_parquet_requires_pyarrow(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(export, "pa", None)
+
+    with pytest.raises(ValidationException, match="pyarrow"):
+        export_response(_rows(set()), _columns, ExportFormat.PARQUET, "items")
+
+
+def test_json_default_rejects_unknown_types() -> None:
+    assert export._json_default(datetime(2024, 1, 2, 3, 4)) == "2024-01-02T03:04:00"
+    with pytest.raises(TypeError, match="object"):
+        export._json_default(object())
+
+
+async def test_export_dict_data_endpoint(
+    client: AsyncClient, session: AsyncSession
+) -> None:
+    gender = SysDict(name="性别", code="gender")
+    session.add(gender)
+    await session.flush()
+    session.add_all(
+        [
+            SysDictData(dict_id=gender.id, label="男", value="1"),
+            SysDictData(dict_id=gender.id, label="女", value="2", sort=1),
+        ]
+    )
+    await session.commit()
+
+    response = await client.get(
+        "/api/v1/sys/dicts/data/export",
+        params={"format": "ndjson", "fields": "label,value", "dict_id": gender.id},
+    )
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert (
+        response.headers["content-disposition"]
+        == 'attachment; filename="dict_data.ndjson"'
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(rows, key=lambda r: r["value"]) == [
+        {"label": "男", "value": "1"},
+        {"label": "女", "value": "2"},
+    ]
@@ -0,0 +1,197 @@
+from datetime import date, datetime
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.db.filters import FilterOp, FilterSet, escape_like
+from app.system.crud.crud_role import crud_role
+from app.system.models import SysRole
+
+_metadata = sa.MetaData()
+_events = sa.Table(
+    "events",
+    _metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("active", sa.Boolean, index=True),
+    sa.Column("score", sa.Float, index=True),
+    sa.Column("happened_at", sa.DateTime, index=True),
+    sa.Column("day", sa.Date, index=True),
+    sa.Column("payload", sa.JSON, index=True),
+    sa.Column("note", sa.String),
+)
+
+
+class Event:
+    """不注册到 SQLModel.metadata 的测试表"""
+
+    __table__ = _events
+
+
+def _event_filters() -> FilterSet:
+    fields = ("active", "score", "happened_at", "day", "payload")
+    return FilterSet(
+        Event,  # type: ignore[arg-type]
+        filterable={
+            "id": {FilterOp.EQ, FilterOp.IN, FilterOp.RANGE},
+            **{field: {FilterOp.EQ} for field in fields},
+        },
+        sortable={"id", "note"},
+    )
+
+
+def _sql(criteria: list[Any]) -> str:
+    return " AND ".join(str(c.compile(dialect=postgresql.dialect())) for c in criteria)
+
+
+def _params(criteria: list[Any]) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+    for criterion in criteria:
+        params.update(criterion.compile().params)
+    return params
+
+
+@pytest.mark.parametrize(
+    ("filterable", "message"),
+    [
+        ({"missing": {FilterOp.EQ}}, "events 不存在列 missing"),
+        ({"note": {FilterOp.EQ}}, "events.note 没有索引"),
+        ({"active": {FilterOp.PREFIX}}, "没有前缀匹配索引"),
+    ],
+)
+def test_filter_set_rejects_unindexed_declarations(
+    filterable: dict[str, set[FilterOp]], message: str
+) -> None:
+    with pytest.raises(ValueError, match=message):
+        FilterSet(Event, filterable=filterable)  # type: ignore[arg-type]
+
+
+def test_filter_set_accepts_unique_constraint_columns() -> None:
+    # code 由 uq_sys_roles_code 唯一约束及 pattern_index 支撑
+    FilterSet(SysRole, filterable={"code": {FilterOp.EQ, FilterOp.PREFIX}})
+
+
+def test_parse_filters_builds_bound_criteria() -> None:
+    criteria = crud_role.filter_set.parse_filters(
+        [
+            ("page", "1"),
+            ("_t", "1700000000"),
+            ("code__prefix", "ops_%"),
+            ("id__in", "3,1,,2"),
+        ]
+    )
+
+    sql = _sql(criteria)
+    assert "sys_roles.code LIKE %(code__prefix)s::VARCHAR || '%%' ESCAPE '/'" in sql
+    assert "sys_roles.id = ANY (%(id__in)s::INTEGER[])" in sql
+    assert _params(criteria) == {"code__prefix": "ops/_/%", "id__in": [3, 1, 2]}
+
+
+def test_parse_filters_reuses_template_per_shape() -> None:
+    filter_set = _event_filters()
+
+    first = filter_set.parse_filters([("id", "1"), ("score", "1.5")])
+    second = filter_set.parse_filters([("score", "2"), ("id__eq", "2")])
+
+    assert _sql(first) == _sql(second)
+    assert _params(second) == {"id__eq": 2, "score__eq": 2.0}
+    assert len(filter_set._criteria_cache) == 1
+
+
+@pytest.mark.parametrize(
+    ("raw", "variant", "params"),
+    [
+        ("1,5", "lohi", {"id__range_lo": 1, "id__range_hi": 5}),
+        ("1,", "lo", {"id__range_lo": 1}),
+        (",5", "hi", {"id__range_hi": 5}),
+    ],
+)
+def test_parse_range(raw: str, variant: str, params: dict[str, int]) -> None:
+    criteria = _event_filters().parse_filters([("id__range", raw)])
+
+    assert len(criteria) == len(params)
+    assert _params(criteria) == params
+    if variant == "lohi":
+        assert _sql(criteria) == (
+            "events.id >= %(id__range_lo)s::INTEGER "
+            "AND events.id <= %(id__range_hi)s::INTEGER"
+        )
+
+
+@pytest.mark.parametrize(
+    ("key", "raw", "expected"),
+    [
+        ("active", "true", True),
+        ("active", "0", False),
+        ("happened_at", "2026-10-19T06:00:00", datetime(2026, 10, 19, 6)),
+        ("day", "2026-10-19", date(2026, 10, 19)),
+        ("payload", "{}", "{}"),
+    ],
+)
+def test_coerce_values(key: str, raw: str, expected: Any) -> None:
+    criteria = _event_filters().parse_filters([(key, raw)])
+
+    assert _params(criteria) == {f"{key}__eq": expected}
+
+
+@pytest.mark.parametrize(
+    ("params", "message"),
+    [
+        ([("active", "maybe")], "字段 active 的值无效: maybe"),
+        ([("id", "x")], "字段 id 的值无效: x"),
+        ([("id__in", ",")], "字段 id 的值无效: ,"),
+        ([("id__range", "5")], "字段 id 的范围无效: 5"),
+        ([("id__range", ",")], "字段 id 的范围无效: ,"),
+        ([("id__like", "1")], "不支持的过滤操作: like"),
+        ([("score__in", "1")], "字段 score 不支持 in 过滤"),
+        ([("id", "1"), ("id__eq", "2")], "重复的过滤条件: id__eq"),
+        ([("id__range", "1,"), ("id__range", ",2")], "重复的过滤条件: id__range"),
+    ],
+)
+def test_parse_filters_rejects(params: list[tuple[str, str]], message: str) -> None:
+    with pytest.raises(ValidationException) as info:
+        _event_filters().parse_filters(params)
+    assert info.value.msg == message
+
+
+def test_parse_sort() -> None:
+    filter_set = _event_filters()
+
+    order_by = filter_set.parse_sort("-id, +note,")
+
+    assert [str(o) for o in order_by] == ["events.id DESC", "events.note ASC"]
+    assert filter_set.parse_sort(None) == []
+    with pytest.raises(ValidationException, match="字段 score 不支持排序"):
+        filter_set.parse_sort("score")
+
+
+def test_escape_like() -> None:
+    assert escape_like("a/b%c_d") == "a//b/%c/_d"
+
+
+async def test_list_endpoint_filters_and_sorts(
+    client: AsyncClient, session: AsyncSession
+) -> None:
+    session.add_all(
+        [
+            SysRole(name="运维", code="ops"),
+            SysRole(name="运维组长", code="ops_lead"),
+            SysRole(name="审计", code="audit"),
+        ]
+    )
+    await session.commit()
+
+    resp = await client.get(
+        "/api/v1/sys/roles", params={"code__prefix": "ops", "sort": "-code"}
+    )
+
+    assert resp.status_code == 200
+    items = resp.json()["data"]["items"]
+    assert [item["code"] for item in items] == ["ops_lead", "ops"]
+
+    resp = await client.get("/api/v1/sys/roles", params={"name": "审计"})
+    assert resp.json()["code"] == 400
@@ -0,0 +1,141 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.system.crud.crud_menu import crud_menu
+from app.system.models import SysMenu, SysRole, SysRoleMenu, SysUser, SysUserRole
+
+
+@pytest.fixture
+async def menus(session: AsyncSession) -> dict[str, SysMenu]:
+    """
+    两棵菜单树:
+    system(1) -> user(2), role(1)
+    monitor(0)
+    """
+    system = SysMenu(title="系统", name="System", sort=1)
+    monitor = SysMenu(title="监控", name="Monitor", sort=0)
+    session.add_all([system, monitor])
+    await session.flush()
+    user = SysMenu(title="用户", name="User", parent_id=system.id, sort=2)
+    role = SysMenu(title="角色", name="Role", parent_id=system.id, sort=1)
+    session.add_all([user, role])
+    await session.commit()
+    return {m.name: m for m in (system, monitor, user, role)}
+
+
+def _names(tree: list[dict]) -> list:
+    return [
+        (node["name"], _names(node["children"])) if node["children"] else node["name"]
+        for node in tree
+    ]
+
+
+async def test_create_and_update_menu(client: AsyncClient) -> None:
+    created = await client.post(
+        "/api/v1/sys/menus", json={"title": "系统", "name": "System"}
+    )
+    page = await client.get("/api/v1/sys/menus", params={"fields": "id,name"})
+    menu_id = page.json()["data"]["items"][0]["id"]
+
+    updated = await client.put(f"/api/v1/sys/menus/{menu_id}", json={"icon": "cog"})
+    detail = await client.get(f"/api/v1/sys/menus/{menu_id}")
+
+    assert created.json()["data"] == "菜单创建成功"
+    assert updated.json()["data"]["icon"] == "cog"
+    assert detail.json()["data"]["name"] == "System"
+
+
+async def test_menu_tree_sorted_by_sort(
+    client: AsyncClient, menus: dict[str, SysMenu]
+) -> None:
+    tree = await client.get("/api/v1/sys/menus/tree")
+    subtree = await client.get(
+        "/api/v1/sys/menus/tree", params={"parent_id": menus["System"].id}
+    )
+    mine = await client.get("/api/v1/sys/menus/me")
+
+    assert _names(tree.json()["data"]) == ["Monitor", ("System", ["Role", "User"])]
+    assert _names(subtree.json()["data"]) == ["Role", "User"]
+    # 超级管理员看到全部菜单
+    assert mine.json()["data"] == tree.json()["data"]
+
+
+async def test_menu_tree_by_user_includes_ancestors(
+    session: AsyncSession, menus: dict[str, SysMenu]
+) -> None:
+    user = SysUser(username="bob", email="bob@example.com", hashed_password="x")
+    role = SysRole(name="运维", code="ops")
+    session.add_all([user, role])
+    await session.flush()
+    session.add_all(
+        [
+            SysUserRole(user_id=user.id, role_id=role.id),
+            SysRoleMenu(role_id=role.id, menu_id=menus["User"].id),
+        ]
+    )
+    await session.commit()
+    loaded = (
+        await session.exec(
+            select(SysUser)
+            .where(SysUser.id == user.id)
+            .options(selectinload(SysUser.roles))  # type: ignore[arg-type]
+        )
+    ).one()
+
+    tree = await crud_menu.get_tree_by_user(session, loaded)
+
+    assert [(m.name, [c.name for c in m.children or []]) for m in tree] == [
+        ("System", ["User"])
+    ]
+
+
+async def test_menu_roles(
+    client: AsyncClient, session: AsyncSession, menus: dict[str, SysMenu]
+) -> None:
+    role = SysRole(name="运维", code="ops")
+    session.add(role)
+    await session.flush()
+    session.add(SysRoleMenu(role_id=role.id, menu_id=menus["Role"].id))
+    await session.commit()
+
+    resp = await client.get(f"/api/v1/sys/menus/{menus['Role'].id}/roles")
+
+    assert [r["code"] for r in resp.json()["data"]] == ["ops"]
+
+
+async def test_list_menus_by_parent(
+    client: AsyncClient, menus: dict[str, SysMenu]
+) -> None:
+    resp = await client.get(
+        "/api/v1/sys/menus",
+        params={"parent_id": menus["System"].id, "sort": "sort", "fields": "name"},
+    )
+
+    assert resp.json()["data"]["items"] == [{"name": "Role"}, {"name": "User"}]
+
+
+@pytest.mark.usefixtures("menus")
+async def test_export_menus_csv(client: AsyncClient) -> None:
+    resp = await client.get("/api/v1/sys/menus/export", params={"fields": "name"})
+
+    assert resp.text.splitlines() == ["﻿name", "System", "Monitor", "User", "Role"]
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "json"),
+    [
+        ("GET", "/api/v1/sys/menus/999", None),
+        ("GET", "/api/v1/sys/menus/999/roles", None),
+        ("PUT", "/api/v1/sys/menus/999", {"title": "x"}),
+    ],
+)
+async def test_missing_menu_returns_404(
+    client: AsyncClient, method: str, url: str, json: dict | None
+) -> None:
+    resp = await client.request(method, url, json=json)
+
+    assert resp.json()["code"] == 404
+    assert resp.json()["msg"] == "菜单不存在"
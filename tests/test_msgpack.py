@@ -0,0 +1,216 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from starlette.types import Message
+
+from app.core.exceptions import NotFoundException, business_exception_handler
+from app.core.resp import (
+    MSGPACK_MEDIA_TYPE,
+    FastJSONResponse,
+    MsgPackResponse,
+    PageInfo,
+    Result,
+    accepts_msgpack,
+    msgpack,
+    negotiated_response,
+)
+from app.middleware import MsgPackMiddleware
+from app.middleware.msgpack import _decode_request_body
+
+pytestmark = pytest.mark.skipif(msgpack is None, reason="未安装 msgpack 可选依赖")
+
+JSON = "application/json"
+
+
+class Item(BaseModel):
+    name: str
+    tags: list[str] = []
+
+
+@pytest.fixture
+async def msgpack_client() -> AsyncIterator[AsyncClient]:
+    app = FastAPI()
+    app.add_middleware(MsgPackMiddleware)
+    app.add_exception_handler(NotFoundException, business_exception_handler)
+
+    @app.post("/items")
+    async def create(item: Item) -> Result[Item]:
+        return Result.success(item)
+
+    @app.get("/missing")
+    async def missing() -> None:
+        raise NotFoundException("不存在")
+
+    @app.get("/text")
+    async def text() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[bytes]:
+            yield b"["
+            yield b"1]"
+
+        return StreamingResponse(chunks(), media_type=JSON)
+
+    @app.get("/empty")
+    async def empty() -> Response:
+        return Response(status_code=204, media_type=JSON)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (MSGPACK_MEDIA_TYPE, True),
+        ("application/x-msgpack", True),
+        (f"{JSON}, {MSGPACK_MEDIA_TYPE}", True),
+        (f"{JSON}, {MSGPACK_MEDIA_TYPE};q=0.9", False),
+        (f"*/*;q=0.5, {MSGPACK_MEDIA_TYPE};q=0.8", True),
+        (f"{MSGPACK_MEDIA_TYPE};q=bad", False),
+        (JSON, False),
+        (None, False),
+    ],
+)
+def test_accepts_msgpack(accept: str | None, expected: bool) -> None:
+    assert accepts_msgpack(accept) is expected
+
+
+def _request(accept: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept", accept.encode())]})
+
+
+def test_negotiated_response() -> None:
+    content = Result.success({"at": datetime(2026, 1, 1, tzinfo=UTC)})
+
+    packed = negotiated_response(_request(MSGPACK_MEDIA_TYPE), content, 201)
+    plain = negotiated_response(_request(JSON), content)
+
+    assert isinstance(packed, MsgPackResponse)
+    assert packed.status_code == 201
+    assert msgpack.unpackb(packed.body)["data"] == {"at": "2026-01-01T00:00:00Z"}
+    assert isinstance(plain, FastJSONResponse)
+    assert (
+        plain.body == b'{"code":0,"msg":"success","data":{"at":"2026-01-01T00:00:00Z"}}'
+    )
+
+
+def test_fast_json_response_serializes_unknown() -> None:
+    resp = FastJSONResponse({"error": ValueError("bad")})
+
+    assert resp.body == b'{"error":"bad"}'
+
+
+def test_result_helpers() -> None:
+    page = Result.success_page(items=[1, 2, 3], total=21, page=2, size=10)
+
+    assert page.is_success
+    assert page.data is not None
+    assert page.data.pages == 3
+    assert not Result.error(code=404, msg="不存在").is_success
+    assert Result.success_page(items=[], total=0, size=0).data.pages == 0  # type: ignore[union-attr]
+    assert isinstance(page.data, PageInfo)
+
+
+async def test_msgpack_request_and_response(msgpack_client: AsyncClient) -> None:
+    body = msgpack.packb({"name": "扳手", "tags": ["工具"]})
+
+    resp = await msgpack_client.post(
+        "/items",
+        content=body,
+        headers={"Content-Type": MSGPACK_MEDIA_TYPE, "Accept": MSGPACK_MEDIA_TYPE},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert resp.headers["vary"] == "Accept"
+    assert int(resp.headers["content-length"]) == len(resp.content)
+    assert msgpack.unpackb(resp.content) == {
+        "code": 0,
+        "msg": "success",
+        "data": {"name": "扳手", "tags": ["工具"]},
+    }
+
+
+async def test_msgpack_request_json_response(msgpack_client: AsyncClient) -> None:
+    resp = await msgpack_client.post(
+        "/items",
+        content=msgpack.packb({"name": "扳手"}),
+        headers={"Content-Type": f"{MSGPACK_MEDIA_TYPE}; charset=binary"},
+    )
+
+    assert resp.headers["content-type"] == JSON
+    assert resp.headers["vary"] == "Accept"
+    assert resp.json()["data"] == {"name": "扳手", "tags": []}
+
+
+async def test_invalid_msgpack_body(msgpack_client: AsyncClient) -> None:
+    resp = await msgpack_client.post(
+        "/items", content=b"\xc1", headers={"Content-Type": MSGPACK_MEDIA_TYPE}
+    )
+
+    # 无法解码的请求体原样交给 FastAPI，按请求体解析错误处理
+    assert resp.status_code == 400
+
+
+async def test_exception_handler_negotiates(msgpack_client: AsyncClient) -> None:
+    resp = await msgpack_client.get("/missing", headers={"Accept": MSGPACK_MEDIA_TYPE})
+
+    assert resp.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert resp.headers["vary"] == "Accept"
+    assert msgpack.unpackb(resp.content)["msg"] == "不存在"
+
+
+@pytest.mark.parametrize("path", ["/text", "/stream"])
+async def test_passthrough_responses(msgpack_client: AsyncClient, path: str) -> None:
+    resp = await msgpack_client.get(path, headers={"Accept": MSGPACK_MEDIA_TYPE})
+
+    assert not resp.headers["content-type"].startswith(MSGPACK_MEDIA_TYPE)
+    assert resp.content in (b"ok", b"[1]")
+
+
+async def test_empty_json_body(msgpack_client: AsyncClient) -> None:
+    resp = await msgpack_client.get("/empty", headers={"Accept": MSGPACK_MEDIA_TYPE})
+
+    assert resp.status_code == 204
+    assert resp.content == b""
+    assert resp.headers["content-type"] == MSGPACK_MEDIA_TYPE
+
+
+async def test_request_disconnect_is_replayed() -> None:
+    messages: list[Message] = [{"type": "http.disconnect"}]
+
+    async def receive() -> Message:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    scope: dict[str, Any] = {"type": "http", "headers": []}
+    _, replay = await _decode_request_body(scope, receive)
+
+    assert await replay() == {"type": "http.disconnect"}
+    assert await replay() == {"type": "http.disconnect"}
+
+
+async def test_chunked_msgpack_body() -> None:
+    body = msgpack.packb({"name": "扳手"})
+    messages: list[Message] = [
+        {"type": "http.request", "body": body[:3], "more_body": True},
+        {"type": "http.request", "body": body[3:], "more_body": False},
+    ]
+
+    async def receive() -> Message:
+        return messages.pop(0)
+
+    scope: dict[str, Any] = {"type": "http", "headers": []}
+    scope, replay = await _decode_request_body(scope, receive)
+
+    assert (await replay())["body"] == '{"name":"扳手"}'.encode()
+    assert dict(scope["headers"])[b"content-type"] == b"application/json"
@@ -0,0 +1,194 @@
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.db.pool import (
+    WAIT_BUCKETS,
+    Histogram,
+    InstrumentedQueuePool,
+    PoolAutoSizer,
+    pool_stats,
+)
+
+
+@pytest.fixture
+async def pooled(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    """带监控连接池的 SQLite 文件库引擎 (1 个常驻连接 + 1 个溢出连接)"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    await engine.dispose()
+
+
+def _pool(engine: AsyncEngine) -> InstrumentedQueuePool:
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, InstrumentedQueuePool)
+    return pool
+
+
+def test_histogram_quantile_and_snapshot() -> None:
+    histogram = Histogram((0.1, 1.0))
+    assert histogram.quantile(0.95) == 0.0
+
+    for value in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(1.0) == float("inf")
+    assert histogram.snapshot() == {
+        "buckets": {"0.1": 2, "1.0": 3, "+Inf": 4},
+        "sum": 5.6,
+        "count": 4,
+    }
+
+
+def test_histogram_quantile_since_snapshot() -> None:
+    histogram = Histogram((0.1, 1.0))
+    histogram.observe(5.0)
+    since = list(histogram.counts)
+    histogram.observe(0.05)
+
+    assert histogram.quantile(0.95, since) == 0.1
+
+
+async def test_pool_records_checkouts_and_overflow(pooled: AsyncEngine) -> None:
+    async with pooled.connect() as first, pooled.connect() as second:
+        await first.execute(text("SELECT 1"))
+        await second.execute(text("SELECT 1"))
+
+    stats = pool_stats(pooled)
+    assert stats["checkouts"] == 2
+    assert stats["overflow_checkouts"] == 1
+    assert stats["timeouts"] == 0
+    assert stats["checked_out"] == 0
+    assert stats["checkout_wait_seconds"]["count"] == 2
+    assert stats["connection_age_seconds"]["count"] == 2
+    assert _pool(pooled).metrics.peak_checked_out == 2
+
+
+async def test_pool_counts_timeouts(pooled: AsyncEngine) -> None:
+    async with pooled.connect(), pooled.connect():
+        with pytest.raises(sa_exc.TimeoutError):
+            async with pooled.connect():
+                pass
+
+    assert pool_stats(pooled)["timeouts"] == 1
+
+
+async def test_pool_keeps_metrics_across_recreate(pooled: AsyncEngine) -> None:
+    async with pooled.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    metrics = _pool(pooled).metrics
+
+    await pooled.dispose()
+    async with pooled.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    pool = _pool(pooled)
+    assert pool.metrics is metrics
+    assert metrics.checkouts == 2
+    # 重建后不重复注册 checkout 事件
+    assert metrics.connection_age.count == 2
+
+
+async def test_pool_stats_without_instrumentation(engine: AsyncEngine) -> None:
+    assert set(pool_stats(engine)) == {"status"}
+
+
+def _sizer(engine: AsyncEngine, max_size: int = 5) -> PoolAutoSizer:
+    return PoolAutoSizer(engine, max_size=max_size, target_wait=0.01, interval=0.01)
+
+
+def test_autosizer_grows_on_slow_checkouts(pooled: AsyncEngine) -> None:
+    pool = _pool(pooled)
+    for _ in range(10):
+        pool.metrics.checkout_wait.observe(0.5)
+    sizer = _sizer(pooled)
+
+    sizer.adjust()
+    assert pool.max_overflow == 2  # 容量 2 -> 3
+
+    # 新窗口内没有观测值，p95 为 0 且峰值为 0，每次收缩 1 个连接
+    sizer.adjust()
+    assert pool.max_overflow == 1
+
+
+def test_autosizer_grows_on_timeouts_up_to_max(pooled: AsyncEngine) -> None:
+    pool = _pool(pooled)
+    pool.metrics.timeouts = 1
+    sizer = _sizer(pooled, max_size=2)
+
+    sizer.adjust()
+
+    assert pool.max_overflow == 1  # 已达 max_size，保持不变
+
+
+def test_autosizer_never_shrinks_below_pool_size(pooled: AsyncEngine) -> None:
+    pool = _pool(pooled)
+    pool.set_max_overflow(0)
+
+    _sizer(pooled).adjust()
+
+    assert pool.max_overflow == 0
+
+
+def test_autosizer_holds_within_target(pooled: AsyncEngine) -> None:
+    pool = _pool(pooled)
+    pool.metrics.checkout_wait.observe(WAIT_BUCKETS[1])  # p95 = 5ms，在目标附近
+
+    _sizer(pooled).adjust()
+
+    assert pool.max_overflow == 1
+
+
+async def test_autosizer_background_task(
+    pooled: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sizer = _sizer(pooled)
+    adjusted = asyncio.Event()
+    monkeypatch.setattr(sizer, "adjust", adjusted.set)
+
+    sizer.start()
+    await asyncio.wait_for(adjusted.wait(), timeout=1)
+    await sizer.stop()
+    await sizer.stop()
+
+    assert sizer._task is None
+
+
+async def test_autosizer_skips_plain_pool(engine: AsyncEngine) -> None:
+    sizer = _sizer(engine)
+    sizer.start()
+
+    assert sizer._task is None
+    await sizer.stop()
+
+
+async def test_autosizer_survives_adjust_errors(
+    pooled: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sizer = _sizer(pooled)
+    calls = 0
+
+    def fail() -> None:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(sizer, "adjust", fail)
+    sizer.start()
+    await asyncio.sleep(0.05)
+    await sizer.stop()
+
+    assert calls > 1
@@ -0,0 +1,72 @@
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.system.models import SysMenu, SysRole, SysRoleMenu
+
+
+@pytest.fixture
+async def ops(session: AsyncSession) -> SysRole:
+    """拥有一个菜单的运维角色"""
+    role = SysRole(name="运维", code="ops")
+    menu = SysMenu(title="系统", name="System")
+    session.add_all([role, menu])
+    await session.flush()
+    session.add(SysRoleMenu(role_id=role.id, menu_id=menu.id))
+    await session.commit()
+    return role
+
+
+async def test_create_and_update_role(client: AsyncClient) -> None:
+    created = await client.post(
+        "/api/v1/sys/roles/", json={"name": "审计", "code": "audit"}
+    )
+    role_id = created.json()["data"]["id"]
+
+    updated = await client.put(
+        f"/api/v1/sys/roles/{role_id}", json={"description": "只读"}
+    )
+    detail = await client.get(f"/api/v1/sys/roles/{role_id}")
+
+    assert created.json()["data"]["code"] == "audit"
+    assert updated.json()["data"]["description"] == "只读"
+    assert detail.json()["data"]["name"] == "审计"
+
+
+@pytest.mark.usefixtures("ops")
+async def test_list_roles_with_sparse_fields(client: AsyncClient) -> None:
+    resp = await client.get("/api/v1/sys/roles", params={"fields": "name,code"})
+
+    assert resp.json()["data"]["items"] == [{"name": "运维", "code": "ops"}]
+
+
+@pytest.mark.usefixtures("ops")
+async def test_export_roles_csv(client: AsyncClient) -> None:
+    resp = await client.get("/api/v1/sys/roles/export", params={"fields": "code"})
+
+    assert resp.headers["content-disposition"] == 'attachment; filename="roles.csv"'
+    assert resp.text.splitlines() == ["﻿code", "ops"]
+
+
+async def test_get_role_menus(client: AsyncClient, ops: SysRole) -> None:
+    resp = await client.get(f"/api/v1/sys/roles/{ops.id}/menus")
+
+    assert [m["name"] for m in resp.json()["data"]] == ["System"]
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "json"),
+    [
+        ("GET", "/api/v1/sys/roles/999", None),
+        ("PUT", "/api/v1/sys/roles/999", {"name": "x"}),
+        ("GET", "/api/v1/sys/roles/999/menus", None),
+        ("PUT", "/api/v1/sys/roles/999/menus", [1]),
+    ],
+)
+async def test_missing_role_returns_404(
+    client: AsyncClient, method: str, url: str, json: object
+) -> None:
+    resp = await client.request(method, url, json=json)
+
+    assert resp.json()["code"] == 404
+    assert resp.json()["msg"] == "角色不存在"
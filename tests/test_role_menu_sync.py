@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.exceptions import ValidationException
+from app.system.crud.crud_role_menu import crud_role_menu
+from tests.conftest import FakeResult, RecordingSession
+
+
+def _params(session: RecordingSession) -> dict:
+    return session.statements[-1].compile().params
+
+
+async def test_assign_menus_single_statement(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult([([3, 4], 1, 2)]))
+
+    counts = await crud_role_menu.assign_menu_to_role(recording_session, 5, [4, 3])  # type: ignore[arg-type]
+
+    assert counts == (1, 2)
+    sql = recording_session.sql()
+    assert "FROM unnest(%(menu_ids)s::INTEGER[]) AS wanted(id)" in sql
+    assert "INSERT INTO sys_role_menus (role_id, menu_id) SELECT" in sql
+    assert "FROM valid ON CONFLICT DO NOTHING" in sql
+    assert "sys_role_menus.menu_id != ALL (%(menu_ids)s::INTEGER[])" in sql
+    assert _params(recording_session)["menu_ids"] == [3, 4]
+    assert recording_session.committed
+
+
+async def test_assign_menus_rolls_back_on_missing_menus(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult([(None, 0, 0)]))
+
+    with pytest.raises(ValidationException, match=r"菜单不存在: \[3\]"):
+        await crud_role_menu.assign_menu_to_role(recording_session, 5, [3])  # type: ignore[arg-type]
+    assert recording_session.rolled_back
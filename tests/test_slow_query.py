@@ -0,0 +1,210 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.context import current_route, request_scope, route_template
+from app.db import slow_query
+from app.db.slow_query import (
+    _explain,
+    _should_explain,
+    instrument_engine,
+    normalize_sql,
+    param_shape,
+)
+
+
+@pytest.fixture
+def slow_engine(
+    engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[AsyncEngine]:
+    """所有语句都视为慢查询的测试引擎"""
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 0.0)
+    instrument_engine(engine)
+    yield engine
+    for name, fn in (
+        ("before_cursor_execute", slow_query._before_cursor_execute),
+        ("after_cursor_execute", slow_query._after_cursor_execute),
+    ):
+        event.remove(engine.sync_engine, name, fn)
+
+
+def test_normalize_sql() -> None:
+    assert normalize_sql("  SELECT *\n\tFROM  t ") == "SELECT * FROM t"
+
+
+@pytest.mark.parametrize(
+    ("parameters", "executemany", "expected"),
+    [
+        ({"id": 1, "ids": [1, 2, 3]}, False, "(int, list[3])"),
+        (("x", None), False, "(str, NoneType)"),
+        ([{"a": 1}, {"a": 2}], True, "2 x (int)"),
+        ([], True, "0 x ()"),
+        (None, False, "NoneType"),
+    ],
+)
+def test_param_shape_hides_values(
+    parameters: Any, executemany: bool, expected: str
+) -> None:
+    assert param_shape(parameters, executemany) == expected
+
+
+class _Context:
+    def __init__(self, **options: Any) -> None:
+        self.execution_options = options
+
+
+@pytest.mark.parametrize(
+    ("statement", "context", "executemany", "expected"),
+    [
+        ("SELECT 1", None, False, True),
+        ("  with x as (select 1) select * from x", None, False, True),
+        ("WITH d AS (DELETE FROM t RETURNING id) SELECT * FROM d", None, False, False),
+        ("UPDATE t SET a = 1", None, False, False),
+        ("SELECT 1", None, True, False),
+        ("SELECT 1", _Context(stream_results=True), False, False),
+    ],
+)
+def test_should_explain_read_only(
+    statement: str,
+    context: Any,
+    executemany: bool,
+    expected: bool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 1.0)
+    assert _should_explain(statement, context, executemany) is expected
+
+
+def test_should_explain_sampling(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 0.0)
+    assert not _should_explain("SELECT 1", None, False)
+
+
+class _Cursor:
+    def __init__(self, fail: bool = False) -> None:
+        self.sql: list[str] = []
+        self.fail = fail
+        self.closed = False
+
+    def execute(self, sql: str, _parameters: Any = None) -> None:
+        self.sql.append(sql)
+        if self.fail and sql.startswith("EXPLAIN"):
+            raise RuntimeError("canceling statement due to statement timeout")
+
+    def fetchall(self) -> list[tuple[str]]:
+        return [("Seq Scan on t",), ("Execution Time: 1.0 ms",)]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Conn:
+    def __init__(self, cursor: _Cursor) -> None:
+        self.connection = self
+        self._cursor = cursor
+
+    def cursor(self) -> _Cursor:
+        return self._cursor
+
+
+def test_explain_runs_in_savepoint() -> None:
+    cursor = _Cursor()
+
+    plan = _explain(_Conn(cursor), "SELECT * FROM t", ())
+
+    assert plan == "Seq Scan on t\nExecution Time: 1.0 ms"
+    assert cursor.sql == [
+        "SAVEPOINT slow_query_explain",
+        "EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM t",
+        "ROLLBACK TO SAVEPOINT slow_query_explain",
+        "RELEASE SAVEPOINT slow_query_explain",
+    ]
+    assert cursor.closed
+
+
+def test_explain_failure_rolls_back_savepoint() -> None:
+    cursor = _Cursor(fail=True)
+
+    with pytest.raises(RuntimeError):
+        _explain(_Conn(cursor), "SELECT * FROM t", ())
+
+    assert cursor.sql[-2:] == [
+        "ROLLBACK TO SAVEPOINT slow_query_explain",
+        "RELEASE SAVEPOINT slow_query_explain",
+    ]
+    assert cursor.closed
+
+
+async def test_slow_query_logged_with_route(
+    slow_engine: AsyncEngine, log_messages: list[str]
+) -> None:
+    token = request_scope.set(
+        {"method": "GET", "path": "/api/v1/sys/users/7", "path_params": {"user_id": 7}}
+    )
+    try:
+        async with slow_engine.connect() as conn:
+            await conn.execute(text("SELECT  :a"), {"a": 1})
+    finally:
+        request_scope.reset(token)
+
+    (message,) = [m for m in log_messages if m.startswith("慢查询")]
+    assert "GET /api/v1/sys/users/{user_id}" in message
+    assert "params=(int)" in message
+    assert message.endswith("SELECT ?")
+
+
+async def test_fast_query_not_logged(
+    slow_engine: AsyncEngine,
+    log_messages: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 60_000)
+
+    async with slow_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert not any(m.startswith("慢查询") for m in log_messages)
+
+
+async def test_explain_failure_is_logged(
+    slow_engine: AsyncEngine,
+    log_messages: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # SQLite 不支持 EXPLAIN (ANALYZE, BUFFERS)，抽样执行失败只记录日志
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 1.0)
+
+    async with slow_engine.connect() as conn:
+        result = await conn.execute(text("SELECT 1"))
+        assert result.scalar() == 1
+
+    assert any(m.startswith("EXPLAIN 失败") for m in log_messages)
+
+
+async def test_explain_plan_is_logged(
+    slow_engine: AsyncEngine,
+    log_messages: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_RATE", 1.0)
+    monkeypatch.setattr(slow_query, "_explain", lambda *_args: "Result")
+
+    async with slow_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert any(m.startswith("EXPLAIN | - | SELECT 1\nResult") for m in log_messages)
+
+
+def test_route_template_without_params() -> None:
+    assert (
+        route_template({"path": "/api/v1/sys/menus/tree"}) == "/api/v1/sys/menus/tree"
+    )
+
+
+def test_current_route_outside_request() -> None:
+    assert current_route() == "-"
@@ -0,0 +1,83 @@
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db import query_stats
+from app.db.query_stats import instrument_engine, track_queries
+from app.middleware import SQLStatsMiddleware
+
+
+@pytest.fixture
+def tracked_engine(engine: AsyncEngine) -> Iterator[AsyncEngine]:
+    instrument_engine(engine)
+    yield engine
+    for name, fn in (
+        ("before_cursor_execute", query_stats._before_cursor_execute),
+        ("after_cursor_execute", query_stats._after_cursor_execute),
+    ):
+        event.remove(engine.sync_engine, name, fn)
+
+
+async def test_track_queries_counts_statements(tracked_engine: AsyncEngine) -> None:
+    async with tracked_engine.connect() as conn:
+        # 统计范围外的语句不计入
+        await conn.execute(text("SELECT 0"))
+        with track_queries() as stats:
+            for i in range(3):
+                await conn.execute(text("SELECT :i"), {"i": i})
+            await conn.execute(text("SELECT 1 + 1"))
+
+    assert stats.count == 4
+    assert stats.duration > 0
+    assert stats.repeated(3) == [("SELECT ?", 3)]
+    assert stats.repeated(4) == []
+
+
+@pytest.fixture
+def stats_client(tracked_engine: AsyncEngine) -> AsyncClient:
+    app = FastAPI()
+    app.add_middleware(SQLStatsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int) -> dict[str, int]:
+        async with tracked_engine.connect() as conn:
+            for _ in range(item_id):
+                await conn.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_sql_stats_headers(stats_client: AsyncClient) -> None:
+    async with stats_client as client:
+        resp = await client.get("/items/2")
+
+    assert resp.status_code == 200
+    assert resp.headers["X-DB-Query-Count"] == "2"
+    assert float(resp.headers["X-DB-Query-Time"]) >= 0
+
+
+async def test_sql_stats_warns_over_budget_and_n_plus_one(
+    stats_client: AsyncClient,
+    log_messages: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET", 30)
+    monkeypatch.setattr(settings, "SQL_ROUTE_BUDGETS", {"/items/{item_id}": 2})
+    monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+
+    async with stats_client as client:
+        await client.get("/items/2")
+        assert log_messages == []
+        await client.get("/items/3")
+
+    budget, n_plus_one = log_messages
+    assert budget.startswith(
+        "SQL 语句数超出预算 | GET /items/{item_id} | count=3 budget=2"
+    )
+    assert n_plus_one == "疑似 N+1 查询 | GET /items/{item_id} | 重复 3 次: SELECT 1"
@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.exceptions import TimeoutException
+from app.dependencies import database
+from app.dependencies.database import (
+    QUERY_CANCELED,
+    _statement_timeout_hook,
+    get_session,
+)
+from app.dependencies.deadline import Deadline, request_deadline
+from app.middleware import RequestContextMiddleware
+
+
+def _request() -> Request:
+    return Request({"type": "http", "method": "GET", "headers": []})
+
+
+class _Connection:
+    def __init__(self) -> None:
+        self.sql: list[str] = []
+
+    def exec_driver_sql(self, sql: str) -> None:
+        self.sql.append(sql)
+
+
+def test_statement_timeout_uses_remaining_time() -> None:
+    request = _request()
+    request.state.deadline = time.monotonic() + 2
+    connection = _Connection()
+
+    _statement_timeout_hook(request)(None, None, connection)
+
+    (sql,) = connection.sql
+    prefix = "SET LOCAL statement_timeout = "
+    assert sql.startswith(prefix)
+    assert 1000 < int(sql.removeprefix(prefix)) <= 2000
+
+
+def test_statement_timeout_expired_deadline() -> None:
+    request = _request()
+    request.state.deadline = time.monotonic() - 1
+    connection = _Connection()
+
+    with pytest.raises(TimeoutException):
+        _statement_timeout_hook(request)(None, None, connection)
+    assert connection.sql == []
+
+
+def test_statement_timeout_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(database, "request_deadline", lambda _request: None)
+    connection = _Connection()
+
+    _statement_timeout_hook(_request())(None, None, connection)
+
+    assert connection.sql == []
+
+
+async def test_deadline_counts_from_request_arrival() -> None:
+    """计时起点是中间件记录的到达时间，而非依赖执行时刻"""
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+    seen: dict[str, float] = {}
+
+    async def slow_dependency() -> None:
+        await asyncio.sleep(0.05)
+
+    @app.get(
+        "/slow",
+        dependencies=[Depends(slow_dependency), Depends(Deadline(1_000))],
+    )
+    async def slow(request: Request) -> None:
+        seen["started_at"] = request.state.started_at
+        seen["deadline"] = request.state.deadline
+
+    before = time.monotonic()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/slow")
+
+    assert resp.status_code == 200
+    assert before <= seen["started_at"] < before + 0.05
+    assert seen["deadline"] == pytest.approx(seen["started_at"] + 1)
+
+
+def test_default_deadline_uses_arrival_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "REQUEST_DEADLINE_MS", 2_000)
+    request = _request()
+    request.state.started_at = 100.0
+
+    assert request_deadline(request) == 102.0
+
+
+class _PgError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def _db_error(sqlstate: str) -> DBAPIError:
+    return DBAPIError("SELECT 1", None, _PgError(sqlstate))
+
+
+async def _raise_in_session(exc: Exception) -> None:
+    sessions = get_session(_request())
+    await anext(sessions)
+    await sessions.athrow(exc)
+
+
+async def test_query_canceled_maps_to_timeout() -> None:
+    with pytest.raises(TimeoutException) as info:
+        await _raise_in_session(_db_error(QUERY_CANCELED))
+    assert isinstance(info.value.__cause__, DBAPIError)
+
+
+async def test_other_database_errors_propagate() -> None:
+    with pytest.raises(DBAPIError):
+        await _raise_in_session(_db_error("23505"))
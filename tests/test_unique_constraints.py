@@ -0,0 +1,18 @@
+import pytest
+import sqlalchemy as sa
+
+from app.db.crud_base import CRUDBase
+from app.system.crud.crud_dict import crud_dict
+from app.system.crud.crud_role import crud_role
+from app.system.crud.crud_user import crud_user
+
+
+@pytest.mark.parametrize("crud", [crud_role, crud_dict, crud_user])
+def test_unique_messages_match_declared_names(crud: CRUDBase) -> None:
+    """unique_messages 的键必须是模型中显式声明的唯一约束 / 唯一索引名"""
+    table = crud.model.__table__
+    names = {
+        c.name for c in table.constraints if isinstance(c, sa.UniqueConstraint)
+    } | {i.name for i in table.indexes if i.unique}
+
+    assert set(crud.unique_messages) <= names
@@ -0,0 +1,87 @@
+import pytest
+from pydantic import ValidationError
+
+from app.system.crud.crud_user import crud_user
+from app.system.schemas.user import SysUserCreate, UserBulkCreate
+from app.system.services.user_service import sys_user_service
+from tests.conftest import FakeResult, RecordingSession
+
+
+def _user(username: str, role_ids: list[int] | None = None) -> SysUserCreate:
+    return SysUserCreate(
+        username=username,
+        email=f"{username}@example.com",
+        password="x",
+        role_ids=role_ids,
+    )
+
+
+async def test_bulk_provision_skips_conflicting_rows(
+    recording_session: RecordingSession,
+) -> None:
+    objs_in = [_user("alice", [1, 1]), _user("bob", [2])]
+    # bob 被并发请求抢先创建，ON CONFLICT DO NOTHING 不返回该行
+    recording_session.results.append(FakeResult([(10, "alice")]))
+
+    created = await crud_user.bulk_provision(
+        recording_session,  # type: ignore[arg-type]
+        objs_in=objs_in,
+        hashed_passwords=["h1", "h2"],
+    )
+
+    assert created == {"alice": 10}
+    assert recording_session.sql(0).endswith(
+        "ON CONFLICT DO NOTHING RETURNING sys_users.id, sys_users.username"
+    )
+    assert recording_session.params[0][0]["hashed_password"] == "h1"
+    assert "password" not in recording_session.params[0][0]
+    assert recording_session.sql(1).endswith("ON CONFLICT DO NOTHING")
+    assert recording_session.params[1] == [{"user_id": 10, "role_id": 1}]
+    assert recording_session.committed
+
+
+async def test_bulk_create_users_reports_rows(
+    recording_session: RecordingSession,
+) -> None:
+    rows = [
+        _user("alice", [1]),
+        {"username": "bad", "email": "not-an-email", "password": "x"},
+        {"username": "alice", "email": "alice2@example.com", "password": "x"},
+        _user("bob", [99]),
+        _user("carol"),
+    ]
+    recording_session.results += [
+        FakeResult([("carol", "carol@example.com")]),  # find_taken
+        FakeResult([1]),  # get_existing_ids
+        FakeResult([(10, "alice")]),  # INSERT ... RETURNING
+    ]
+
+    result = await sys_user_service.bulk_create_users(
+        recording_session,  # type: ignore[arg-type]
+        rows,
+    )
+
+    assert result.created == 1
+    assert result.ids == {"alice": 10}
+    assert [(e.index, e.username) for e in result.errors] == [
+        (1, "bad"),
+        (2, "alice"),
+        (3, "bob"),
+        (4, "carol"),
+    ]
+    assert result.errors[0].msg.startswith("email:")
+    assert result.errors[2].msg == "角色不存在: [99]"
+    assert recording_session.params[2][0]["hashed_password"] == "hashed:x"
+
+
+def test_bulk_request_validates_rows() -> None:
+    body = UserBulkCreate.model_validate(
+        {"users": [{"username": "alice", "email": "a@example.com", "password": "x"}]}
+    )
+    assert isinstance(body.users[0], SysUserCreate)
+
+    with pytest.raises(ValidationError) as info:
+        UserBulkCreate.model_validate(
+            {"users": [{"username": "bad", "email": "x", "password": "x"}]}
+        )
+    assert info.value.errors()[0]["loc"] == ("users", 0, "email")
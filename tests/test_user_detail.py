@@ -0,0 +1,46 @@
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.system.models import SysRole, SysUser, SysUserRole
+
+
+@pytest.fixture
+async def roles(session: AsyncSession, admin: SysUser) -> list[int]:
+    """为 admin 关联两个角色，返回角色 ID"""
+    objs = [SysRole(name="运维", code="ops"), SysRole(name="审计", code="audit")]
+    session.add_all(objs)
+    await session.flush()
+    session.add_all(SysUserRole(user_id=admin.id, role_id=r.id) for r in objs)
+    await session.commit()
+    return sorted(r.id for r in objs)
+
+
+async def test_user_detail_includes_role_ids(
+    client: AsyncClient, admin: SysUser, roles: list[int]
+) -> None:
+    resp = await client.get(f"/api/v1/sys/users/{admin.id}")
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["role_ids"] == roles
+
+
+async def test_current_user_includes_role_ids(
+    client: AsyncClient, roles: list[int]
+) -> None:
+    resp = await client.get("/api/v1/sys/users/me")
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["role_ids"] == roles
+
+
+async def test_create_user_without_roles_returns_empty_role_ids(
+    client: AsyncClient,
+) -> None:
+    resp = await client.post(
+        "/api/v1/sys/users",
+        json={"username": "alice", "email": "alice@example.com", "password": "x"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["role_ids"] == []
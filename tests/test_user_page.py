@@ -0,0 +1,36 @@
+import pytest
+import sqlalchemy as sa
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.system.crud.crud_user import crud_user
+from app.system.models import SysRole, SysUser, SysUserRole
+
+
+async def test_get_page_projects_pk_when_only_extra_columns(
+    session: AsyncSession, admin: SysUser
+) -> None:
+    rows, total = await crud_user.get_page(
+        session, fields=[], extra_columns=[sa.literal(1).label("one")]
+    )
+
+    assert total == 1
+    assert rows == [{"id": admin.id, "one": 1}]
+
+
+@pytest.mark.usefixtures("sqlite_role_ids")
+async def test_user_list_with_only_role_ids(
+    client: AsyncClient, session: AsyncSession, admin: SysUser
+) -> None:
+    role = SysRole(name="运维", code="ops")
+    session.add(role)
+    await session.flush()
+    session.add(SysUserRole(user_id=admin.id, role_id=role.id))
+    await session.commit()
+
+    resp = await client.get("/api/v1/sys/users", params={"fields": "role_ids"})
+
+    assert resp.status_code == 200
+    page = resp.json()["data"]
+    assert page["total"] == 1
+    assert page["items"] == [{"role_ids": [role.id]}]
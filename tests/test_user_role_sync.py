@@ -0,0 +1,76 @@
+import pytest
+
+from app.core.exceptions import ValidationException
+from app.system.crud.crud_user_role import crud_user_role
+from tests.conftest import FakeResult, RecordingSession
+
+
+def _params(session: RecordingSession) -> dict:
+    return session.statements[-1].compile().params
+
+
+async def test_sync_user_roles_single_statement(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult([([1, 2], 1, 3)]))
+
+    counts = await crud_user_role.sync_user_roles(recording_session, 7, [2, 1, 2])  # type: ignore[arg-type]
+
+    assert counts == (1, 3)
+    assert len(recording_session.statements) == 1
+    sql = recording_session.sql()
+    assert "FROM unnest(%(role_ids)s::INTEGER[]) AS wanted_role_ids(id)" in sql
+    assert "INSERT INTO sys_user_roles (user_id, role_id) SELECT" in sql
+    assert "FROM valid_role_ids ON CONFLICT DO NOTHING" in sql
+    assert "sys_user_roles.role_id != ALL (%(role_ids)s::INTEGER[])" in sql
+    assert _params(recording_session)["role_ids"] == [1, 2]
+    # 由调用方 (create / update) 提交
+    assert not recording_session.committed
+
+
+async def test_sync_user_roles_rejects_missing_roles(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult([([1], 0, 0)]))
+
+    with pytest.raises(ValidationException, match=r"角色不存在: \[9\]"):
+        await crud_user_role.sync_user_roles(recording_session, 7, [1, 9])  # type: ignore[arg-type]
+
+
+async def test_assign_roles_single_statement(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult([([7, 8], [1], 2, 1)]))
+
+    counts = await crud_user_role.assign(
+        recording_session,  # type: ignore[arg-type]
+        user_ids=[8, 7],
+        add_role_ids=[1],
+        remove_role_ids=[2],
+    )
+
+    assert counts == (2, 1)
+    sql = recording_session.sql()
+    assert "WHERE sys_users.is_deleted = false" in sql
+    assert "INSERT INTO sys_user_roles (user_id, role_id) SELECT" in sql
+    assert "FROM valid_user_ids JOIN valid_add_role_ids ON true" in sql
+    assert "ON CONFLICT DO NOTHING" in sql
+    assert "sys_user_roles.user_id = ANY (%(user_ids)s::INTEGER[])" in sql
+    assert "sys_user_roles.role_id = ANY (%(remove_role_ids)s::INTEGER[])" in sql
+    assert _params(recording_session)["user_ids"] == [7, 8]
+    assert recording_session.committed
+
+
+async def test_assign_roles_rolls_back_on_missing_users(
+    recording_session: RecordingSession,
+) -> None:
+    recording_session.results.append(FakeResult([([7], [1], 1, 0)]))
+
+    with pytest.raises(ValidationException, match=r"用户不存在: \[8\]"):
+        await crud_user_role.assign(
+            recording_session,  # type: ignore[arg-type]
+            user_ids=[7, 8],
+            add_role_ids=[1],
+        )
+    assert recording_session.rolled_back
+    assert not recording_session.committed